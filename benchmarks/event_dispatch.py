@@ -0,0 +1,83 @@
+"""
+测量安装在 QApplication 上的 Python 事件过滤器带来的事件分发开销。
+
+    python benchmarks/event_dispatch.py [事件数]
+
+先向一组控件投递大量事件，再只对 sendPostedEvents() 的分发过程计时，
+分别在没有过滤器和安装了与原 MouseDetector 相同的空过滤器时运行。
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide2.QtCore import QObject, QEvent, QCoreApplication, QPoint, Qt
+from PySide2.QtGui import QMouseEvent
+from PySide2.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
+
+WIDGETS = 50
+REPEAT = 5
+
+
+class NoopFilter(QObject):
+    """SuperSidebar 之前安装的全局过滤器，只调用父类实现"""
+
+    def eventFilter(self, obj, event):
+        return super().eventFilter(obj, event)
+
+
+def build_widgets(count):
+    root = QWidget()
+    layout = QVBoxLayout(root)
+    labels = [QLabel(str(i)) for i in range(count)]
+    for label in labels:
+        layout.addWidget(label)
+    root.show()
+    return root, labels
+
+
+def storm(targets, events):
+    """投递 events 个事件，返回分发它们所用的秒数"""
+    for i in range(events):
+        if i % 2:
+            event = QMouseEvent(QEvent.MouseMove, QPoint(1, 1),
+                                Qt.NoButton, Qt.NoButton, Qt.NoModifier)
+        else:
+            event = QEvent(QEvent.User)
+        QCoreApplication.postEvent(targets[i % len(targets)], event)
+
+    start = time.perf_counter()
+    QCoreApplication.sendPostedEvents()
+    return time.perf_counter() - start
+
+
+def measure(targets, events):
+    storm(targets, events // 10)  # 预热
+    return min(storm(targets, events) for _ in range(REPEAT))
+
+
+def main(events):
+    app = QApplication.instance() or QApplication(sys.argv)
+    root, labels = build_widgets(WIDGETS)
+    app.processEvents()
+
+    baseline = measure(labels, events)
+
+    detector = NoopFilter()
+    app.installEventFilter(detector)
+    try:
+        filtered = measure(labels, events)
+    finally:
+        app.removeEventFilter(detector)
+
+    print('事件数: {}，控件数: {}，取 {} 次中的最快一次'.format(events, WIDGETS, REPEAT))
+    for label, seconds in (('无全局过滤器', baseline), ('空 Python 过滤器', filtered)):
+        print('{:<12} {:8.1f} ms  {:6.2f} us/事件'.format(
+            label, seconds * 1000, seconds * 1e6 / events))
+    print('过滤器开销: {:.1f}x'.format(filtered / baseline if baseline else float('inf')))
+    root.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -11,6 +11,7 @@ import qfluentwidgets
 from qfluentwidgets import FluentIcon as FIF
 
 from fingertips.db_utils import AIActionDB
+from fingertips.widget_utils import signal_bus
 from fingertips.core.thread import AskAIThread
 from fingertips.utils import get_select_entity
 
@@ -131,28 +132,39 @@ class AIResultWindow(qframelesswindow.FramelessDialog):
 
 
 class ActionMenu(qfluentwidgets.RoundMenu):
+    """ 快捷菜单，只创建一次并重复使用，AI功能变化时才重新读取数据库 """
     triggered = QtCore.Signal(dict)
 
     def __init__(self, title='', parent=None):
         super().__init__(title, parent)
         self.db = AIActionDB()
         self.data = None
+        self.enabled_actions = []
 
         # add sub menu
-        submenu = qfluentwidgets.RoundMenu('AI', self)
-        submenu.setIcon(FIF.ROBOT)
+        self.ai_submenu = qfluentwidgets.RoundMenu('AI', self)
+        self.ai_submenu.setIcon(FIF.ROBOT)
+        self.addMenu(self.ai_submenu)
+
+        self.reload_actions()
+        signal_bus.ai_actions_changed.connect(self.reload_actions)
+
+    def reload_actions(self):
+        self.enabled_actions = [
+            dict(data) for data in self.db.get_actions() if data['enabled']]
+
+        self.ai_submenu.clear()
+        for action in self.ai_submenu.findChildren(qfluentwidgets.Action):
+            action.deleteLater()
 
         actions = []
-        for data in self.db.get_actions():
-            if not data['enabled']:
-                continue
-            action = qfluentwidgets.Action(data['name'])
+        for data in self.enabled_actions:
+            action = qfluentwidgets.Action(data['name'], self.ai_submenu)
             action.setToolTip(data['description'])
             action.triggered.connect(partial(self.action_triggered, data))
             actions.append(action)
 
-        submenu.addActions(actions)
-        self.addMenu(submenu)
+        self.ai_submenu.addActions(actions)
 
     def action_triggered(self, action_data):
         self.triggered.emit({
@@ -0,0 +1,82 @@
+from PySide2 import QtCore
+
+from fingertips.db_backup import backup_database, restore_database
+from fingertips.utils import get_logger
+from fingertips.widget_utils import signal_bus
+from fingertips.settings.config_model import config_model
+
+log = get_logger('数据备份')
+
+
+class BackupThread(QtCore.QThread):
+    progressed = QtCore.Signal(int, int)
+    reported = QtCore.Signal(dict)
+
+    def __init__(self, snapshot_path=None, keep=5, parent=None):
+        super().__init__(parent)
+        self.snapshot_path = snapshot_path
+        self.keep = keep
+
+    def _progress(self, status, remaining, total):
+        self.progressed.emit(total - remaining, total)
+
+    def run(self):
+        report = {'restore': bool(self.snapshot_path)}
+        try:
+            if self.snapshot_path:
+                report['safety_path'] = restore_database(
+                    self.snapshot_path, keep=self.keep, progress=self._progress)
+                report['path'] = self.snapshot_path
+            else:
+                report['path'] = backup_database(keep=self.keep, progress=self._progress)
+        except Exception as e:
+            log.error(f'{"恢复" if self.snapshot_path else "备份"}失败: {e}')
+            report['error'] = str(e)
+
+        self.reported.emit(report)
+
+
+class BackupManager(QtCore.QObject):
+    """负责在后台线程中执行备份与恢复，同一时间只运行一个任务"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+
+        signal_bus.db_backup_requested.connect(self.backup)
+        signal_bus.db_restore_requested.connect(self.restore)
+        signal_bus.db_maintenance_finished.connect(self._maintenance_finished)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.isRunning()
+
+    def _start(self, snapshot_path=None):
+        if self.is_running():
+            return False
+
+        self._thread = BackupThread(
+            snapshot_path, config_model.backup_keep_count.value, self)
+        self._thread.progressed.connect(signal_bus.db_backup_progressed)
+        self._thread.reported.connect(self._reported)
+        self._thread.start()
+        return True
+
+    def backup(self):
+        log.info('开始备份数据库')
+        self._start()
+
+    def restore(self, snapshot_path):
+        log.info(f'开始从 {snapshot_path} 恢复数据库')
+        self._start(snapshot_path)
+
+    def _maintenance_finished(self, report):
+        if config_model.enable_auto_backup.value and not report.get('error'):
+            self.backup()
+
+    def _reported(self, report):
+        log.info(f'备份任务完成: {report}')
+        signal_bus.db_backup_finished.emit(report)
+
+    def stop(self):
+        if self.is_running():
+            self._thread.wait(3000)
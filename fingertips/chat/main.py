@@ -311,6 +311,11 @@ class ChatWindow(FramelessWindow):
         pos.setY(pos.y() - (pos.y() - 80))
         self.move(pos)
 
+    def show_chat(self, cid):
+        self.chat_card.chats_widget.select_chat(cid)
+        self.show()
+        self.activateWindow()
+
     def show(self):
         if self.chat_card.chats_widget.current_chat_item:
             self._change_item(self.chat_card.chats_widget.current_chat_item)
@@ -259,6 +259,13 @@ class ChatListWidget(qfluentwidgets.ScrollArea):
         self.current_chat_item = item
         signal_bus.chat_item_clicked.emit(item)
 
+    def select_chat(self, cid):
+        for item in self.chat_items:
+            if item.chat_model.cid.value == cid:
+                self.item_clicked(item)
+                return item
+        return None
+
     def item_deleted(self, item):
         label = item.label.text()
         w = qfluentwidgets.Dialog('删除', f'你确定要删除聊天: {label} ？', self)
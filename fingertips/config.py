@@ -5,3 +5,4 @@ DEBUG = True
 
 CONFIG_ROOT = os.path.expanduser('~/fingertips')
 DB_PATH = os.path.join(CONFIG_ROOT, 'data.db')
+BACKUP_ROOT = os.path.join(CONFIG_ROOT, 'backups')
@@ -1,8 +1,7 @@
-import os
-
-import pkgutil
+from fingertips.config import DEBUG
 from fingertips.utils import get_logger
 from fingertips.core import AbstractBase
+from fingertips.core.manifest import ManifestCache, ManifestWatcher, LazyObject
 
 log = get_logger('注册action')
 
@@ -10,30 +9,53 @@ log = get_logger('注册action')
 class ActionRegister(object):
     def __init__(self, main_window):
         self.main_window = main_window
-        self._load_actions()
+        self._actions_storage = {}
+        self._manifest = ManifestCache(
+            'action', 'fingertips.actions',
+            ['title', 'description', 'action_types', 'exts'])
+        self._load_actions(self._manifest.load())
         log.info(u'action已加载完成')
         log.info(self._actions_storage)
 
-    def _load_actions(self):
-        self._actions_storage = {}
-        for importer, package_name, _ in pkgutil.iter_modules(
-                [os.path.join(os.path.dirname(os.path.dirname(__file__)), 'actions')]):
-            module = importer.find_module(package_name).load_module(package_name)
-            for cls_str in dir(module):
-                class_obj = getattr(module, cls_str)
-                if hasattr(class_obj, 'need_register'):
-                    obj = class_obj()
-                    obj.main_window = self.main_window
-                    for action_type in obj.action_types:
-                        self._actions_storage.setdefault(action_type, []).append(obj)
+        self.watcher = None
+        if DEBUG:
+            self.watcher = ManifestWatcher(self._manifest, parent=main_window)
+            self.watcher.changed.connect(self.reload_actions)
+
+    def _load_actions(self, entries, reloaded=()):
+        """根据清单生成 action，action 模块在首次执行时才会导入，未重新导入的模块沿用原来的对象"""
+        old = {(o.module_name, o.class_name): o
+               for objs in self._actions_storage.values() for o in objs}
+        storage = {}
+        for entry in entries:
+            obj = old.get((entry['module_name'], entry['class_name']))
+            if obj is None or entry['module_name'] in reloaded:
+                obj = LazyObject(
+                    entry, self.main_window, 'action:{}'.format(entry['class_name']))
+            for action_type in entry['action_types']:
+                storage.setdefault(action_type, []).append(obj)
+
+        self._actions_storage = storage
 
     def get_actions(self, action_type):
         return self._actions_storage.get(action_type, [])
 
     def reload_actions(self):
-        self._load_actions()
-        log.info(u'action已成功重新加载')
-        log.info(self._actions_storage)
+        """只重新导入文件有变化的 action 模块，出错时保留原来的 action"""
+        changed = self._manifest.changed_modules()
+        if not changed:
+            return
+
+        try:
+            self._load_actions(
+                self._manifest.update(changed),
+                {self._manifest.full_name(name) for name in changed})
+        except Exception as e:
+            self._manifest.forget(changed)
+            log.error(u'action重新加载失败: {}'.format(e))
+            return
+
+        log.info(u'action {} 已成功重新加载'.format(', '.join(sorted(changed))))
 
 
 EMPTY = 0
@@ -0,0 +1,313 @@
+import os
+import math
+import time
+import threading
+from datetime import datetime
+
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+from fingertips.utils import get_logger
+from fingertips.widget_utils import signal_bus
+from fingertips.core.result import ResultItem
+from fingertips.core.search import KeywordIndex
+from fingertips.db_utils import SoftwareDB, ChatDB, ConfigDB, FrecencyDB
+from fingertips.software_index import launch
+
+log = get_logger('联合搜索')
+
+CLIPBOARD_TABLE = 'HistoricalCuttingBoardCard'
+
+
+class SearchSource(object):
+    """
+    搜索来源，search 在线程池中执行，activate 在主线程中执行。
+
+    得分与 KeywordIndex 同一量级（完全匹配 100），不同来源的结果直接按得分合并；
+    超过 budget 秒后 search 应尽快返回已有的结果，更晚返回的结果会被丢弃。
+    """
+    name = ''
+    label = ''
+    budget = 0.1
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+
+    def item(self, title, description, icon='', date_time='', **data):
+        data['source'] = self.name
+        return ResultItem(title, description, self.label, icon, date_time, data=data)
+
+    def search(self, text, limit, deadline):
+        """返回 (得分, ResultItem) 列表"""
+        raise NotImplementedError
+
+    def activate(self, result_item):
+        raise NotImplementedError
+
+
+class SoftwareIndexTask(QtCore.QRunnable):
+    def __init__(self, source, version):
+        super().__init__()
+        self.source = source
+        self.version = version
+
+    def run(self):
+        try:
+            self.source._build_index(SoftwareDB(), self.version)
+        except Exception as e:
+            log.error(u'建立软件索引出错: {}'.format(e))
+        finally:
+            with self.source._lock:
+                self.source._building = False
+
+
+class SoftwareSource(SearchSource):
+    """软件索引在后台线程中建立，重建完成前 search 沿用上一份索引，不占用时间预算"""
+    name = 'software'
+    label = '软件'
+    budget = 0.05
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        # (索引, {路径: (名称, exe 路径)}, 版本)，整体替换
+        self._snapshot = None
+        self._building = False
+        self._lock = threading.Lock()
+        signal_bus.software_index_finished.connect(lambda report: self.refresh())
+        self.refresh()
+
+    def refresh(self):
+        # 软件增删后行数或最大 id 会变化，此时在后台重新建立索引
+        version = SoftwareDB().version()
+        with self._lock:
+            snapshot = self._snapshot
+            if self._building or (snapshot is not None and snapshot[2] == version):
+                return
+            self._building = True
+        QtCore.QThreadPool.globalInstance().start(SoftwareIndexTask(self, version))
+
+    def _build_index(self, db, version):
+        index = KeywordIndex()
+        software = {}
+        for name, exe_path, lnk_path in db.get_software(include_indexed=True):
+            path = lnk_path or exe_path
+            software[path] = (name, exe_path)
+            index.add(path, '', name, os.path.basename(exe_path))
+        self._snapshot = index, software, version
+
+    def search(self, text, limit, deadline):
+        self.refresh()
+        snapshot = self._snapshot
+        if snapshot is None:
+            return []
+
+        index, software, _ = snapshot
+        frecency = FrecencyDB('software')
+        results = []
+        for path, score in index.search_scores(text, limit):
+            name, exe_path = software[path]
+            score *= 1 + math.log1p(frecency.score(path))
+            results.append((score, self.item(name, exe_path, exe_path, path=path)))
+        return results
+
+    def activate(self, result_item):
+        path = result_item.data['path']
+        launch(path)
+        self.main_window.software_list_widget.record_launch(path)
+        self.main_window.set_visible()
+
+
+class PluginSource(SearchSource):
+    name = 'plugin'
+    label = '插件'
+    budget = 0.05
+
+    def search(self, text, limit, deadline):
+        results = []
+        for score, item in self.main_window.plugin_register.search_plugin_scores(text, limit):
+            results.append((score, self.item(
+                item.title, item.description, item.icon, keyword=item.keyword)))
+        return results
+
+    def activate(self, result_item):
+        self.main_window.input_line_edit.setText('/{} '.format(result_item.data['keyword']))
+
+
+class ChatSource(SearchSource):
+    """按标题和聊天内容搜索，从最新的聊天开始，超出时间预算后停止"""
+    name = 'chat'
+    label = '聊天'
+    budget = 0.15
+
+    LABEL_EXACT = 80
+    LABEL_PREFIX = 65
+    LABEL_SUBSTRING = 50
+    CONTENT_SUBSTRING = 35
+
+    def search(self, text, limit, deadline):
+        text = text.lower()
+        results = []
+        for i, chat in enumerate(ChatDB().iter_chats()):
+            if time.monotonic() > deadline or len(results) >= limit:
+                break
+
+            label = (chat.get('label') or '').lower()
+            if label == text:
+                score = self.LABEL_EXACT
+            elif label.startswith(text):
+                score = self.LABEL_PREFIX
+            elif text in label:
+                score = self.LABEL_SUBSTRING
+            else:
+                score = 0
+
+            snippet = ''
+            for history in ChatDB.histories(chat):
+                content = history.get('content') if isinstance(history, dict) else None
+                if isinstance(content, str) and text in content.lower():
+                    snippet = content
+                    score = score or self.CONTENT_SUBSTRING
+                    break
+
+            if score:
+                # 越新的聊天越靠前
+                results.append((score - i * 0.01, self.item(
+                    chat.get('label') or '', snippet.strip().replace('\n', ' '),
+                    cid=chat.get('cid'))))
+        return results
+
+    def activate(self, result_item):
+        self.main_window.set_visible()
+        self.main_window.chat_window.show_chat(result_item.data['cid'])
+
+
+class ClipboardSource(SearchSource):
+    name = 'clipboard'
+    label = '剪贴板'
+    budget = 0.1
+
+    PREFIX = 45
+    SUBSTRING = 30
+
+    def search(self, text, limit, deadline):
+        db = ConfigDB(CLIPBOARD_TABLE)
+        if not db.table.exists:
+            return []
+
+        pattern = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rows = db._db.query(
+            "SELECT content, timestamp FROM {} WHERE type = 'text' "
+            "AND content LIKE ? ESCAPE '\\' ORDER BY rowid DESC LIMIT ?".format(CLIPBOARD_TABLE),
+            '%{}%'.format(pattern), limit)
+
+        text = text.lower()
+        results = []
+        for i, (content, timestamp) in enumerate(rows):
+            if time.monotonic() > deadline:
+                break
+
+            score = self.PREFIX if content.lower().startswith(text) else self.SUBSTRING
+            results.append((score - i * 0.01, self.item(
+                content.strip().replace('\n', ' '), '', '',
+                self._date_time(timestamp), content=content)))
+        return results
+
+    @staticmethod
+    def _date_time(timestamp):
+        try:
+            dt = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return ''
+        return [dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second]
+
+    def activate(self, result_item):
+        QtWidgets.QApplication.clipboard().setText(result_item.data['content'])
+        self.main_window.set_visible()
+
+
+class SourceTask(QtCore.QRunnable):
+    def __init__(self, engine, seq, source, text, limit):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.engine = engine
+        self.seq = seq
+        self.source = source
+        self.text = text
+        self.limit = limit
+        self.deadline = time.monotonic() + source.budget
+
+    def run(self):
+        try:
+            results = self.source.search(self.text, self.limit, self.deadline)
+        except Exception as e:
+            log.error(u'搜索来源 {} 出错: {}'.format(self.source.name, e))
+            results = []
+
+        self.engine.task_done.emit(self, results)
+
+
+class FederatedSearch(QtCore.QObject):
+    """
+    同时在多个来源中搜索，每个来源返回后立即合并结果，按得分排序后发出。
+
+    新的输入会作废所有未返回的结果；超出时间预算（允许少量误差）才返回的来源直接丢弃。
+    """
+    resulted = QtCore.Signal(object)
+    task_done = QtCore.Signal(object, object)
+
+    LATE_GRACE = 0.05
+
+    def __init__(self, sources, limit=20, debounce=60, parent=None):
+        super().__init__(parent)
+        self.sources = {source.name: source for source in sources}
+        self.limit = limit
+        self._seq = 0
+        self._text = ''
+        self._results = []
+        self._tasks = set()
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(len(self.sources))
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce)
+        self._timer.timeout.connect(self._start)
+
+        self.task_done.connect(self._task_done)
+
+    def submit(self, text):
+        self.cancel()
+        self._text = text
+        self._timer.start()
+
+    def cancel(self):
+        self._seq += 1
+        self._results = []
+        self._timer.stop()
+        for task in list(self._tasks):
+            if self._pool.tryTake(task):
+                self._tasks.discard(task)
+
+    def _start(self):
+        for source in self.sources.values():
+            task = SourceTask(self, self._seq, source, self._text, self.limit)
+            self._tasks.add(task)
+            self._pool.start(task)
+
+    def _task_done(self, task, results):
+        self._tasks.discard(task)
+        if task.seq != self._seq:
+            return
+
+        late = time.monotonic() - task.deadline
+        if late > self.LATE_GRACE:
+            log.warning(u'搜索来源 {} 超出时间预算 {:.0f}ms'.format(task.source.name, late * 1000))
+            return
+
+        self._results.extend(results)
+        self._results.sort(key=lambda x: -x[0])
+        self.resulted.emit([item for _, item in self._results[:self.limit]])
+
+    def activate(self, result_item):
+        self.sources[result_item.data['source']].activate(result_item)
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import inspect
+import pkgutil
+import importlib
+
+from PySide2 import QtCore
+
+from fingertips.config import CONFIG_ROOT
+from fingertips.utils import get_logger
+from fingertips.core import RequiredFieldsError
+from fingertips.core.profiler import profiler, IMPORT, INIT, RUN
+
+log = get_logger('manifest')
+
+CACHE_ROOT = os.path.join(CONFIG_ROOT, 'cache')
+
+
+def source_mtime(path):
+    """包取其中所有 .py 文件最新的修改时间"""
+    if not os.path.isdir(path):
+        return os.path.getmtime(path)
+
+    mtime = os.path.getmtime(path)
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d != '__pycache__']
+        for name in files:
+            if name.endswith('.py'):
+                mtime = max(mtime, os.path.getmtime(os.path.join(root, name)))
+    return mtime
+
+
+def registered_classes(module):
+    """返回模块中被 register 装饰的类，register 会把类包装成函数，原始类在 __wrapped__ 上"""
+    for name in dir(module):
+        obj = getattr(module, name)
+        if hasattr(obj, 'need_register'):
+            yield name, getattr(obj, '__wrapped__', obj)
+
+
+def class_icon_path(cls):
+    if cls.icon:
+        return os.path.join(os.path.dirname(inspect.getfile(cls)), cls.icon)
+    return ''
+
+
+class ManifestCache(object):
+    """
+    插件/action 清单缓存。
+
+    模块文件未修改时直接使用磁盘上的清单，不导入模块；
+    有修改或首次运行时导入一次模块重新生成清单。
+    """
+
+    def __init__(self, name, package, fields):
+        self.path = os.path.join(CACHE_ROOT, '{}_manifest.json'.format(name))
+        self.package = package
+        self.fields = fields
+        self._cache = {}
+
+    def full_name(self, module_name):
+        return '{}.{}'.format(self.package, module_name)
+
+    @property
+    def package_dir(self):
+        return os.path.dirname(importlib.import_module(self.package).__file__)
+
+    def module_path(self, module_name):
+        path = os.path.join(self.package_dir, module_name)
+        return path if os.path.isdir(path) else path + '.py'
+
+    def _read(self):
+        """清单字段有变化时旧的缓存全部作废"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning('读取清单缓存失败: {}'.format(e))
+            return {}
+
+        if data.get('fields') != self.fields:
+            return {}
+        return data.get('modules', {})
+
+    def _write(self, cache):
+        try:
+            if not os.path.exists(CACHE_ROOT):
+                os.makedirs(CACHE_ROOT)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'fields': self.fields, 'modules': cache}, f,
+                          ensure_ascii=False, indent=2)
+        except OSError as e:
+            log.warning('写入清单缓存失败: {}'.format(e))
+
+    def _scan(self):
+        return {module_name: source_mtime(self.module_path(module_name))
+                for _, module_name, _ in pkgutil.iter_modules([self.package_dir])}
+
+    def load(self):
+        cache = self._read()
+        self._cache = {}
+
+        for module_name, mtime in self._scan().items():
+            cached = cache.get(module_name)
+            if not cached or cached['mtime'] != mtime:
+                cached = {'mtime': mtime, 'entries': self.build(module_name)}
+            self._cache[module_name] = cached
+
+        if self._cache != cache:
+            self._write(self._cache)
+        return self.entries()
+
+    def entries(self):
+        return [entry for cached in self._cache.values() for entry in cached['entries']]
+
+    def changed_modules(self):
+        """返回新增、修改或删除了的模块名"""
+        mtimes = self._scan()
+        changed = {name for name, mtime in mtimes.items()
+                   if name not in self._cache or self._cache[name]['mtime'] != mtime}
+        return changed | (set(self._cache) - set(mtimes))
+
+    def update(self, module_names):
+        """
+        只重新导入指定的模块，返回新的完整清单。
+
+        任一模块导入失败时抛出异常，内存和磁盘上的清单都保持不变。
+        """
+        mtimes = self._scan()
+        cache = dict(self._cache)
+        for module_name in module_names:
+            if module_name in mtimes:
+                cache[module_name] = {
+                    'mtime': mtimes[module_name], 'entries': self.build(module_name)}
+            else:
+                cache.pop(module_name, None)
+
+        self._cache = cache
+        self._write(cache)
+        return self.entries()
+
+    def forget(self, module_names):
+        """注册器没有采用新的清单时调用，下次检查时这些模块仍视为有变化"""
+        for module_name in module_names:
+            self._cache.pop(module_name, None)
+
+    def build(self, module_name):
+        full_name = self.full_name(module_name)
+        if full_name in sys.modules:
+            # 子模块也可能被修改，移除后随包一起重新导入
+            for name in [n for n in sys.modules if n.startswith(full_name + '.')]:
+                del sys.modules[name]
+            module = importlib.reload(sys.modules[full_name])
+        else:
+            module = importlib.import_module(full_name)
+
+        entries = []
+        for class_name, cls in registered_classes(module):
+            for field in cls._verify_fields:
+                if not getattr(cls, field):
+                    raise RequiredFieldsError(
+                        'The {} field is not set.'.format(field))
+
+            entry = {
+                'module_name': full_name,
+                'class_name': class_name,
+                'icon_path': class_icon_path(cls),
+            }
+            entry.update({field: getattr(cls, field) for field in self.fields})
+            entries.append(entry)
+
+        log.info('已生成 {} 的清单'.format(full_name))
+        return entries
+
+
+class ManifestWatcher(QtCore.QObject):
+    """
+    监听插件目录，文件变化后稍作等待再通知注册器增量重新加载。
+
+    编辑器保存时可能先删除再写入文件，所以每次触发后都重新添加监听路径。
+    """
+    changed = QtCore.Signal()
+
+    def __init__(self, manifest, delay=200, parent=None):
+        super().__init__(parent)
+        self.manifest = manifest
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._timeout)
+
+        self._watch()
+
+    def _paths(self):
+        paths = [self.manifest.package_dir]
+        for root, dirs, files in os.walk(self.manifest.package_dir):
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            paths.extend(os.path.join(root, d) for d in dirs)
+            paths.extend(os.path.join(root, f) for f in files if f.endswith('.py'))
+        return paths
+
+    def _watch(self):
+        watched = set(self._watcher.files() + self._watcher.directories())
+        paths = [p for p in self._paths() if p not in watched]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def _schedule(self, path):
+        self._timer.start()
+
+    def _timeout(self):
+        self._watch()
+        self.changed.emit()
+
+
+class LazyObject(object):
+    """清单中的字段无需导入即可访问，其余属性在首次使用时导入模块并实例化"""
+
+    def __init__(self, manifest, main_window=None, name=''):
+        self._manifest = manifest
+        self._main_window = main_window
+        self._name = name or manifest['class_name']
+        self._instance = None
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def load(self):
+        if self._instance is None:
+            with profiler.measure(self._name, IMPORT):
+                module = importlib.import_module(self._manifest['module_name'])
+            with profiler.measure(self._name, INIT):
+                instance = getattr(module, self._manifest['class_name'])()
+            instance.main_window = self._main_window
+            self._instance = instance
+        return self._instance
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        manifest = self.__dict__.get('_manifest', {})
+        if name in manifest:
+            return manifest[name]
+
+        value = getattr(self.load(), name)
+        if name == RUN:
+            return profiler.wrap(self._name, RUN, value)
+        return value
+
+    def __repr__(self):
+        return '<LazyObject {}.{}{}>'.format(
+            self._manifest['module_name'], self._manifest['class_name'],
+            '' if self.loaded else ' (not loaded)')
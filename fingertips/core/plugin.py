@@ -1,80 +1,14 @@
-import os
-import pkgutil
-from fingertips.widgets import ResultItem
-from fingertips.utils import get_logger
-from fingertips.core import AbstractBase
-
-log = get_logger(u'注册插件')
-
-
-class PluginRegister(object):
-    def __init__(self, main_window):
-        self.main_window = main_window
-        self._load_plugins()
-
-        self._check_shortcuts()
-        log.info(u'插件已加载完成.')
-        log.info(self._plugins_storage)
-
-    def _load_plugins(self):
-        self._plugins_storage = {}
-        for importer, package_name, _ in pkgutil.iter_modules(
-                [os.path.join(os.path.dirname(os.path.dirname(__file__)),
-                              'plugins')]):
-            module = importer.find_module(package_name).load_module(
-                package_name)
-            for cls_str in dir(module):
-                class_obj = getattr(module, cls_str)
-                if hasattr(class_obj, 'need_register'):
-                    obj = class_obj()
-                    if obj.keyword in self._plugins_storage:
-                        log.error(
-                            'Keyword {} already exists.'.format(obj.keyword))
-                        raise ValueError('Keyword already exists.')
-                    obj.main_window = self.main_window
-                    self._plugins_storage[obj.keyword] = obj
-
-    def _check_shortcuts(self):
-        """检查快捷键是否有重复的"""
-        shortcuts = [x for x in self._plugins_storage.values() if x.shortcut]
-        if len(shortcuts) != len(set(shortcuts)):
-            log.error('There are duplicate shortcuts')
-            log.error('shortcuts: {}'.format(shortcuts))
-            raise ValueError('There are duplicate shortcuts.')
+import threading
 
-    def reload_plugins(self):
-        self._load_plugins()
-        log.info(u'插件已成功重新加载')
-        log.info(self._plugins_storage)
-
-    def search_plugin(self, text):
-        if not text:
-            return []
-
-        return [ResultItem(o.title, o.description, o.keyword, o.icon_path)
-                for k, o in
-                sorted(self._plugins_storage.items(), key=lambda x: x[0])
-                if text in k]
-
-    def get_query_result(self, keyword, text):
-        query = self._plugins_storage.get(keyword)
-        if query:
-            return query.query(text)
-        return []
-
-    def execute(self, keyword, execute_str, result_item, plugin_by_keyword):
-        return self._plugins_storage[keyword].run(
-            execute_str, result_item, plugin_by_keyword)
+from fingertips.core import AbstractBase
 
-    def get_plugin(self, keyword):
-        return self._plugins_storage.get(keyword)
+# 插件进程也会导入本模块，这里不能导入界面相关的模块
+_query_context = threading.local()
 
-    def plugins(self):
-        return self._plugins_storage
 
-    def get_keyword_by_shortcut(self):
-        return {o.shortcut: o.keyword for o in self._plugins_storage.values()
-                if o.shortcut}
+def _query_cancelled():
+    task = getattr(_query_context, 'task', None)
+    return task is not None and task.cancelled
 
 
 class AbstractPlugin(AbstractBase):
@@ -83,6 +17,9 @@ class AbstractPlugin(AbstractBase):
     icon = ''
     description = ''
     shortcut = ''
+    isolated = False  # 为 True 且开启了插件进程时，query 和 run 在独立进程中执行
+    query_timeout = 5
+    run_timeout = 60
 
     main_window = None  # 这个值不需要初始化，在插件加载时，会自动设置为全局Quicker对象
     _verify_fields = ['title', 'keyword', 'description']
@@ -91,8 +28,14 @@ class AbstractPlugin(AbstractBase):
         raise NotImplementedError
 
     def query(self, text):
-        pass
+        """
+        在线程池中调用，只能返回 ResultItem（fingertips.core.result）数据，不能创建控件。
 
+        可以返回列表，也可以是生成器、协程或异步迭代器，每次产出一个 ResultItem 或一组，
+        产出的结果会立即追加到列表中，输入变化后不再继续读取。
+        """
+        pass
 
-if __name__ == '__main__':
-    pr = PluginRegister(None)
+    def is_query_cancelled(self):
+        """耗时的 query 可以定期检查，输入已变化时提前返回"""
+        return _query_cancelled()
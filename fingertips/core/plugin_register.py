@@ -0,0 +1,376 @@
+import math
+import time
+
+from PySide2 import QtCore
+
+from fingertips.config import DEBUG
+from fingertips.db_utils import FrecencyDB
+from fingertips.utils import get_logger
+from fingertips.core.result import ResultItem
+from fingertips.core.search import KeywordIndex
+from fingertips.core.stream import iter_chunks
+from fingertips.core.plugin import _query_context, _query_cancelled
+from fingertips.core.profiler import profiler, QUERY as QUERY_PHASE, RUN as RUN_PHASE
+from fingertips.core.manifest import ManifestCache, ManifestWatcher, LazyObject
+from fingertips.core.process_pool import PluginProcessPool, QUERY, RUN, pack_item
+from fingertips.settings.config_model import config_model
+
+log = get_logger(u'注册插件')
+
+# 常用程度得分为 e - 1（约两次近期使用）时，匹配得分翻倍
+FRECENCY_WEIGHT = 1.0
+
+
+class PluginRegister(object):
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.process_pool = None
+        self.frecency = FrecencyDB('plugin')
+        # 搜索线程只读取内存中的排名，在主线程中先加载
+        self.frecency.ranks()
+        self._plugins_storage = {}
+        self._manifest = ManifestCache(
+            'plugin', 'fingertips.plugins',
+            ['title', 'keyword', 'description', 'shortcut', 'isolated',
+             'query_timeout', 'run_timeout'])
+        self._load_plugins(self._manifest.load())
+        log.info(u'插件已加载完成.')
+        log.info(self._plugins_storage)
+
+        self.watcher = None
+        if DEBUG:
+            self.watcher = ManifestWatcher(self._manifest, parent=main_window)
+            self.watcher.changed.connect(self.reload_plugins)
+
+    def _load_plugins(self, entries, reloaded=()):
+        """
+        根据清单生成插件，插件模块在首次查询或执行时才会导入。
+
+        没有重新导入的模块沿用原来的插件对象，新的插件表和索引都准备好后才替换，
+        正在执行的插件不受影响。
+        """
+        old = {(o.module_name, o.class_name): o for o in self._plugins_storage.values()}
+        storage = {}
+        for entry in entries:
+            if entry['keyword'] in storage:
+                log.error('Keyword {} already exists.'.format(entry['keyword']))
+                raise ValueError('Keyword already exists.')
+
+            obj = old.get((entry['module_name'], entry['class_name']))
+            if obj is None or entry['module_name'] in reloaded:
+                obj = self._create_plugin(entry)
+            storage[entry['keyword']] = obj
+
+        self._check_shortcuts(storage)
+        self._plugins_storage, self._index = storage, self._build_index(storage)
+
+    def _create_plugin(self, entry):
+        if not (entry['isolated'] and config_model.enable_plugin_process.value):
+            return LazyObject(entry, self.main_window, 'plugin:{}'.format(entry['keyword']))
+
+        if self.process_pool is None:
+            self.process_pool = PluginProcessPool(config_model.plugin_process_count.value)
+        return RemotePlugin(entry, self.process_pool)
+
+    @staticmethod
+    def _build_index(storage):
+        index = KeywordIndex()
+        for keyword, obj in storage.items():
+            index.add(keyword, obj.keyword, obj.title, obj.description)
+        return index
+
+    @staticmethod
+    def _check_shortcuts(storage):
+        """检查快捷键是否有重复的"""
+        shortcuts = [x.shortcut for x in storage.values() if x.shortcut]
+        if len(shortcuts) != len(set(shortcuts)):
+            log.error('There are duplicate shortcuts')
+            log.error('shortcuts: {}'.format(shortcuts))
+            raise ValueError('There are duplicate shortcuts.')
+
+    def reload_plugins(self):
+        """只重新导入文件有变化的插件模块，出错时保留原来的插件"""
+        changed = self._manifest.changed_modules()
+        if not changed:
+            return
+
+        start = time.perf_counter()
+        try:
+            self._load_plugins(
+                self._manifest.update(changed),
+                {self._manifest.full_name(name) for name in changed})
+        except Exception as e:
+            self._manifest.forget(changed)
+            log.error(u'插件重新加载失败: {}'.format(e))
+            return
+
+        if self.process_pool is not None:
+            self.process_pool.restart()
+
+        log.info(u'插件 {} 已重新加载，耗时 {:.1f}ms'.format(
+            ', '.join(sorted(changed)), (time.perf_counter() - start) * 1000))
+
+    def search_plugin(self, text, limit=20):
+        return [item for _, item in self.search_plugin_scores(text, limit)]
+
+    def search_plugin_scores(self, text, limit=20):
+        """返回 (得分, ResultItem)，多取一些候选，按匹配得分和常用程度重新排序"""
+        if not text:
+            return []
+
+        # 可能在搜索线程中调用，插件表被重新加载替换时跳过已不存在的插件
+        storage = self._plugins_storage
+        scored = [
+            (score * (1 + FRECENCY_WEIGHT * math.log1p(self.frecency.score(key))), storage[key])
+            for key, score in self._index.search_scores(text, limit * 2) if key in storage]
+        scored.sort(key=lambda x: -x[0])
+        return [(score, ResultItem(o.title, o.description, o.keyword, o.icon_path))
+                for score, o in scored[:limit]]
+
+    def record_use(self, keyword):
+        self.frecency.record(keyword)
+
+    def get_query_result(self, keyword, text):
+        query = self._plugins_storage.get(keyword)
+        if query:
+            return [item for chunk in iter_chunks(query.query(text)) for item in chunk]
+        return []
+
+    def execute(self, keyword, execute_str, result_item, plugin_by_keyword):
+        return self._plugins_storage[keyword].run(
+            execute_str, result_item, plugin_by_keyword)
+
+    def get_plugin(self, keyword):
+        return self._plugins_storage.get(keyword)
+
+    def plugins(self):
+        return self._plugins_storage
+
+    def get_keyword_by_shortcut(self):
+        return {o.shortcut: o.keyword for o in self._plugins_storage.values()
+                if o.shortcut}
+
+    def is_isolated(self, keyword):
+        return isinstance(self._plugins_storage.get(keyword), RemotePlugin)
+
+    def close(self):
+        if self.process_pool is not None:
+            self.process_pool.close()
+
+
+class QueryTask(QtCore.QRunnable):
+    def __init__(self, runner, seq, plugin, text):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.runner = runner
+        self.seq = seq
+        self.plugin = plugin
+        self.text = text
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return self.runner.task_done.emit(self.seq)
+
+        _query_context.task = self
+        chunks = None
+        start = time.perf_counter()
+        try:
+            chunks = iter_chunks(self.plugin.query(self.text))
+            for chunk in chunks:
+                # 输入已变化，不再读取插件后续的结果
+                if self.cancelled:
+                    break
+                if chunk:
+                    self.runner.task_batch.emit(self.seq, chunk)
+        except Exception as e:
+            log.error(u'插件 {} 查询出错: {}'.format(self.plugin.keyword, e))
+        finally:
+            if chunks is not None:
+                chunks.close()
+            _query_context.task = None
+            profiler.record('plugin:{}'.format(self.plugin.keyword), QUERY_PHASE,
+                            (time.perf_counter() - start) * 1000, False)
+
+        self.runner.task_done.emit(self.seq)
+
+
+class RunTask(QtCore.QRunnable):
+    def __init__(self, runner, plugin, text, result_item):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.runner = runner
+        self.plugin = plugin
+        self.text = text
+        self.result_item = result_item
+
+    def run(self):
+        try:
+            result_items = [item for chunk in iter_chunks(
+                self.plugin.run(self.text, self.result_item, None)) for item in chunk]
+        except Exception as e:
+            log.error(u'插件 {} 执行出错: {}'.format(self.plugin.keyword, e))
+            result_items = []
+
+        self.runner.run_done.emit(self, result_items)
+
+
+class PluginQueryRunner(QtCore.QObject):
+    """
+    在线程池中执行插件查询。
+
+    输入变化后先等待 debounce 毫秒再提交，新的输入会取消尚未开始的查询，
+    已经开始的旧查询结果会被直接丢弃。
+    插件以生成器等方式分批返回时，第一批通过 resulted 立即显示，
+    之后的结果每 flush_interval 毫秒合并一次通过 appended 追加。
+    """
+    resulted = QtCore.Signal(object)
+    appended = QtCore.Signal(object)
+    executed = QtCore.Signal(object)
+    task_batch = QtCore.Signal(int, object)
+    task_done = QtCore.Signal(int)
+    run_done = QtCore.Signal(object, object)
+
+    def __init__(self, plugin_register, debounce=120, flush_interval=30, parent=None):
+        super().__init__(parent)
+        self.plugin_register = plugin_register
+        self._seq = 0
+        self._pending = None
+        self._tasks = {}
+        self._buffer = []
+        self._shown_seq = None
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(4)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce)
+        self._timer.timeout.connect(self._start_pending)
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self.task_batch.connect(self._task_batch)
+        self.task_done.connect(self._task_done)
+        self.run_done.connect(self._run_done)
+        self._run_tasks = set()
+
+    def submit(self, keyword, text):
+        self.cancel()
+        self._pending = (self._seq, keyword, text)
+        self._timer.start()
+
+    def cancel(self):
+        self._seq += 1
+        self._pending = None
+        self._timer.stop()
+        self._flush_timer.stop()
+        self._buffer = []
+        for task in list(self._tasks.values()):
+            task.cancelled = True
+            if self._pool.tryTake(task):
+                self._tasks.pop(task.seq, None)
+
+    def _start_pending(self):
+        if self._pending is None:
+            return
+
+        seq, keyword, text = self._pending
+        self._pending = None
+
+        plugin = self.plugin_register.get_plugin(keyword)
+        if not plugin:
+            return
+
+        # 在主线程中完成导入和实例化
+        plugin.load()
+        task = QueryTask(self, seq, plugin, text)
+        self._tasks[seq] = task
+        self._pool.start(task)
+
+    def _task_batch(self, seq, result_items):
+        if seq != self._seq:
+            return
+
+        self._buffer.extend(result_items)
+        if self._shown_seq != seq:
+            self._flush()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        result_items, self._buffer = self._buffer, []
+        if self._shown_seq != self._seq:
+            self._shown_seq = self._seq
+            self.resulted.emit(result_items)
+        else:
+            self.appended.emit(result_items)
+
+    def _task_done(self, seq):
+        self._tasks.pop(seq, None)
+        if seq == self._seq:
+            self._flush_timer.stop()
+            self._flush()
+
+    def execute(self, keyword, text, result_item):
+        """在线程池中执行插件的 run，不会被新的输入取消"""
+        plugin = self.plugin_register.get_plugin(keyword)
+        if not plugin:
+            return
+
+        task = RunTask(self, plugin, text, result_item)
+        self._run_tasks.add(task)
+        self._pool.start(task)
+
+    def _run_done(self, task, result_items):
+        self._run_tasks.discard(task)
+        self.executed.emit(result_items)
+
+
+class RemotePlugin(object):
+    """
+    在插件进程中执行的插件，清单字段在本地读取，query 和 run 通过进程池调用。
+
+    插件类设置 isolated = True 且开启了插件进程时使用，
+    run 在独立进程中拿不到其他插件，plugin_by_keyword 总是 None。
+    """
+    loaded = True
+
+    def __init__(self, manifest, process_pool):
+        self._manifest = manifest
+        self._pool = process_pool
+
+    def __getattr__(self, name):
+        manifest = self.__dict__.get('_manifest', {})
+        if name in manifest:
+            return manifest[name]
+        raise AttributeError(name)
+
+    def load(self):
+        return self
+
+    def query(self, text):
+        for batch in self._pool.call(QUERY, self._manifest, (text,), self.query_timeout):
+            yield batch
+            if _query_cancelled():
+                return
+
+    def run(self, text, result_item, plugin_by_keyword):
+        packed = result_item and pack_item(result_item)
+        with profiler.measure('plugin:{}'.format(self.keyword), RUN_PHASE):
+            return [item for batch in self._pool.call(
+                RUN, self._manifest, (text, packed), self.run_timeout) for item in batch]
+
+    def __repr__(self):
+        return '<RemotePlugin {}.{}>'.format(
+            self._manifest['module_name'], self._manifest['class_name'])
+
+
+if __name__ == '__main__':
+    pr = PluginRegister(None)
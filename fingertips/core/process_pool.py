@@ -0,0 +1,226 @@
+import time
+import queue
+import itertools
+import importlib
+import threading
+import multiprocessing
+
+from fingertips.logger import get_logger
+from fingertips.core.result import ResultItem
+from fingertips.core.stream import iter_chunks
+
+log = get_logger('插件进程池')
+
+# 请求: (call_id, 方法, 模块名, 类名, 参数)
+# 响应: (call_id, 类型, 数据)，进程启动完成后先发送 (None, READY, None)
+QUERY = 'q'
+RUN = 'r'
+READY = 'y'
+BATCH = 'b'
+DONE = 'd'
+ERROR = 'e'
+
+BATCH_SIZE = 20
+BATCH_INTERVAL = 0.05
+DRAIN_TIMEOUT = 1
+STARTUP_TIMEOUT = 30
+
+
+def pack_item(item):
+    return (item.title, item.description, item.keyword, item.icon,
+            item.date_time, item.checkbox)
+
+
+def unpack_item(data):
+    return ResultItem(*data)
+
+
+def iter_batches(result):
+    """合并插件连续产出的结果，凑够一批或间隔足够久再发送"""
+    batch = []
+    last = time.monotonic()
+    for chunk in iter_chunks(result):
+        batch.extend(chunk)
+        if len(batch) >= BATCH_SIZE or time.monotonic() - last >= BATCH_INTERVAL:
+            yield batch
+            batch = []
+            last = time.monotonic()
+
+    if batch:
+        yield batch
+
+
+def _worker_main(conn):
+    """工作进程入口，插件实例在进程内缓存，主进程中的对象不可用，plugin_by_keyword 为 None"""
+    plugins = {}
+    conn.send((None, READY, None))
+    while True:
+        try:
+            call_id, method, module_name, class_name, args = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        try:
+            plugin = plugins.get((module_name, class_name))
+            if plugin is None:
+                module = importlib.import_module(module_name)
+                plugin = plugins[(module_name, class_name)] = getattr(module, class_name)()
+
+            if method == QUERY:
+                result = plugin.query(*args)
+            else:
+                text, item = args
+                result = plugin.run(text, item and unpack_item(item), None)
+
+            for batch in iter_batches(result):
+                conn.send((call_id, BATCH, [pack_item(i) for i in batch]))
+            conn.send((call_id, DONE, None))
+        except Exception as e:
+            conn.send((call_id, ERROR, '{}: {}'.format(type(e).__name__, e)))
+
+
+class _Worker(object):
+    def __init__(self, context, generation):
+        self.generation = generation
+        self.ready = False
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        try:
+            self.conn.close()
+            self.process.kill()
+            self.process.join(1)
+        except Exception as e:
+            log.warning(u'结束插件进程失败: {}'.format(e))
+
+
+class PluginProcessPool(object):
+    """
+    在独立进程中执行插件的 query 和 run，插件卡住或崩溃不会影响主程序。
+
+    call 会阻塞调用线程，只能在查询线程池中使用；
+    超时或进程退出时结束该进程，下次取用时自动重新启动。
+    """
+
+    def __init__(self, size=2):
+        self._context = multiprocessing.get_context('spawn')
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._generation = 0
+
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _acquire(self, timeout):
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(u'没有空闲的插件进程')
+
+        if worker is not None and (
+                worker.generation != self._generation or not worker.is_alive()):
+            self._discard(worker)
+            worker = None
+
+        if worker is None:
+            try:
+                worker = _Worker(self._context, self._generation)
+            except Exception:
+                self._idle.put(None)
+                raise
+            with self._lock:
+                self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    @staticmethod
+    def _wait_ready(worker):
+        """等待新进程启动完成，启动和导入的耗时不计入插件的超时时间"""
+        if worker.ready:
+            return
+
+        if not worker.conn.poll(STARTUP_TIMEOUT):
+            raise TimeoutError(u'插件进程启动超时')
+        _, kind, _ = worker.conn.recv()
+        if kind != READY:
+            raise RuntimeError(u'插件进程启动失败')
+        worker.ready = True
+
+    @staticmethod
+    def _receive(worker, call_id, deadline):
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not worker.conn.poll(remaining):
+                raise TimeoutError(u'插件执行超时')
+
+            rid, kind, payload = worker.conn.recv()
+            if rid == call_id:
+                return kind, payload
+
+    def call(self, method, manifest, args, timeout):
+        """生成器，按批次返回 ResultItem 列表，timeout 从进程就绪后开始计算"""
+        worker = self._acquire(timeout)
+        call_id = next(self._ids)
+        healthy = False
+        try:
+            self._wait_ready(worker)
+            deadline = time.monotonic() + timeout
+            worker.conn.send((call_id, method, manifest['module_name'],
+                              manifest['class_name'], args))
+            while True:
+                kind, payload = self._receive(worker, call_id, deadline)
+                if kind == BATCH:
+                    yield [unpack_item(data) for data in payload]
+                elif kind == DONE:
+                    healthy = True
+                    return
+                else:
+                    healthy = True
+                    raise RuntimeError(payload)
+        except GeneratorExit:
+            # 调用方提前停止时读完剩余结果，进程可以继续复用
+            healthy = self._drain(worker, call_id)
+        except TimeoutError:
+            raise
+        except (EOFError, OSError) as e:
+            raise RuntimeError(u'插件进程已退出: {}'.format(e))
+        finally:
+            if not healthy:
+                log.warning(u'重启插件进程 {}'.format(worker.process.pid))
+                self._discard(worker)
+                worker = None
+            self._idle.put(worker)
+
+    def _drain(self, worker, call_id):
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        try:
+            while True:
+                kind, _ = self._receive(worker, call_id, deadline)
+                if kind != BATCH:
+                    return True
+        except (TimeoutError, EOFError, OSError):
+            return False
+
+    def restart(self):
+        """插件模块重新加载后调用，空闲进程在下次取用时重启，忙碌的进程执行完后重启"""
+        self._generation += 1
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
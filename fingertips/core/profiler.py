@@ -0,0 +1,122 @@
+import time
+import threading
+import functools
+import contextlib
+from collections import deque
+
+from PySide2 import QtCore
+
+from fingertips.utils import get_logger
+from fingertips.settings.config_model import config_model
+
+log = get_logger('插件性能')
+
+IMPORT = 'import'
+INIT = 'init'
+QUERY = 'query'
+RUN = 'run'
+
+# 直方图各桶的上限（毫秒），最后一桶为无上限
+BUCKETS = (1, 5, 10, 50, 100, 500, 1000)
+
+
+def is_ui_thread():
+    app = QtCore.QCoreApplication.instance()
+    return app is not None and QtCore.QThread.currentThread() == app.thread()
+
+
+def percentile(sorted_values, ratio):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+class Timing(object):
+    """单个插件单个阶段最近 size 次的耗时（毫秒）"""
+
+    def __init__(self, size=200):
+        self.samples = deque(maxlen=size)
+        self.total = 0
+        self.slow = 0
+
+    def add(self, ms, slow=False):
+        self.samples.append(ms)
+        self.total += 1
+        self.slow += slow
+
+    def histogram(self):
+        counts = [0] * (len(BUCKETS) + 1)
+        for ms in self.samples:
+            counts[next((i for i, limit in enumerate(BUCKETS) if ms < limit), len(BUCKETS))] += 1
+        return counts
+
+    def stats(self):
+        values = sorted(self.samples)
+        return {
+            'count': self.total,
+            'slow': self.slow,
+            'last': self.samples[-1] if self.samples else 0.0,
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': values[-1] if values else 0.0,
+            'histogram': self.histogram(),
+        }
+
+
+class Profiler(object):
+    """
+    记录插件和 action 各阶段的耗时。
+
+    在主线程中超出 config_model.plugin_latency_budget 毫秒时记录警告，
+    线程池和插件进程中的耗时只做统计。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, name, phase, ms, ui_thread=None):
+        if ui_thread is None:
+            ui_thread = is_ui_thread()
+
+        budget = config_model.plugin_latency_budget.value
+        slow = ui_thread and ms > budget
+        with self._lock:
+            timing = self._timings.get((name, phase))
+            if timing is None:
+                timing = self._timings[(name, phase)] = Timing()
+            timing.add(ms, slow)
+
+        if slow:
+            log.warning(u'{} 的 {} 在主线程中耗时 {:.1f}ms，超出预算 {}ms'.format(
+                name, phase, ms, budget))
+
+    @contextlib.contextmanager
+    def measure(self, name, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, phase, (time.perf_counter() - start) * 1000)
+
+    def wrap(self, name, phase, func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            with self.measure(name, phase):
+                return func(*args, **kwargs)
+
+        return inner
+
+    def snapshot(self):
+        """返回 [(名称, 阶段, 统计)]，按名称和阶段排序"""
+        with self._lock:
+            items = [(name, phase, timing.stats())
+                     for (name, phase), timing in self._timings.items()]
+        return sorted(items, key=lambda x: (x[0], x[1]))
+
+    def clear(self):
+        with self._lock:
+            self._timings.clear()
+
+
+profiler = Profiler()
@@ -0,0 +1,20 @@
+class ResultItem(object):
+    """
+    插件返回的结果数据，不是控件，可以在查询线程中创建。
+
+    以前是 QWidget，参数顺序保持不变，parent 只为兼容旧插件保留，不再使用；
+    插件应只读写 title、checkbox 等数据属性，列表的显示由 ResultItemDelegate 负责。
+    """
+
+    def __init__(self, title, description, keyword='', icon='', date_time='',
+                 checkbox=None, parent=None, data=None):
+        self.title = title
+        self.description = description
+        self.keyword = keyword
+        self.icon = icon
+        self.date_time = date_time  # int list,eg:[2021, 1, 21, 15, 21, 11]
+        self.checkbox = checkbox
+        self.data = data  # 搜索来源附带的数据，插件结果不需要设置
+
+    def __repr__(self):
+        return '<ResultItem {} ({})>'.format(self.title, self.keyword)
@@ -0,0 +1,183 @@
+import re
+import heapq
+
+_WORD_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+|[^\W\da-zA-Z_]+')
+
+KEYWORD = 1.0
+TITLE = 0.8
+DESCRIPTION = 0.5
+
+EXACT_SCORE = 100
+PREFIX_SCORE = 70
+SUBSTRING_SCORE = 55
+TYPO_SCORE = 45
+NGRAM_SCORE = 50
+MIN_DICE = 0.3
+
+
+def split_words(text):
+    """按空白、下划线、驼峰以及中英文边界切分，返回小写单词"""
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def ngrams(term):
+    padded = ' {} '.format(term)
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def edit_distance(a, b, limit):
+    """带相邻交换的编辑距离，超过 limit 时提前返回 limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (prev2 is not None and i > 1 and j > 1 and
+                    a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class _TrieNode(object):
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+
+
+class KeywordIndex(object):
+    """
+    插件搜索索引，构建一次后每次查询只访问相关的词条。
+
+    - 前缀树：匹配词条前缀和首字母缩写
+    - 二元组倒排表：为子串和乱序输入打分
+    - 拼写错误只在与输入共享二元组且长度相近的词条里计算编辑距离
+    - 相同的词条只保存一份，多个插件共用同一份倒排记录
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._terms = []
+        self._term_ids = {}
+        self._postings = []
+        self._grams = {}
+        self._keywords = []
+        self._cache = {}
+
+    def add(self, key, keyword='', title='', description=''):
+        self._cache.clear()
+        self._keywords.append((key, keyword.lower()))
+
+        terms = {}
+        for text, weight in ((keyword, KEYWORD), (title, TITLE), (description, DESCRIPTION)):
+            words = split_words(text)
+            candidates = list(words)
+            if text.strip():
+                candidates.append(text.strip().lower())
+            if len(words) > 1:
+                candidates.append(''.join(w[0] for w in words))
+
+            for term in candidates:
+                if terms.get(term, 0) < weight:
+                    terms[term] = weight
+
+        for term, weight in terms.items():
+            self._add_term(key, term, weight)
+
+    def _add_term(self, key, term, weight):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._terms)
+            self._terms.append(term)
+            self._postings.append([])
+
+            node = self._root
+            for char in term:
+                node = node.children.setdefault(char, _TrieNode())
+                node.entries.append(term_id)
+
+            for gram in ngrams(term):
+                self._grams.setdefault(gram, []).append(term_id)
+
+        self._postings[term_id].append((key, weight))
+
+    def _prefix_terms(self, text):
+        node = self._root
+        for char in text:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.entries
+
+    def search(self, text, limit=20):
+        """返回按得分排序的前 limit 个 key"""
+        return [key for key, _ in self.search_scores(text, limit)]
+
+    def search_scores(self, text, limit=20):
+        """返回按得分排序的前 limit 个 (key, 得分)"""
+        text = text.strip().lower()
+        if not text:
+            return []
+
+        # 多个线程会同时查询，只读写一次缓存，其他线程清空缓存也不影响本次结果
+        cache_key = (text, limit)
+        result = self._cache.get(cache_key)
+        if result is None:
+            result = self._search(text, limit)
+            if len(self._cache) > 512:
+                self._cache.clear()
+            self._cache[cache_key] = result
+        return list(result)
+
+    def _search(self, text, limit):
+        scores = {}
+
+        def hit(term_id, score):
+            for key, weight in self._postings[term_id]:
+                if score * weight > scores.get(key, 0):
+                    scores[key] = score * weight
+
+        term_id = self._term_ids.get(text)
+        if term_id is not None:
+            hit(term_id, EXACT_SCORE)
+
+        prefix_terms = self._prefix_terms(text)
+        for term_id in prefix_terms:
+            hit(term_id, PREFIX_SCORE + 25 * len(text) / len(self._terms[term_id]))
+        prefix_terms = set(prefix_terms)
+
+        for key, keyword in self._keywords:
+            if text in keyword and scores.get(key, 0) < SUBSTRING_SCORE:
+                scores[key] = SUBSTRING_SCORE
+
+        query_grams = ngrams(text)
+        overlaps = {}
+        for gram in query_grams:
+            for term_id in self._grams.get(gram, ()):
+                overlaps[term_id] = overlaps.get(term_id, 0) + 1
+
+        max_distance = 2 if len(text) >= 6 else 1
+        # 每次编辑最多破坏三个二元组，共享太少的词条不可能是拼写错误
+        min_overlap = len(query_grams) - 3 * max_distance
+        for term_id, overlap in overlaps.items():
+            term = self._terms[term_id]
+            dice = 2.0 * overlap / (len(query_grams) + len(term) + 1)
+            if dice >= MIN_DICE:
+                hit(term_id, NGRAM_SCORE * dice)
+
+            if (len(text) >= 3 and overlap >= min_overlap and term_id not in prefix_terms and
+                    abs(len(term) - len(text)) <= max_distance):
+                distance = edit_distance(text, term, max_distance)
+                if distance <= max_distance:
+                    hit(term_id, TYPO_SCORE - 10 * (distance - 1))
+
+        return heapq.nsmallest(limit, scores.items(), key=lambda x: (-x[1], x[0]))
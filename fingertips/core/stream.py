@@ -0,0 +1,50 @@
+import asyncio
+import inspect
+
+
+def iter_async(iterator):
+    """在当前线程中用独立的事件循环逐个取出异步迭代器的结果"""
+    loop = asyncio.new_event_loop()
+    iterator = iterator.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        if hasattr(iterator, 'aclose'):
+            loop.run_until_complete(iterator.aclose())
+        loop.close()
+
+
+def iter_chunks(result):
+    """
+    把插件 query/run 的返回值统一为 ResultItem 列表的迭代器。
+
+    支持列表、生成器、协程和异步迭代器，生成器每次可以产出一个 ResultItem 或一组；
+    调用方提前停止时会关闭插件的生成器。
+    """
+    if inspect.iscoroutine(result):
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(result)
+        finally:
+            loop.close()
+
+    if not result:
+        return
+    if isinstance(result, (list, tuple)):
+        yield list(result)
+        return
+
+    if hasattr(result, '__aiter__'):
+        result = iter_async(result)
+
+    try:
+        for item in result:
+            yield list(item) if isinstance(item, (list, tuple)) else [item]
+    finally:
+        close = getattr(result, 'close', None)
+        if close is not None:
+            close()
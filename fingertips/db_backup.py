@@ -0,0 +1,94 @@
+import os
+import sqlite3
+from datetime import datetime
+
+from fingertips.config import DB_PATH, BACKUP_ROOT
+from fingertips.logger import get_logger
+
+log = get_logger('数据备份')
+
+BACKUP_PREFIX = 'data-'
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.01
+
+
+def list_snapshots(backup_root=BACKUP_ROOT):
+    """返回按时间倒序排列的快照路径"""
+    if not os.path.isdir(backup_root):
+        return []
+
+    names = [n for n in os.listdir(backup_root)
+             if n.startswith(BACKUP_PREFIX) and n.endswith('.db')]
+    # 去掉扩展名再比较，同一时间追加序号的快照排在前面
+    names.sort(key=lambda n: n[:-len('.db')], reverse=True)
+    return [os.path.join(backup_root, n) for n in names]
+
+
+def rotate_snapshots(keep, backup_root=BACKUP_ROOT, exclude=()):
+    """保留最新的 keep 个快照，exclude 中的快照不参与清理"""
+    exclude = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    snapshots = [p for p in list_snapshots(backup_root)
+                 if os.path.normcase(os.path.abspath(p)) not in exclude]
+
+    removed = []
+    for path in snapshots[max(keep, 1):]:
+        try:
+            os.remove(path)
+            removed.append(path)
+        except OSError as e:
+            log.warning(f'删除旧快照失败: {path} {e}')
+    return removed
+
+
+def copy_database(source_path, target_path, pages=BACKUP_PAGES, progress=None):
+    """使用 SQLite 在线备份接口分批复制页面，每批之间短暂让出锁，应用可以继续读写"""
+    source = sqlite3.connect(source_path, timeout=10)
+    target = sqlite3.connect(target_path, timeout=10)
+    try:
+        source.backup(target, pages=pages, progress=progress, sleep=BACKUP_SLEEP)
+    finally:
+        target.close()
+        source.close()
+
+
+def backup_database(db_path=DB_PATH, backup_root=BACKUP_ROOT, keep=5, progress=None):
+    """keep 为 None 时不清理旧快照"""
+    if not os.path.exists(backup_root):
+        os.makedirs(backup_root)
+
+    # 精确到毫秒，同名时追加序号，避免连续备份互相覆盖
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]
+    target_path = os.path.join(backup_root, '{}{}.db'.format(BACKUP_PREFIX, stamp))
+    index = 1
+    while os.path.exists(target_path):
+        target_path = os.path.join(
+            backup_root, '{}{}-{}.db'.format(BACKUP_PREFIX, stamp, index))
+        index += 1
+    part_path = target_path + '.part'
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+    copy_database(db_path, part_path, progress=progress)
+    os.replace(part_path, target_path)
+
+    if keep is not None:
+        rotate_snapshots(keep, backup_root)
+    return target_path
+
+
+def restore_database(snapshot_path, db_path=DB_PATH, backup_root=BACKUP_ROOT,
+                     keep=5, progress=None):
+    """恢复前先为当前数据库拍一份快照，避免误操作后无法找回"""
+    conn = sqlite3.connect(snapshot_path)
+    try:
+        result = conn.execute('PRAGMA quick_check').fetchone()[0]
+    finally:
+        conn.close()
+    if result != 'ok':
+        raise ValueError(f'快照已损坏: {result}')
+
+    safety_path = backup_database(db_path, backup_root, None, progress)
+    copy_database(snapshot_path, db_path, progress=progress)
+    # 刚恢复的快照可能是最旧的一个，不能在这里被清理掉
+    rotate_snapshots(keep, backup_root, exclude=[snapshot_path])
+    return safety_path
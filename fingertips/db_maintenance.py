@@ -0,0 +1,262 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from PySide2 import QtCore
+
+from fingertips.config import DB_PATH
+from fingertips.utils import get_logger, get_idle_seconds
+from fingertips.widget_utils import signal_bus
+from fingertips.settings.config_model import config_model
+
+log = get_logger('数据维护')
+
+SIZE_HISTORY_TABLE = 'db_size_history'
+SIZE_HISTORY_LIMIT = 180
+VACUUM_PAGES = 2000
+
+
+class RetentionPolicy(object):
+    """单个数据表的保留策略，0 表示不限制"""
+
+    def __init__(self, table, order_column='rowid', max_rows=0, max_days=0,
+                 max_bytes=0, size_column=None):
+        self.table = table
+        self.order_column = order_column
+        self.max_rows = max_rows
+        self.max_days = max_days
+        self.max_bytes = max_bytes
+        self.size_column = size_column
+
+    def __repr__(self):
+        return '<RetentionPolicy {} rows={} days={} bytes={}>'.format(
+            self.table, self.max_rows, self.max_days, self.max_bytes)
+
+
+def build_policies():
+    return [
+        RetentionPolicy(
+            'HistoricalCuttingBoardCard',
+            order_column='timestamp',
+            max_rows=config_model.clipboard_max_rows.value,
+            max_days=config_model.clipboard_max_days.value,
+            max_bytes=config_model.clipboard_max_mb.value * 1024 * 1024,
+            size_column='content'
+        ),
+        RetentionPolicy(
+            'chats',
+            max_rows=config_model.chat_max_rows.value,
+        ),
+    ]
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+    conn.execute('PRAGMA busy_timeout = 10000')
+    return conn
+
+
+def _table_exists(conn, table):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,)
+    ).fetchone() is not None
+
+
+def apply_policy(conn, policy):
+    """按数量、时间、大小三种规则删除最旧的数据，返回删除的行数"""
+    if not _table_exists(conn, policy.table):
+        return 0
+
+    table = '"{}"'.format(policy.table)
+    order = policy.order_column
+    deleted = 0
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if policy.max_days and order != 'rowid':
+            cutoff = (datetime.now() - timedelta(days=policy.max_days)).isoformat()
+            deleted += conn.execute(
+                'DELETE FROM {} WHERE "{}" < ?'.format(table, order), (cutoff,)
+            ).rowcount
+
+        order_sql = 'rowid DESC' if order == 'rowid' else '"{}" DESC, rowid DESC'.format(order)
+        if policy.max_rows:
+            deleted += conn.execute(
+                'DELETE FROM {0} WHERE rowid IN ('
+                'SELECT rowid FROM {0} ORDER BY {1} LIMIT -1 OFFSET ?)'.format(
+                    table, order_sql),
+                (policy.max_rows,)
+            ).rowcount
+
+        if policy.max_bytes and policy.size_column:
+            deleted += conn.execute(
+                'DELETE FROM {0} WHERE rowid IN ('
+                'SELECT rowid FROM ('
+                'SELECT rowid, SUM(LENGTH("{1}")) OVER (ORDER BY {2}) AS total '
+                'FROM {0}) WHERE total > ?)'.format(
+                    table, policy.size_column, order_sql),
+                (policy.max_bytes,)
+            ).rowcount
+
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+    return deleted
+
+
+def incremental_vacuum(conn, pages=VACUUM_PAGES):
+    """回收空闲页，首次运行时会把数据库切换为增量 vacuum 模式"""
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        # auto_vacuum 只有在完整 VACUUM 之后才会生效，只需执行一次
+        log.info('切换数据库为增量 vacuum 模式')
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        return 0
+
+    freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    conn.execute('PRAGMA incremental_vacuum({})'.format(int(pages))).fetchall()
+    return min(freelist, pages)
+
+
+def record_size(conn, db_path):
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS {} ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, '
+        'size INTEGER, freelist_count INTEGER)'.format(SIZE_HISTORY_TABLE))
+
+    size = os.path.getsize(db_path)
+    freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    conn.execute(
+        'INSERT INTO {} (timestamp, size, freelist_count) VALUES (?, ?, ?)'.format(
+            SIZE_HISTORY_TABLE),
+        (datetime.now().isoformat(), size, freelist)
+    )
+    apply_policy(conn, RetentionPolicy(SIZE_HISTORY_TABLE, max_rows=SIZE_HISTORY_LIMIT))
+    return size
+
+
+def run_maintenance(policies, db_path=DB_PATH, vacuum_pages=VACUUM_PAGES):
+    report = {'deleted': {}, 'freed_pages': 0, 'size_before': 0, 'size': 0}
+    if not os.path.exists(db_path):
+        return report
+
+    report['size_before'] = os.path.getsize(db_path)
+    conn = _connect(db_path)
+    try:
+        for policy in policies:
+            report['deleted'][policy.table] = apply_policy(conn, policy)
+
+        report['freed_pages'] = incremental_vacuum(conn, vacuum_pages)
+        conn.execute('ANALYZE')
+        report['size'] = record_size(conn, db_path)
+    finally:
+        conn.close()
+
+    return report
+
+
+def get_size_history(db_path=DB_PATH, limit=SIZE_HISTORY_LIMIT):
+    """返回按时间升序排列的 (timestamp, size) 列表"""
+    if not os.path.exists(db_path):
+        return []
+
+    conn = _connect(db_path)
+    try:
+        if not _table_exists(conn, SIZE_HISTORY_TABLE):
+            return []
+        rows = conn.execute(
+            'SELECT timestamp, size FROM {} ORDER BY id DESC LIMIT ?'.format(
+                SIZE_HISTORY_TABLE), (limit,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return rows[::-1]
+
+
+class DBMaintenanceThread(QtCore.QThread):
+    reported = QtCore.Signal(dict)
+
+    def __init__(self, policies, parent=None):
+        super().__init__(parent)
+        self.policies = policies
+
+    def run(self):
+        try:
+            report = run_maintenance(self.policies)
+        except Exception as e:
+            log.error(f'数据维护失败: {e}')
+            report = {'error': str(e)}
+
+        self.reported.emit(report)
+
+
+class MaintenanceScheduler(QtCore.QObject):
+    """在系统空闲时定期执行数据维护"""
+
+    CHECK_INTERVAL = 5 * 60 * 1000
+    IDLE_SECONDS = 3 * 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.CHECK_INTERVAL)
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+
+        signal_bus.db_maintenance_requested.connect(self.run_now)
+
+    def is_due(self):
+        if not config_model.enable_maintenance.value:
+            return False
+
+        history = get_size_history(limit=1)
+        if not history:
+            return True
+
+        last_run = datetime.fromisoformat(history[-1][0])
+        interval = timedelta(hours=config_model.maintenance_interval_hours.value)
+        return datetime.now() - last_run >= interval
+
+    def check(self):
+        if self.is_running():
+            return
+
+        if get_idle_seconds() < self.IDLE_SECONDS:
+            return
+
+        try:
+            due = self.is_due()
+        except Exception as e:
+            log.warning(f'读取维护记录失败: {e}')
+            return
+
+        if due:
+            self.run_now()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.isRunning()
+
+    def run_now(self):
+        if self.is_running():
+            return
+
+        policies = build_policies()
+        log.info('开始数据维护: {}'.format(policies))
+        self._thread = DBMaintenanceThread(policies, self)
+        self._thread.reported.connect(self._maintenance_reported)
+        self._thread.start()
+
+    def _maintenance_reported(self, report):
+        log.info('数据维护完成: {}'.format(report))
+        signal_bus.db_maintenance_finished.emit(report)
+
+    def stop(self):
+        self.timer.stop()
+        if self.is_running():
+            self._thread.wait(3000)
@@ -1,21 +1,272 @@
 import os
-import dataset
+import json
+import math
+import time
+import sqlite3
+import threading
+from functools import lru_cache
 
 from fingertips.config import DB_PATH
 
+_local = threading.local()
 
-class DBBase(object):
-    def __init__(self):
+# 与 dataset 一致，列表和字典以 JSON 文本保存在 JSON 类型的列中
+sqlite3.register_adapter(list, json.dumps)
+sqlite3.register_adapter(dict, json.dumps)
+sqlite3.register_converter('JSON', json.loads)
+
+
+def get_connection():
+    """每个线程共用一个连接，sqlite3 会按 SQL 文本缓存预编译语句"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
         if not os.path.exists(os.path.dirname(DB_PATH)):
             os.makedirs(os.path.dirname(DB_PATH))
 
-        self._db = dataset.connect(f'sqlite:///{DB_PATH}')
+        conn = sqlite3.connect(
+            DB_PATH, timeout=10, isolation_level=None, cached_statements=256,
+            detect_types=sqlite3.PARSE_DECLTYPES)
+        _local.conn = conn
+    return conn
+
+
+def _quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _column_type(value):
+    if isinstance(value, bool):
+        return 'BOOLEAN'
+    if isinstance(value, int):
+        return 'INTEGER'
+    if isinstance(value, float):
+        return 'FLOAT'
+    if isinstance(value, (list, dict)):
+        return 'JSON'
+    return 'TEXT'
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(table, columns):
+    return 'INSERT INTO {} ({}) VALUES ({})'.format(
+        _quote(table), ', '.join(_quote(c) for c in columns),
+        ', '.join('?' * len(columns)))
+
+
+@lru_cache(maxsize=None)
+def _where_sql(columns):
+    if not columns:
+        return ''
+    return ' WHERE ' + ' AND '.join('{} = ?'.format(_quote(c)) for c in columns)
+
+
+@lru_cache(maxsize=None)
+def _update_sql(table, columns, keys):
+    return 'UPDATE {} SET {}{}'.format(
+        _quote(table), ', '.join('{} = ?'.format(_quote(c)) for c in columns),
+        _where_sql(keys))
+
+
+class Table(object):
+    """按需建表、自动补列的轻量数据表，接口与 dataset.Table 保持一致"""
+
+    def __init__(self, conn, name):
+        self._conn = conn
+        self.name = name
+        self._columns = None
+
+    @property
+    def columns(self):
+        if not self._columns:
+            # 表不存在时不缓存，其他实例可能随后建表
+            self._columns = [row[1] for row in self._conn.execute(
+                'PRAGMA table_info({})'.format(_quote(self.name)))]
+        return self._columns
+
+    @property
+    def exists(self):
+        return bool(self.columns)
+
+    def _sync_columns(self, row):
+        if not self.exists:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS {} (id INTEGER PRIMARY KEY AUTOINCREMENT)'.format(
+                    _quote(self.name)))
+            self._columns = ['id']
+
+        if any(c not in self._columns for c in row):
+            # 其他连接可能已经补过列，先刷新一次
+            self._columns = None
+
+        for column, value in row.items():
+            if column not in self.columns:
+                self._conn.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(
+                    _quote(self.name), _quote(column), _column_type(value)))
+                self._columns.append(column)
+
+    def _select(self, sql, params=()):
+        cursor = self._conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def _filter(self, filters):
+        """返回 (where 语句, 参数)，过滤不存在的列时返回 None"""
+        if any(c not in self.columns for c in filters):
+            return None
+        keys = tuple(filters)
+        return _where_sql(keys), tuple(filters[k] for k in keys)
+
+    def insert(self, row):
+        self._sync_columns(row)
+        columns = tuple(row)
+        cursor = self._conn.execute(
+            _insert_sql(self.name, columns), tuple(row[c] for c in columns))
+        return cursor.lastrowid
+
+    def insert_many(self, rows):
+        """相邻的同列数据使用一次 executemany，全部在单个事务中写入"""
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        for row in rows:
+            self._sync_columns(row)
+
+        # 只合并相邻的同列数据，保持插入顺序
+        groups = []
+        for row in rows:
+            columns = tuple(row)
+            if groups and groups[-1][0] == columns:
+                groups[-1][1].append(row)
+            else:
+                groups.append((columns, [row]))
+
+        with self._conn:
+            self._conn.execute('BEGIN')
+            for columns, items in groups:
+                self._conn.executemany(
+                    _insert_sql(self.name, columns),
+                    [tuple(item[c] for c in columns) for item in items])
+        return len(rows)
+
+    def update(self, row, keys):
+        self._sync_columns(row)
+        keys = tuple(keys)
+        columns = tuple(c for c in row if c not in keys)
+        if not columns:
+            return 0
+
+        cursor = self._conn.execute(
+            _update_sql(self.name, columns, keys),
+            tuple(row[c] for c in columns) + tuple(row[k] for k in keys))
+        return cursor.rowcount
+
+    def upsert(self, row, keys):
+        """keys 对应的行存在时更新，否则插入"""
+        if self.exists and self.count(**{k: row[k] for k in keys}):
+            self.update(row, keys)
+            return True
+        return self.insert(row)
+
+    def find(self, **filters):
+        if not self.exists:
+            return []
+
+        clause = self._filter(filters)
+        if clause is None:
+            return []
+
+        where, params = clause
+        return self._select(
+            'SELECT * FROM {}{} ORDER BY rowid'.format(_quote(self.name), where), params)
+
+    def iterate(self, order='rowid'):
+        """逐行返回全部数据，调用方可以随时停止读取"""
+        if not self.exists:
+            return
+
+        cursor = self._conn.execute(
+            'SELECT * FROM {} ORDER BY {}'.format(_quote(self.name), order))
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            yield dict(zip(names, row))
+
+    def find_one(self, **filters):
+        if not self.exists:
+            return None
+
+        clause = self._filter(filters)
+        if clause is None:
+            return None
+
+        where, params = clause
+        rows = self._select(
+            'SELECT * FROM {}{} LIMIT 1'.format(_quote(self.name), where), params)
+        return rows[0] if rows else None
+
+    def all(self):
+        return self.find()
+
+    def delete(self, **filters):
+        if not self.exists:
+            return False
+
+        clause = self._filter(filters)
+        if clause is None:
+            return False
+
+        where, params = clause
+        cursor = self._conn.execute(
+            'DELETE FROM {}{}'.format(_quote(self.name), where), params)
+        return cursor.rowcount > 0
+
+    def count(self, **filters):
+        if not self.exists:
+            return 0
+
+        clause = self._filter(filters)
+        if clause is None:
+            return 0
+
+        where, params = clause
+        return self._conn.execute(
+            'SELECT COUNT(*) FROM {}{}'.format(_quote(self.name), where), params
+        ).fetchone()[0]
+
+
+class Database(object):
+    def __init__(self, conn):
+        self._conn = conn
+        self._tables = {}
+
+    def __getitem__(self, name):
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = Table(self._conn, name)
+        return table
+
+    def query(self, sql, *params):
+        # 结构可能被修改，需要重新读取列信息
+        self._tables.clear()
+        return self._conn.execute(sql, params)
+
+
+class DBBase(object):
+    def __init__(self):
+        self._db = Database(get_connection())
 
 
 class SoftwareDB(DBBase):
+    """
+    软件列表，拖入的软件显示在主窗口中；
+    source 为 index 的是后台索引发现的软件，只用于搜索。
+    """
+    INDEX_SOURCE = 'index'
+
     def __init__(self):
         super().__init__()
         self.table = self._db['software']
+        self._conn = self._db._conn
 
     def add_software(self, name, exe_path, lnk_path=''):
         data = self.table.find_one(exe_path=exe_path)
@@ -24,10 +275,110 @@ class SoftwareDB(DBBase):
                 'name': name, 'exe_path': exe_path, 'lnk_path': lnk_path})
             return True
 
+        if data.get('source') == self.INDEX_SOURCE:
+            # 已被索引的软件拖入后显示在主窗口中
+            self.table.update({'id': data['id'], 'name': name, 'lnk_path': lnk_path,
+                               'source': ''}, ['id'])
+            return True
+
         return False
 
-    def get_software(self):
-        return self.table.all()
+    def version(self):
+        """(行数, 最大 id)，增删软件后会变化"""
+        if not self.table.exists:
+            return 0, 0
+        return tuple(self._conn.execute('SELECT COUNT(*), MAX(id) FROM software').fetchone())
+
+    def get_software(self, include_indexed=False):
+        """返回 (name, exe_path, lnk_path) 元组列表"""
+        if not self.table.exists:
+            return []
+
+        if include_indexed or 'source' not in self.table.columns:
+            return self._conn.execute(
+                'SELECT name, exe_path, lnk_path FROM software ORDER BY rowid').fetchall()
+        return self._conn.execute(
+            "SELECT name, exe_path, lnk_path FROM software WHERE COALESCE(source, '') != ? "
+            "ORDER BY rowid", (self.INDEX_SOURCE,)).fetchall()
+
+    def get_indexed(self):
+        """返回索引发现的软件 {lnk_path: (name, exe_path)}"""
+        if 'source' not in self.table.columns:
+            return {}
+        return {lnk_path: (name, exe_path) for name, exe_path, lnk_path in self._conn.execute(
+            'SELECT name, exe_path, lnk_path FROM software WHERE source = ?',
+            (self.INDEX_SOURCE,))}
+
+    def sync_indexed(self, added, removed):
+        """
+        在一个事务中删除 removed 中的索引软件（lnk_path），
+        并插入 added 中的 (name, exe_path, lnk_path)，已存在同一程序的不再插入。
+        """
+        self.table._sync_columns({
+            'name': '', 'exe_path': '', 'lnk_path': '', 'source': self.INDEX_SOURCE})
+        with self._conn:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'DELETE FROM software WHERE source = ? AND lnk_path = ?',
+                [(self.INDEX_SOURCE, path) for path in removed])
+
+            existing = {row[0] for row in self._conn.execute('SELECT exe_path FROM software')}
+            rows = []
+            for name, exe_path, lnk_path in added:
+                if exe_path not in existing:
+                    existing.add(exe_path)
+                    rows.append((name, exe_path, lnk_path, self.INDEX_SOURCE))
+            self._conn.executemany(
+                _insert_sql('software', ('name', 'exe_path', 'lnk_path', 'source')), rows)
+        return len(rows)
+
+
+class FrecencyDB(DBBase):
+    """
+    使用记录，按指数衰减计算常用程度，kind 区分插件、软件等不同来源。
+
+    每条记录保存 rank = ln(得分) + λ·时间，不同记录之间比较 rank 与当前时间无关，
+    所以每次使用只需更新一行，排序时也不用重新计算衰减。
+    """
+    HALF_LIFE_DAYS = 14
+    DECAY = math.log(2) / (HALF_LIFE_DAYS * 86400)
+
+    _ranks = {}
+
+    def __init__(self, kind):
+        super().__init__()
+        self.kind = kind
+        self.table = self._db['frecency']
+
+    def ranks(self):
+        ranks = self._ranks.get(self.kind)
+        if ranks is None:
+            ranks = self._ranks[self.kind] = {
+                row['key']: row['rank'] for row in self.table.find(kind=self.kind)}
+        return ranks
+
+    def score(self, key, now=None):
+        """当前时间的得分，未使用过为 0"""
+        rank = self.ranks().get(key)
+        if rank is None:
+            return 0.0
+        return math.exp(rank - self.DECAY * (now or time.time()))
+
+    def record(self, key, weight=1.0, now=None):
+        now = now or time.time()
+        rank = math.log(self.score(key, now) + weight) + self.DECAY * now
+
+        row = {'kind': self.kind, 'key': key, 'rank': rank}
+        if key in self.ranks():
+            self.table.update(row, ['kind', 'key'])
+        else:
+            self.table.insert(row)
+        self.ranks()[key] = rank
+
+    def sort(self, items, key=lambda x: x):
+        """按常用程度从高到低排序，未使用过的保持原来的顺序"""
+        ranks = self.ranks()
+        return sorted(items, key=lambda x: -ranks.get(key(x), -math.inf))
 
 
 class AIActionDB(DBBase):
@@ -35,14 +386,20 @@ class AIActionDB(DBBase):
         super().__init__()
         self.table = self._db['ai_actions']
 
+    @staticmethod
+    def _to_action(data):
+        if data is not None and 'enabled' in data:
+            data['enabled'] = bool(data['enabled'])
+        return data
+
     def add_action(self, action):
         return self.table.insert(action)
 
     def get_action(self, name):
-        return self.table.find_one(name=name)
+        return self._to_action(self.table.find_one(name=name))
 
     def get_actions(self):
-        return self.table.all()
+        return [self._to_action(data) for data in self.table.all()]
 
     def delete_action(self, name):
         return self.table.delete(name=name)
@@ -68,6 +425,21 @@ class ChatDB(DBBase):
     def get_chats(self):
         return self.table.all()
 
+    def iter_chats(self):
+        """从最新的聊天开始逐个返回"""
+        return self.table.iterate('rowid DESC')
+
+    @staticmethod
+    def histories(chat):
+        """聊天记录由 ChatConfigListItem 编码为 JSON 文本保存，解析失败时返回空列表"""
+        histories = chat.get('histories')
+        if isinstance(histories, str):
+            try:
+                histories = json.loads(histories)
+            except ValueError:
+                return []
+        return histories if isinstance(histories, list) else []
+
     def delete_chat(self, cid):
         self.table.delete(cid=cid)
 
@@ -0,0 +1,79 @@
+from PySide2 import QtCore, QtGui, QtWidgets
+
+
+class SoftwareTileDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    绘制软件图标和名称，图标取 DecorationRole 中的 QPixmap。
+
+    所有格子共用一个委托，不再为每个软件创建控件；编辑器只在重命名时创建。
+    """
+
+    def __init__(self, tile_size, icon_size, margin=6, parent=None):
+        super().__init__(parent)
+        self.tile_size = tile_size
+        self.icon_size = icon_size
+        self.margin = margin
+        self._editing = QtCore.QPersistentModelIndex()
+
+    def sizeHint(self, option, index):
+        return self.tile_size
+
+    def icon_rect(self, rect):
+        return QtCore.QRect(
+            rect.left() + (rect.width() - self.icon_size) // 2,
+            rect.top() + self.margin, self.icon_size, self.icon_size)
+
+    def name_rect(self, rect):
+        top = rect.top() + self.margin + self.icon_size + 4
+        return QtCore.QRect(rect.left() + 4, top, rect.width() - 8, rect.bottom() - top - 2)
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QtWidgets.QApplication.style()
+
+        option = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        text = option.text
+        option.text = ''
+        option.icon = QtGui.QIcon()
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        pixmap = index.data(QtCore.Qt.DecorationRole)
+        if isinstance(pixmap, QtGui.QPixmap) and not pixmap.isNull():
+            target = QtCore.QRect(QtCore.QPoint(0, 0), pixmap.size().scaled(
+                self.icon_size, self.icon_size, QtCore.Qt.KeepAspectRatio))
+            target.moveCenter(self.icon_rect(option.rect).center())
+            painter.drawPixmap(target, pixmap)
+
+        # 编辑时不绘制名称，避免与编辑器重叠
+        if QtCore.QPersistentModelIndex(index) != self._editing:
+            painter.setFont(option.font)
+            painter.setPen(option.palette.color(QtGui.QPalette.Text))
+            painter.drawText(self.name_rect(option.rect),
+                             QtCore.Qt.AlignHCenter | QtCore.Qt.AlignTop |
+                             QtCore.Qt.TextWrapAnywhere, text)
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        editor = QtWidgets.QLineEdit(parent)
+        editor.setAlignment(QtCore.Qt.AlignCenter)
+        editor.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
+        editor.setStyleSheet('border: 1px solid #007ACC; border-radius: 2px;')
+        self._editing = QtCore.QPersistentModelIndex(index)
+        return editor
+
+    def destroyEditor(self, editor, index):
+        self._editing = QtCore.QPersistentModelIndex()
+        super().destroyEditor(editor, index)
+
+    def updateEditorGeometry(self, editor, option, index):
+        rect = self.name_rect(option.rect)
+        rect.setHeight(min(rect.height(), 24))
+        editor.setGeometry(rect)
+
+    def setModelData(self, editor, model, index):
+        # 空名称不保存
+        if editor.text().strip():
+            model.setData(index, editor.text().strip(), QtCore.Qt.EditRole)
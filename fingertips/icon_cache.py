@@ -0,0 +1,320 @@
+import os
+import json
+import ctypes
+import ctypes.wintypes
+import hashlib
+from collections import OrderedDict
+
+from PySide2 import QtCore
+from PySide2 import QtGui
+from PySide2 import QtWidgets
+
+from fingertips.config import CONFIG_ROOT
+from fingertips.utils import get_logger, get_exe_path
+
+log = get_logger('图标缓存')
+
+ICON_ROOT = os.path.join(CONFIG_ROOT, 'cache', 'icons')
+INDEX_PATH = os.path.join(ICON_ROOT, 'index.json')
+
+
+def file_stamp(path):
+    """文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+SHGFI_ICON = 0x100
+SHGFI_LARGEICON = 0x0
+DI_MASK = 0x1
+DI_NORMAL = 0x3
+
+
+class SHFILEINFOW(ctypes.Structure):
+    _fields_ = [('hIcon', ctypes.wintypes.HICON),
+                ('iIcon', ctypes.c_int),
+                ('dwAttributes', ctypes.wintypes.DWORD),
+                ('szDisplayName', ctypes.c_wchar * 260),
+                ('szTypeName', ctypes.c_wchar * 80)]
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [('biSize', ctypes.wintypes.DWORD),
+                ('biWidth', ctypes.wintypes.LONG),
+                ('biHeight', ctypes.wintypes.LONG),
+                ('biPlanes', ctypes.wintypes.WORD),
+                ('biBitCount', ctypes.wintypes.WORD),
+                ('biCompression', ctypes.wintypes.DWORD),
+                ('biSizeImage', ctypes.wintypes.DWORD),
+                ('biXPelsPerMeter', ctypes.wintypes.LONG),
+                ('biYPelsPerMeter', ctypes.wintypes.LONG),
+                ('biClrUsed', ctypes.wintypes.DWORD),
+                ('biClrImportant', ctypes.wintypes.DWORD)]
+
+
+_shell32 = ctypes.WinDLL('shell32')
+_user32 = ctypes.WinDLL('user32')
+_gdi32 = ctypes.WinDLL('gdi32')
+
+_shell32.SHDefExtractIconW.argtypes = [
+    ctypes.wintypes.LPCWSTR, ctypes.c_int, ctypes.wintypes.UINT,
+    ctypes.POINTER(ctypes.wintypes.HICON), ctypes.POINTER(ctypes.wintypes.HICON),
+    ctypes.wintypes.UINT]
+_shell32.SHDefExtractIconW.restype = ctypes.c_long
+_shell32.SHGetFileInfoW.argtypes = [
+    ctypes.wintypes.LPCWSTR, ctypes.wintypes.DWORD, ctypes.POINTER(SHFILEINFOW),
+    ctypes.wintypes.UINT, ctypes.wintypes.UINT]
+_shell32.SHGetFileInfoW.restype = ctypes.c_size_t
+_user32.DrawIconEx.argtypes = [
+    ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.wintypes.HICON,
+    ctypes.c_int, ctypes.c_int, ctypes.wintypes.UINT, ctypes.wintypes.HBRUSH,
+    ctypes.wintypes.UINT]
+_user32.DestroyIcon.argtypes = [ctypes.wintypes.HICON]
+_gdi32.CreateCompatibleDC.argtypes = [ctypes.wintypes.HDC]
+_gdi32.CreateCompatibleDC.restype = ctypes.wintypes.HDC
+_gdi32.CreateDIBSection.argtypes = [
+    ctypes.wintypes.HDC, ctypes.POINTER(BITMAPINFOHEADER), ctypes.wintypes.UINT,
+    ctypes.POINTER(ctypes.c_void_p), ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD]
+_gdi32.CreateDIBSection.restype = ctypes.wintypes.HBITMAP
+_gdi32.SelectObject.argtypes = [ctypes.wintypes.HDC, ctypes.wintypes.HGDIOBJ]
+_gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+_gdi32.DeleteObject.argtypes = [ctypes.wintypes.HGDIOBJ]
+_gdi32.DeleteDC.argtypes = [ctypes.wintypes.HDC]
+
+
+def _load_hicon(path, size):
+    """优先按 size 从程序文件中取图标，其他文件使用外壳的大图标，调用方负责 DestroyIcon"""
+    try:
+        target = get_exe_path(path) or path
+    except Exception:
+        target = path
+
+    hicon = ctypes.wintypes.HICON()
+    if _shell32.SHDefExtractIconW(target, 0, 0, ctypes.byref(hicon), None, size) == 0 and hicon:
+        return hicon
+
+    info = SHFILEINFOW()
+    if _shell32.SHGetFileInfoW(
+            path, 0, ctypes.byref(info), ctypes.sizeof(info), SHGFI_ICON | SHGFI_LARGEICON):
+        return info.hIcon
+    return None
+
+
+def _draw_icon(hicon, size, flags):
+    """把图标画到 32 位 DIB 上，返回 BGRA 字节"""
+    header = BITMAPINFOHEADER()
+    header.biSize = ctypes.sizeof(header)
+    header.biWidth = size
+    header.biHeight = -size  # 自上而下
+    header.biPlanes = 1
+    header.biBitCount = 32
+
+    bits = ctypes.c_void_p()
+    hdc = _gdi32.CreateCompatibleDC(None)
+    bitmap = _gdi32.CreateDIBSection(hdc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+    try:
+        old = _gdi32.SelectObject(hdc, bitmap)
+        _user32.DrawIconEx(hdc, 0, 0, hicon, size, size, 0, None, flags)
+        _gdi32.GdiFlush()
+        _gdi32.SelectObject(hdc, old)
+        return bytearray(ctypes.string_at(bits, size * size * 4))
+    finally:
+        _gdi32.DeleteObject(bitmap)
+        _gdi32.DeleteDC(hdc)
+
+
+def _hicon_to_image(hicon, size):
+    data = _draw_icon(hicon, size, DI_NORMAL)
+    if not any(data[3::4]):
+        # 没有透明通道的旧式图标，按掩码补上透明度
+        mask = _draw_icon(hicon, size, DI_MASK)
+        for i in range(0, len(data), 4):
+            if mask[i]:
+                data[i:i + 4] = b'\0\0\0\0'
+            else:
+                data[i + 3] = 255
+    return QtGui.QImage(bytes(data), size, size, QtGui.QImage.Format_ARGB32_Premultiplied).copy()
+
+
+def extract_icon(path, size):
+    """
+    用 Win32 接口取系统图标，返回 QImage，可以在后台线程中调用。
+
+    QFileIconProvider 和 QPixmap 只能在主线程中使用，这里不使用它们，
+    转换为 QPixmap 的工作在主线程中完成。
+    """
+    try:
+        # 线程池中的线程需要初始化 COM，外壳才能取到快捷方式等的图标
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+    hicon = _load_hicon(path, size)
+    if not hicon:
+        return QtGui.QImage()
+    try:
+        return _hicon_to_image(hicon, size)
+    finally:
+        _user32.DestroyIcon(hicon)
+
+
+class IconTask(QtCore.QRunnable):
+    def __init__(self, cache, path, size, stamp, png_path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.cache = cache
+        self.path = path
+        self.size = size
+        self.stamp = stamp
+        self.png_path = png_path
+
+    def run(self):
+        stamp = file_stamp(self.path)
+        if stamp is not None and stamp == self.stamp:
+            self.cache.task_done.emit(self, None, stamp)
+            return
+
+        image = None
+        try:
+            image = extract_icon(self.path, self.size)
+            if stamp is not None and not image.isNull():
+                if not os.path.exists(ICON_ROOT):
+                    os.makedirs(ICON_ROOT, exist_ok=True)
+                image.save(self.png_path, 'PNG')
+        except Exception as e:
+            log.warning(u'提取图标失败 {}: {}'.format(self.path, e))
+
+        self.cache.task_done.emit(self, image, stamp)
+
+
+class IconCache(QtCore.QObject):
+    """
+    软件图标缓存，按 (路径, 尺寸) 缓存渲染好的 PNG。
+
+    pixmap 只读内存或磁盘缓存，不会在主线程中提取图标：没有缓存时返回占位图标，
+    缓存的图标在后台按文件的修改时间和大小校验，图标就绪或有变化时发出 icon_ready。
+    """
+    icon_ready = QtCore.Signal(str, int, object)
+    task_done = QtCore.Signal(object, object, object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls, create=True):
+        """全局共用的缓存，在 QApplication 创建后第一次使用时才创建"""
+        if cls._instance is None and create:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, capacity=512, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._pixmaps = OrderedDict()
+        self._placeholders = {}
+        self._index = None
+        self._pending = {}
+        self._checked = set()
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(1000)
+        self._save_timer.timeout.connect(self._save_index)
+
+        self.task_done.connect(self._task_done)
+
+    @staticmethod
+    def _key(path, size):
+        return '{}|{}'.format(size, os.path.normcase(os.path.abspath(path)))
+
+    @staticmethod
+    def _png_path(key):
+        return os.path.join(ICON_ROOT, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.png')
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(INDEX_PATH):
+                try:
+                    with open(INDEX_PATH, encoding='utf-8') as f:
+                        self._index = json.load(f)
+                except (OSError, ValueError) as e:
+                    log.warning(u'读取图标索引失败: {}'.format(e))
+        return self._index
+
+    def _save_index(self):
+        try:
+            if not os.path.exists(ICON_ROOT):
+                os.makedirs(ICON_ROOT, exist_ok=True)
+            with open(INDEX_PATH, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False)
+        except OSError as e:
+            log.warning(u'写入图标索引失败: {}'.format(e))
+
+    def placeholder(self, size):
+        pixmap = self._placeholders.get(size)
+        if pixmap is None:
+            pixmap = self._placeholders[size] = QtWidgets.QFileIconProvider().icon(
+                QtWidgets.QFileIconProvider.File).pixmap(size, size)
+        return pixmap
+
+    def _remember(self, key, pixmap):
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.capacity:
+            self._pixmaps.popitem(last=False)
+
+    def pixmap(self, path, size):
+        key = self._key(path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        else:
+            stamp = self._load_index().get(key)
+            if stamp is not None:
+                pixmap = QtGui.QPixmap(self._png_path(key))
+            if pixmap is None or pixmap.isNull():
+                pixmap = None
+            else:
+                self._remember(key, pixmap)
+
+        # 每次运行只校验一次，文件更新后在后台重新提取
+        if key not in self._checked:
+            self._refresh(key, path, size)
+        return self.placeholder(size) if pixmap is None else pixmap
+
+    def _refresh(self, key, path, size):
+        if key in self._pending:
+            return
+
+        stamp = self._load_index().get(key) if key in self._pixmaps else None
+        task = self._pending[key] = IconTask(self, path, size, stamp, self._png_path(key))
+        self._pool.start(task)
+
+    def _task_done(self, task, image, stamp):
+        key = self._key(task.path, task.size)
+        self._pending.pop(key, None)
+        self._checked.add(key)
+        if image is None or image.isNull():
+            return
+
+        if stamp is not None:
+            self._index[key] = stamp
+            self._save_timer.start()
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._remember(key, pixmap)
+        self.icon_ready.emit(task.path, task.size, pixmap)
+
+    def flush(self):
+        """退出前写入尚未保存的索引"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_index()
+        self._pool.clear()
@@ -8,6 +8,7 @@ import qframelesswindow
 import qfluentwidgets
 from qfluentwidgets import FluentIcon
 
+from fingertips.widget_utils import signal_bus
 from fingertips.settings.config_model import config_model
 from fingertips.db_utils import AIActionDB, CozeActionDB
 
@@ -412,6 +413,7 @@ class AIActionPage(QtWidgets.QWidget):
 
     def _action_enabled_changed(self, data):
         self.db.update_action(data)
+        signal_bus.ai_actions_changed.emit()
 
     def _action_edit(self, data):
         apf = AddPresetForm(data, parent=self)
@@ -427,6 +429,7 @@ class AIActionPage(QtWidgets.QWidget):
         else:
             self.db.delete_action(data['name'])
             self.db.add_action(new_data)
+        signal_bus.ai_actions_changed.emit()
 
         self.ai_actions.update_action(data['name'], new_data)
         qfluentwidgets.InfoBar.success('提示', f'{new_data["name"]} 已成功保存！', parent=self)
@@ -436,6 +439,7 @@ class AIActionPage(QtWidgets.QWidget):
         if w.exec():
             self.ai_actions.remove_action(data['name'])
             self.db.delete_action(data['name'])
+            signal_bus.ai_actions_changed.emit()
             return qfluentwidgets.InfoBar.success(
                 '提示', f'{data["name"]} 删除成功！', duration=1500, parent=self)
 
@@ -448,6 +452,7 @@ class AIActionPage(QtWidgets.QWidget):
         data = apf.info
         data.update({'enabled': True})
         self.db.add_action(data)
+        signal_bus.ai_actions_changed.emit()
 
         action = self.ai_actions.add_action(data['name'], data['description'], data=data)
         action.edited.connect(self._action_edit)
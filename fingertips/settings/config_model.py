@@ -42,6 +42,35 @@ class Config(qfluentwidgets.QConfig):
       'super_sidebar', 'plugin_path', f'{CONFIG_ROOT}/plugins'.replace('\\', '/'))
     super_sidebar_node = qfluentwidgets.ConfigItem('super_sidebar', 'node', None)
 
+    enable_maintenance = qfluentwidgets.ConfigItem(
+        'maintenance', 'enable', True, qfluentwidgets.BoolValidator())
+    maintenance_interval_hours = qfluentwidgets.RangeConfigItem(
+        'maintenance', 'interval_hours', 24, qfluentwidgets.RangeValidator(1, 24 * 30))
+    clipboard_max_rows = qfluentwidgets.RangeConfigItem(
+        'maintenance', 'clipboard_max_rows', 1000, qfluentwidgets.RangeValidator(0, 100000))
+    clipboard_max_days = qfluentwidgets.RangeConfigItem(
+        'maintenance', 'clipboard_max_days', 90, qfluentwidgets.RangeValidator(0, 3650))
+    clipboard_max_mb = qfluentwidgets.RangeConfigItem(
+        'maintenance', 'clipboard_max_mb', 50, qfluentwidgets.RangeValidator(0, 1024))
+    chat_max_rows = qfluentwidgets.RangeConfigItem(
+        'maintenance', 'chat_max_rows', 0, qfluentwidgets.RangeValidator(0, 10000))
+    enable_auto_backup = qfluentwidgets.ConfigItem(
+        'backup', 'enable_auto_backup', True, qfluentwidgets.BoolValidator())
+    backup_keep_count = qfluentwidgets.RangeConfigItem(
+        'backup', 'keep_count', 5, qfluentwidgets.RangeValidator(1, 100))
+
+    enable_plugin_process = qfluentwidgets.ConfigItem(
+        'plugin', 'enable_process', True, qfluentwidgets.BoolValidator())
+    plugin_process_count = qfluentwidgets.RangeConfigItem(
+        'plugin', 'process_count', 2, qfluentwidgets.RangeValidator(1, 8))
+    plugin_latency_budget = qfluentwidgets.RangeConfigItem(
+        'plugin', 'latency_budget', 50, qfluentwidgets.RangeValidator(1, 5000))
+
+    enable_software_index = qfluentwidgets.ConfigItem(
+        'software_index', 'enable', True, qfluentwidgets.BoolValidator())
+    software_index_folders = qfluentwidgets.ConfigItem(
+        'software_index', 'folders', [], qfluentwidgets.FolderListValidator())
+
     update_on_start = qfluentwidgets.ConfigItem(
         'update', 'update_on_start', True, qfluentwidgets.BoolValidator())
 
@@ -13,6 +13,7 @@ from qfluentwidgets import FluentIcon as FIF
 from fingertips.settings.setting_page import SettingPage
 from fingertips.settings.ai_action_page import AIActionPage
 from fingertips.settings.super_sidebar_page import SuperSideBarPage
+from fingertips.settings.profiler_page import ProfilerPage
 
 
 class Widget(QFrame):
@@ -39,6 +40,7 @@ class SettingsWindow(MSFluentWindow):
         self.ai_action_page = AIActionPage(self)
         self.videoInterface = Widget('Video Interface', self)
         self.sidebar_page = SuperSideBarPage(self)
+        self.profiler_page = ProfilerPage(self)
         # self.libraryInterface = Widget('library Interface', self)
 
         self.initNavigation()
@@ -49,6 +51,7 @@ class SettingsWindow(MSFluentWindow):
         self.addSubInterface(self.ai_action_page, FIF.APPLICATION, 'AI功能')
         self.addSubInterface(self.videoInterface, FIF.DEVELOPER_TOOLS, '工具')
         self.addSubInterface(self.sidebar_page, FIF.ALIGNMENT, '超级侧栏')
+        self.addSubInterface(self.profiler_page, FIF.SPEED_HIGH, '插件性能')
         self.navigationInterface.addItem(
             routeKey='Help',
             icon=FIF.HELP,
@@ -0,0 +1,76 @@
+from PySide2 import QtWidgets
+from PySide2 import QtCore
+
+import qfluentwidgets
+from qfluentwidgets import FluentIcon
+
+from fingertips.core.profiler import profiler, BUCKETS
+
+HEADERS = ['名称', '阶段', '次数', '超预算', '最近', 'P50', 'P95', '最大', '分布']
+BARS = ' ▁▂▃▄▅▆▇█'
+
+
+def histogram_bar(counts):
+    """把各桶的次数画成一行柱状字符，从左到右依次是 <1ms … ≥1000ms"""
+    peak = max(counts) or 1
+    return ''.join(BARS[round(c / peak * (len(BARS) - 1))] for c in counts)
+
+
+class ProfilerPage(QtWidgets.QWidget):
+    """显示插件和 action 各阶段的耗时统计"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName('profiler_page')
+
+        self.refresh_button = qfluentwidgets.PushButton(FluentIcon.SYNC, '刷新', self)
+        self.refresh_button.clicked.connect(self.refresh)
+        self.clear_button = qfluentwidgets.PushButton(FluentIcon.DELETE, '清空', self)
+        self.clear_button.clicked.connect(self.clear)
+
+        header_layout = QtWidgets.QHBoxLayout()
+        header_layout.setContentsMargins(0, 0, 20, 0)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.refresh_button)
+        header_layout.addWidget(self.clear_button)
+
+        self.table = qfluentwidgets.TableWidget(self)
+        self.table.setBorderVisible(True)
+        self.table.setBorderRadius(8)
+        self.table.setWordWrap(False)
+        self.table.setColumnCount(len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeaderItem(len(HEADERS) - 1).setToolTip(
+            '耗时分布，各列上限依次为 {} ms'.format(' / '.join(map(str, BUCKETS))))
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(10, 16, 12, 16)
+        layout.addLayout(header_layout)
+        layout.addWidget(self.table)
+
+    def refresh(self):
+        rows = profiler.snapshot()
+        self.table.setRowCount(len(rows))
+        for row, (name, phase, stats) in enumerate(rows):
+            values = [
+                name, phase, str(stats['count']), str(stats['slow']),
+                '{:.1f}'.format(stats['last']), '{:.1f}'.format(stats['p50']),
+                '{:.1f}'.format(stats['p95']), '{:.1f}'.format(stats['max']),
+                histogram_bar(stats['histogram']),
+            ]
+            for column, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if column >= 2:
+                    item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+
+    def clear(self):
+        profiler.clear()
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
@@ -1,3 +1,6 @@
+import os
+from datetime import datetime, timedelta
+
 from PySide2 import QtWidgets
 from PySide2 import QtGui
 from PySide2 import QtCore
@@ -5,8 +8,20 @@ from PySide2 import QtCore
 import qfluentwidgets
 from qfluentwidgets import FluentIcon
 
+from fingertips.widget_utils import signal_bus
+from fingertips.config import BACKUP_ROOT
+from fingertips.db_backup import list_snapshots
+from fingertips.db_maintenance import get_size_history
 from fingertips.settings.config_model import config_model
-from fingertips.common_widgets import LineEditSettingCard, DoubleSpinBoxSettingCard
+from fingertips.common_widgets import LineEditSettingCard, DoubleSpinBoxSettingCard, SpinBoxSettingCard
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
 
 
 class AddModelMessageBox(qfluentwidgets.MessageBoxBase):
@@ -279,6 +294,140 @@ class SettingPage(qfluentwidgets.ScrollArea):
             parent=self.coze_group
         )
 
+        self.maintenance_group = qfluentwidgets.SettingCardGroup('数据维护', self.scroll_widget)
+        self.maintenance_enable_card = qfluentwidgets.SwitchSettingCard(
+            FluentIcon.ACCEPT,
+            '自动整理数据',
+            '在系统空闲时清理过期数据并压缩数据库',
+            config_model.enable_maintenance,
+            parent=self.maintenance_group
+        )
+        self.maintenance_interval_card = SpinBoxSettingCard(
+            FluentIcon.HISTORY,
+            '整理间隔（小时）',
+            config_model.maintenance_interval_hours,
+            content='两次自动整理之间的最短间隔',
+            parent=self.maintenance_group
+        )
+        self.clipboard_max_rows_card = SpinBoxSettingCard(
+            FluentIcon.PASTE,
+            '剪切板最多保留条数',
+            config_model.clipboard_max_rows,
+            content='超出部分从最旧的记录开始删除，0 表示不限制',
+            parent=self.maintenance_group
+        )
+        self.clipboard_max_days_card = SpinBoxSettingCard(
+            FluentIcon.DATE_TIME,
+            '剪切板保留天数',
+            config_model.clipboard_max_days,
+            content='删除早于该天数的剪切板记录，0 表示不限制',
+            parent=self.maintenance_group
+        )
+        self.clipboard_max_mb_card = SpinBoxSettingCard(
+            FluentIcon.SAVE,
+            '剪切板最大容量（MB）',
+            config_model.clipboard_max_mb,
+            content='剪切板内容总大小上限，0 表示不限制',
+            parent=self.maintenance_group
+        )
+        self.chat_max_rows_card = SpinBoxSettingCard(
+            FluentIcon.CHAT,
+            '聊天最多保留个数',
+            config_model.chat_max_rows,
+            content='超出部分从最早的聊天开始删除，0 表示不限制',
+            parent=self.maintenance_group
+        )
+        self.db_size_card = qfluentwidgets.PrimaryPushSettingCard(
+            '立即整理',
+            FluentIcon.SYNC,
+            '数据库大小',
+            '',
+            self.maintenance_group
+        )
+        self.db_size_card.clicked.connect(self.db_size_card_clicked)
+        signal_bus.db_maintenance_finished.connect(self.refresh_db_size)
+
+        self.backup_group = qfluentwidgets.SettingCardGroup('数据备份', self.scroll_widget)
+        self.auto_backup_card = qfluentwidgets.SwitchSettingCard(
+            FluentIcon.ACCEPT,
+            '自动备份',
+            '每次自动整理数据后备份一次数据库',
+            config_model.enable_auto_backup,
+            parent=self.backup_group
+        )
+        self.backup_keep_count_card = SpinBoxSettingCard(
+            FluentIcon.FOLDER,
+            '保留快照个数',
+            config_model.backup_keep_count,
+            content='超出部分从最旧的快照开始删除',
+            parent=self.backup_group
+        )
+        self.backup_card = qfluentwidgets.PrimaryPushSettingCard(
+            '立即备份',
+            FluentIcon.CLOUD,
+            '备份',
+            '',
+            self.backup_group
+        )
+        self.backup_card.clicked.connect(self.backup_card_clicked)
+        self.restore_card = qfluentwidgets.PushSettingCard(
+            '选择快照',
+            FluentIcon.HISTORY,
+            '从备份恢复',
+            '恢复前会自动备份当前数据，恢复后请重启 Fingertips',
+            self.backup_group
+        )
+        self.restore_card.clicked.connect(self.restore_card_clicked)
+        signal_bus.db_backup_progressed.connect(self.backup_progressed)
+        signal_bus.db_backup_finished.connect(self.backup_finished)
+
+        self.plugin_group = qfluentwidgets.SettingCardGroup('插件', self.scroll_widget)
+        self.plugin_process_card = qfluentwidgets.SwitchSettingCard(
+            FluentIcon.APPLICATION,
+            '在独立进程中运行插件',
+            '声明了 isolated 的插件卡住或崩溃时不影响主程序，重启 Fingertips 后生效',
+            config_model.enable_plugin_process,
+            parent=self.plugin_group
+        )
+        self.plugin_process_count_card = SpinBoxSettingCard(
+            FluentIcon.SPEED_HIGH,
+            '插件进程个数',
+            config_model.plugin_process_count,
+            content='同时执行的独立插件个数上限，重启 Fingertips 后生效',
+            parent=self.plugin_group
+        )
+        self.plugin_latency_budget_card = SpinBoxSettingCard(
+            FluentIcon.STOP_WATCH,
+            '主线程耗时预算（毫秒）',
+            config_model.plugin_latency_budget,
+            content='插件或 action 在主线程中超出预算时记录警告，详情见插件性能页面',
+            parent=self.plugin_group
+        )
+
+        self.software_index_group = qfluentwidgets.SettingCardGroup('软件索引', self.scroll_widget)
+        self.software_index_card = qfluentwidgets.SwitchSettingCard(
+            FluentIcon.SEARCH,
+            '后台索引软件',
+            '定期扫描开始菜单和下列目录中的软件，可以在主窗口中搜索',
+            config_model.enable_software_index,
+            parent=self.software_index_group
+        )
+        self.software_index_folders_card = qfluentwidgets.FolderListSettingCard(
+            config_model.software_index_folders,
+            '索引目录',
+            content='除开始菜单外额外扫描的目录',
+            parent=self.software_index_group
+        )
+        self.software_index_run_card = qfluentwidgets.PrimaryPushSettingCard(
+            '立即索引',
+            FluentIcon.SYNC,
+            '索引状态',
+            '',
+            self.software_index_group
+        )
+        self.software_index_run_card.clicked.connect(self.software_index_run_card_clicked)
+        signal_bus.software_index_finished.connect(self.software_index_finished)
+
         self.update_group = qfluentwidgets.SettingCardGroup('软件更新', self.scroll_widget)
         self.update_on_start_up_card = qfluentwidgets.SwitchSettingCard(
             FluentIcon.UPDATE,
@@ -323,6 +472,27 @@ class SettingPage(qfluentwidgets.ScrollArea):
         self.coze_group.addSettingCard(self.coze_key_card)
         self.coze_group.addSettingCard(self.coze_user_id_card)
 
+        self.maintenance_group.addSettingCard(self.maintenance_enable_card)
+        self.maintenance_group.addSettingCard(self.maintenance_interval_card)
+        self.maintenance_group.addSettingCard(self.clipboard_max_rows_card)
+        self.maintenance_group.addSettingCard(self.clipboard_max_days_card)
+        self.maintenance_group.addSettingCard(self.clipboard_max_mb_card)
+        self.maintenance_group.addSettingCard(self.chat_max_rows_card)
+        self.maintenance_group.addSettingCard(self.db_size_card)
+
+        self.backup_group.addSettingCard(self.auto_backup_card)
+        self.backup_group.addSettingCard(self.backup_keep_count_card)
+        self.backup_group.addSettingCard(self.backup_card)
+        self.backup_group.addSettingCard(self.restore_card)
+
+        self.plugin_group.addSettingCard(self.plugin_process_card)
+        self.plugin_group.addSettingCard(self.plugin_process_count_card)
+        self.plugin_group.addSettingCard(self.plugin_latency_budget_card)
+
+        self.software_index_group.addSettingCard(self.software_index_card)
+        self.software_index_group.addSettingCard(self.software_index_folders_card)
+        self.software_index_group.addSettingCard(self.software_index_run_card)
+
         self.update_group.addSettingCard(self.update_on_start_up_card)
 
         self.about_group.addSettingCard(self.help_card)
@@ -334,9 +504,109 @@ class SettingPage(qfluentwidgets.ScrollArea):
         self.expand_layout.addWidget(self.shortcut_group)
         self.expand_layout.addWidget(self.ai_group)
         self.expand_layout.addWidget(self.coze_group)
+        self.expand_layout.addWidget(self.maintenance_group)
+        self.expand_layout.addWidget(self.backup_group)
+        self.expand_layout.addWidget(self.plugin_group)
+        self.expand_layout.addWidget(self.software_index_group)
         self.expand_layout.addWidget(self.update_group)
         self.expand_layout.addWidget(self.about_group)
 
         self.setStyleSheet(
             'QScrollArea {border: none; background:transparent}'
         )
+
+        self.refresh_db_size()
+        self.refresh_backup_info()
+
+    def db_size_card_clicked(self):
+        self.db_size_card.button.setEnabled(False)
+        self.db_size_card.setContent('正在整理...')
+        signal_bus.db_maintenance_requested.emit()
+
+    def software_index_run_card_clicked(self):
+        self.software_index_run_card.button.setEnabled(False)
+        self.software_index_run_card.setContent('正在索引...')
+        signal_bus.software_index_requested.emit()
+
+    def software_index_finished(self, report):
+        self.software_index_run_card.button.setEnabled(True)
+        if report.get('error'):
+            return self.software_index_run_card.setContent(f'索引失败：{report["error"]}')
+        self.software_index_run_card.setContent(
+            f'共 {report.get("files", 0)} 个文件，本次新增 {report.get("added", 0)} 个、'
+            f'移除 {report.get("removed", 0)} 个软件')
+
+    def refresh_db_size(self, report=None):
+        self.db_size_card.button.setEnabled(True)
+        if report and report.get('error'):
+            return self.db_size_card.setContent(f'整理失败：{report["error"]}')
+
+        history = get_size_history()
+        if not history:
+            return self.db_size_card.setContent('暂无记录，整理后将显示数据库大小变化')
+
+        last_time, size = history[-1]
+        content = f'当前 {format_size(size)}'
+
+        week_ago = (datetime.fromisoformat(last_time) - timedelta(days=7)).isoformat()
+        older = [s for t, s in history if t <= week_ago]
+        baseline = older[-1] if older else history[0][1]
+        diff = size - baseline
+        content += f'，近 7 天 {"+" if diff >= 0 else "-"}{format_size(abs(diff))}'
+
+        if report:
+            deleted = sum(report.get('deleted', {}).values())
+            content += f'，本次清理 {deleted} 条记录'
+
+        self.db_size_card.setContent(content)
+
+    def refresh_backup_info(self):
+        snapshots = list_snapshots()
+        if not snapshots:
+            return self.backup_card.setContent(f'暂无快照，快照保存在 {BACKUP_ROOT}')
+
+        last_time = datetime.fromtimestamp(os.path.getmtime(snapshots[0]))
+        self.backup_card.setContent(
+            f'共 {len(snapshots)} 个快照，最近一次：{last_time:%Y-%m-%d %H:%M}')
+
+    def _set_backup_busy(self, busy):
+        self.backup_card.button.setEnabled(not busy)
+        self.restore_card.button.setEnabled(not busy)
+
+    def backup_card_clicked(self):
+        self._set_backup_busy(True)
+        self.backup_card.setContent('正在备份...')
+        signal_bus.db_backup_requested.emit()
+
+    def restore_card_clicked(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, '选择快照', BACKUP_ROOT, '数据库快照 (*.db)')
+        if not path:
+            return
+
+        w = qfluentwidgets.MessageBox(
+            '从备份恢复', f'当前数据将被 {os.path.basename(path)} 覆盖，确定要恢复吗？', self.window())
+        if not w.exec():
+            return
+
+        self._set_backup_busy(True)
+        self.backup_card.setContent('正在恢复...')
+        signal_bus.db_restore_requested.emit(path)
+
+    def backup_progressed(self, copied, total):
+        if total:
+            self.backup_card.setContent(f'正在复制数据 {copied * 100 // total}%')
+
+    def backup_finished(self, report):
+        self._set_backup_busy(False)
+        self.refresh_backup_info()
+
+        if report.get('error'):
+            return qfluentwidgets.InfoBar.error(
+                '错误', report['error'], duration=3000, parent=self)
+
+        if report.get('restore'):
+            return qfluentwidgets.InfoBar.success(
+                '提示', '数据已恢复，重启 Fingertips 后生效', duration=3000, parent=self)
+
+        qfluentwidgets.InfoBar.success('提示', '备份完成', duration=1500, parent=self)
@@ -47,10 +47,9 @@ class CountdownItemWidget(QtWidgets.QWidget):
         self.update_description_display()  # 初始化描述显示
         self.update_display()
         
-        # 设置定时器，每秒更新一次
+        # 每秒更新一次，由所在卡片在显示时启动、隐藏时停止
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_display)
-        self.timer.start(1000)  # 1秒更新一次
         
     def setup_ui(self):
         """设置UI界面"""
@@ -318,10 +317,6 @@ class CountdownItemWidget(QtWidgets.QWidget):
             self.update()
             self.repaint()
             
-            # 确保定时器正常工作
-            if not self.timer.isActive():
-                self.timer.start(1000)
-            
             # 触发重绘以更新颜色
             self.update()
             
@@ -797,14 +792,7 @@ class CountdownCard(SidebarWidget):
             # 存储数据（start_time已经在对话框中设置）
             self.countdowns[countdown_id] = data
             
-            # 创建组件
-            widget = CountdownItemWidget(countdown_id, data, self.countdown_container)
-            widget.item_deleted.connect(self.delete_countdown)
-            widget.item_edited.connect(self.edit_countdown)
-            
-            # 添加到布局
-            self.countdown_layout.insertWidget(self.countdown_layout.count() - 1, widget)
-            self.countdown_widgets[countdown_id] = widget
+            self.add_item_widget(countdown_id, data)
             
             # 隐藏空状态
             self.empty_label.hide()
@@ -812,6 +800,18 @@ class CountdownCard(SidebarWidget):
             # 保存配置
             self.save_config_signal.emit()
     
+    def add_item_widget(self, countdown_id, data):
+        """创建倒计时组件并添加到布局，卡片显示时才启动定时器"""
+        widget = CountdownItemWidget(countdown_id, data, self.countdown_container)
+        widget.item_deleted.connect(self.delete_countdown)
+        widget.item_edited.connect(self.edit_countdown)
+
+        self.countdown_layout.insertWidget(self.countdown_layout.count() - 1, widget)
+        self.countdown_widgets[countdown_id] = widget
+        if self.is_shown:
+            widget.timer.start(1000)
+        return widget
+
     def delete_countdown(self, countdown_id):
         """删除倒计时"""
         if countdown_id in self.countdown_widgets:
@@ -835,6 +835,15 @@ class CountdownCard(SidebarWidget):
             self.countdowns[countdown_id] = data
             self.save_config_signal.emit()
     
+    def on_shown(self):
+        for widget in self.countdown_widgets.values():
+            widget.update_display()
+            widget.timer.start(1000)
+
+    def on_hidden(self):
+        for widget in self.countdown_widgets.values():
+            widget.timer.stop()
+
     def get_config(self):
         """获取配置"""
         # 将datetime对象转换为ISO字符串进行序列化
@@ -879,14 +888,7 @@ class CountdownCard(SidebarWidget):
             
             self.countdowns[countdown_id] = data
             
-            # 创建组件
-            widget = CountdownItemWidget(countdown_id, data, self.countdown_container)
-            widget.item_deleted.connect(self.delete_countdown)
-            widget.item_edited.connect(self.edit_countdown)
-            
-            # 添加到布局
-            self.countdown_layout.insertWidget(self.countdown_layout.count() - 1, widget)
-            self.countdown_widgets[countdown_id] = widget
+            self.add_item_widget(countdown_id, data)
         
         # 更新空状态显示
         if self.countdowns:
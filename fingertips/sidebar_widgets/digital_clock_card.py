@@ -1,4 +1,5 @@
 import sys
+import time
 import hashlib
 import requests
 from datetime import datetime
@@ -97,6 +98,8 @@ class DigitalClockCard(SidebarWidget):
     name = '时钟'
     category = '生活'
 
+    WEATHER_INTERVAL = 30 * 60 * 1000  # 30分钟
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         # 设置最小尺寸，允许组件自适应调整
@@ -113,6 +116,7 @@ class DigitalClockCard(SidebarWidget):
         # 初始化配置
         self.token = ''
         self.secret_key = ''
+        self.weather_updated_at = None
 
         # 初始化天气数据
         self.weather_data = {
@@ -136,7 +140,7 @@ class DigitalClockCard(SidebarWidget):
         # 创建天气更新定时器，每30分钟更新一次天气
         self.weather_timer = QTimer()
         self.weather_timer.timeout.connect(self.update_weather)
-        self.weather_timer.start(30 * 60 * 1000)  # 30分钟
+        self.weather_timer.start(self.WEATHER_INTERVAL)
         
         # 初始化时间显示
         self.update_time()
@@ -151,6 +155,20 @@ class DigitalClockCard(SidebarWidget):
         self.opacity_animation.setEndValue(1.0)
         self.opacity_animation.setEasingCurve(QEasingCurve.OutCubic)
 
+    def on_shown(self):
+        self.update_time()
+        self.timer.start()
+
+        # 隐藏期间错过的天气更新在显示时补上
+        if (self.weather_updated_at is not None and
+                (time.monotonic() - self.weather_updated_at) * 1000 >= self.WEATHER_INTERVAL):
+            self.update_weather()
+        self.weather_timer.start()
+
+    def on_hidden(self):
+        self.timer.stop()
+        self.weather_timer.stop()
+
     def get_config(self):
         return {
             'token': self.token,
@@ -525,6 +543,7 @@ class DigitalClockCard(SidebarWidget):
         if not self.token or not self.secret_key:
             return
 
+        self.weather_updated_at = time.monotonic()
         self.weather_thread = WeatherThread(self.token, self.secret_key)
         self.weather_thread.weather_updated.connect(self.on_weather_updated)
         self.weather_thread.start()
@@ -440,8 +440,8 @@ class HistoricalCuttingBoardCard(SidebarWidget):
                     
             except Exception as simple_e:
                 print(f"创建最简单表结构也失败: {simple_e}")
-                # 最后的备用方案：让dataset自动创建
-                print("使用dataset自动创建作为最后的备用方案...")
+                # 最后的备用方案：插入数据时自动建表
+                print("使用插入时自动建表作为最后的备用方案...")
     
     def on_clipboard_changed(self):
         """处理剪切板内容变化"""
@@ -875,13 +875,13 @@ class HistoricalCuttingBoardCard(SidebarWidget):
         """清空数据库"""
         try:
             if hasattr(self, 'context') and self.context.db_config:
-                # 方法1：使用dataset的delete方法
+                # 方法1：使用Table的delete方法
                 try:
                     self.context.db_config.table.delete()
-                    print("✅ 使用dataset.delete()清空数据库成功")
+                    print("✅ 使用table.delete()清空数据库成功")
                     return
                 except Exception as delete_e:
-                    print(f"dataset.delete()失败: {delete_e}")
+                    print(f"table.delete()失败: {delete_e}")
                 
                 # 方法2：使用SQL DELETE语句
                 try:
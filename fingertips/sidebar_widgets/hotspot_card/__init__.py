@@ -4,6 +4,7 @@
 """
 
 import sys
+import time
 import webbrowser
 from typing import Dict, List
 from PySide2.QtWidgets import (
@@ -443,6 +444,8 @@ class HotspotCard(SidebarWidget):
     name = '热搜榜'
     category = '资讯'
     description = '实时获取知乎、抖音、Bilibili、今日头条、微博热搜榜单'
+
+    REFRESH_INTERVAL = 5 * 60 * 1000  # 5分钟
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -462,6 +465,7 @@ class HotspotCard(SidebarWidget):
         
         # 数据获取线程
         self.data_threads = {}
+        self.refreshed_at = None
         
         # 初始化UI
         self.setup_ui()
@@ -469,7 +473,7 @@ class HotspotCard(SidebarWidget):
         # 设置定时器，每5分钟自动刷新
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh_all_data)
-        self.refresh_timer.start(5 * 60 * 1000)  # 5分钟
+        self.refresh_timer.start(self.REFRESH_INTERVAL)
         
         # 初始加载数据
         self.refresh_all_data()
@@ -537,8 +541,19 @@ class HotspotCard(SidebarWidget):
         self.data_threads[platform_name] = thread
         thread.start()
         
+    def on_shown(self):
+        # 隐藏期间错过的刷新在显示时补上
+        if (self.refreshed_at is None or
+                (time.monotonic() - self.refreshed_at) * 1000 >= self.REFRESH_INTERVAL):
+            self.refresh_all_data()
+        self.refresh_timer.start()
+
+    def on_hidden(self):
+        self.refresh_timer.stop()
+
     def refresh_all_data(self):
         """刷新所有平台数据"""
+        self.refreshed_at = time.monotonic()
         for platform_name in self.apis.keys():
             self.fetch_platform_data(platform_name)
             
@@ -1,4 +1,5 @@
 import math
+import time
 from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
 from PySide2.QtGui import QPainter, QFont, QColor, QPen, QBrush, QLinearGradient
@@ -102,10 +103,18 @@ class PomodoroCard(SidebarWidget):
         self.is_work_mode = True
         self.remaining_time = self.work_duration
         self.completed_cycles = 0
+        # 运行时当前阶段结束的时间，剩余时间由它计算，隐藏期间不需要每秒计时
+        self.deadline = None
         
-        # 定时器
+        # 定时器，显示时每秒刷新
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_timer)
+
+        # 隐藏时只在当前阶段结束时触发一次
+        self.phase_timer = QTimer()
+        self.phase_timer.setSingleShot(True)
+        self.phase_timer.setTimerType(Qt.PreciseTimer)
+        self.phase_timer.timeout.connect(self.update_timer)
         
         self.setup_ui()
         self.update_display()
@@ -331,8 +340,9 @@ class PomodoroCard(SidebarWidget):
     def toggle_timer(self):
         """切换定时器状态"""
         if self.is_running:
-            self.timer.stop()
+            self.update_remaining_time()
             self.is_running = False
+            self.schedule_timer()
             
             # 显示暂停通知
             mode_text = "工作" if self.is_work_mode else "休息"
@@ -343,8 +353,9 @@ class PomodoroCard(SidebarWidget):
                 auto_close_time=3000  # 3秒后自动关闭
             )
         else:
-            self.timer.start(1000)  # 每秒更新一次
             self.is_running = True
+            self.deadline = time.monotonic() + self.remaining_time
+            self.schedule_timer()
             
             # 显示开始通知
             mode_text = "工作" if self.is_work_mode else "休息"
@@ -361,8 +372,8 @@ class PomodoroCard(SidebarWidget):
     
     def reset_timer(self):
         """重置定时器"""
-        self.timer.stop()
         self.is_running = False
+        self.schedule_timer()
         self.is_work_mode = True
         self.remaining_time = self.work_duration
         
@@ -377,11 +388,41 @@ class PomodoroCard(SidebarWidget):
         self.update_display()
         self.save_config_signal.emit()
     
+    def update_remaining_time(self):
+        if self.is_running and self.deadline is not None:
+            self.remaining_time = max(0, math.ceil(self.deadline - time.monotonic()))
+
+    def schedule_timer(self):
+        """显示时每秒刷新，隐藏时只在当前阶段结束时触发"""
+        self.timer.stop()
+        self.phase_timer.stop()
+        if not self.is_running:
+            return
+
+        if self.is_shown is False:
+            self.phase_timer.start(max(0, int((self.deadline - time.monotonic()) * 1000)))
+        else:
+            self.timer.start(1000)  # 每秒更新一次
+
+    def on_shown(self):
+        self.update_timer()
+        self.schedule_timer()
+
+    def on_hidden(self):
+        self.schedule_timer()
+
     def update_timer(self):
         """更新定时器"""
+        if not self.is_running:
+            self.update_display()
+            return
+
+        self.update_remaining_time()
         if self.remaining_time > 0:
-            self.remaining_time -= 1
             self.update_display()
+            if self.is_shown is False:
+                # 定时器提前触发时重新安排
+                self.schedule_timer()
         else:
             # 时间到了，切换模式
             self.switch_mode()
@@ -413,12 +454,17 @@ class PomodoroCard(SidebarWidget):
                 icon_name="fa5s.play-circle",
                 auto_close_time=8000  # 8秒后自动关闭
             )
+
+        if self.is_running:
+            self.deadline = time.monotonic() + self.remaining_time
+            self.schedule_timer()
         
         self.update_display()
         self.save_config_signal.emit()
     
     def get_config(self):
         """获取配置"""
+        self.update_remaining_time()
         return {
             'work_duration': self.work_duration,
             'break_duration': self.break_duration,
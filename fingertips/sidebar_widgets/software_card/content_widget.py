@@ -1,149 +1,28 @@
-from urllib.parse import urljoin, urlparse
 import os
 
 from PySide2 import QtWidgets, QtCore, QtGui
-import requests
 import qtawesome
-from bs4 import BeautifulSoup
 
 from fingertips.utils import get_exe_path
+from fingertips.icon_cache import IconCache
+from fingertips.delegates import SoftwareTileDelegate
 from fingertips.sidebar_widgets.software_card.widgets import ConfirmDialog, SoftwareEditDialog
-
-request_headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-}
-
-
-class SoftwareItemWidget(QtWidgets.QWidget):
-    """自定义软件项小部件"""
-    item_renamed = QtCore.Signal()
-    item_edit_requested = QtCore.Signal(object)  # 新增信号，传递widget对象
-
-    def __init__(self, icon, name, parent=None):
-        super().__init__(parent)
-        self._original_name = name
-        self._edit_mode = False
-        self._init_ui(icon, name)
-
-    def _init_ui(self, icon, name):
-        self.setMaximumSize(80, 80)
-        
-        # 禁用默认右键菜单
-        self.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-
-        self.name_label = QtWidgets.QLabel(name)
-        self.name_label.setFixedHeight(28)
-        self.name_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.name_label.setWordWrap(True)
-        self.name_label.setStyleSheet('margin: 0 2px;')
-        # 禁用标签的右键菜单
-        self.name_label.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-
-        # 创建编辑器（初始时隐藏）
-        self.name_editor = QtWidgets.QLineEdit(name)
-        self.name_editor.setFixedHeight(28)
-        self.name_editor.setAlignment(QtCore.Qt.AlignCenter)
-        self.name_editor.setStyleSheet('margin: 0 2px; border: 1px solid #007ACC; border-radius: 2px;')
-        self.name_editor.hide()
-        # 禁用编辑器的默认右键菜单
-        self.name_editor.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        
-        # 连接编辑器事件
-        self.name_editor.returnPressed.connect(self._finish_edit)
-        self.name_editor.editingFinished.connect(self._on_editing_finished)
-        
-        # 重写编辑器的鼠标右键事件，防止默认菜单
-        def editor_mouse_press(event):
-            if event.button() == QtCore.Qt.RightButton:
-                event.accept()
-                return
-            QtWidgets.QLineEdit.mousePressEvent(self.name_editor, event)
-        self.name_editor.mousePressEvent = editor_mouse_press
-
-        self.icon_label = QtWidgets.QLabel()
-        self.icon_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.icon_label.setFixedSize(40, 40)
-        # 禁用图标的右键菜单
-        self.icon_label.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        pixmap = icon.pixmap(40, 40).scaled(
-            40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-        self.icon_label.setPixmap(pixmap)
-
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(QtCore.Qt.AlignCenter)
-        layout.setSpacing(2)
-        layout.addWidget(self.icon_label, alignment=QtCore.Qt.AlignCenter)
-        layout.addWidget(self.name_label, alignment=QtCore.Qt.AlignCenter)
-        layout.addWidget(self.name_editor, alignment=QtCore.Qt.AlignCenter)
-
-    def mousePressEvent(self, event):
-        """处理鼠标点击事件"""
-        if event.button() == QtCore.Qt.RightButton:
-            # 发出编辑请求信号，让父组件处理
-            self.item_edit_requested.emit(self)
-            event.accept()  # 接受事件，阻止进一步传播
-            return
-        elif event.button() == QtCore.Qt.LeftButton and event.modifiers() == QtCore.Qt.NoModifier:
-            # 左键双击或者特殊组合键可以进入快速编辑模式（仅编辑名称）
-            # 这里先正常处理左键点击
-            pass
-        # 对于其他鼠标按钮，正常处理
-        super().mousePressEvent(event)
-
-    def mouseDoubleClickEvent(self, event):
-        super().mouseDoubleClickEvent(event)
-
-    def _start_edit(self):
-        """开始编辑模式"""
-        if self._edit_mode:
-            return
-            
-        self._edit_mode = True
-        self.name_label.hide()
-        self.name_editor.setText(self.name_label.text())
-        self.name_editor.show()
-        self.name_editor.setFocus()
-        self.name_editor.selectAll()
-
-    def _finish_edit(self):
-        """完成编辑"""
-        if not self._edit_mode:
-            return
-            
-        new_name = self.name_editor.text().strip()
-        if new_name:
-            self.name_label.setText(new_name)
-        
-        self._edit_mode = False
-        self.name_editor.hide()
-        self.name_label.show()
-        if new_name != self._original_name:
-            self.item_renamed.emit()
-
-    def _on_editing_finished(self):
-        """编辑完成时调用（失去焦点时）"""
-        # 使用 QTimer 延迟执行，避免与其他事件冲突
-        QtCore.QTimer.singleShot(50, self._finish_edit)
-
-    def get_display_name(self):
-        """获取当前显示的名称"""
-        return self.name_label.text()
-
-    def set_display_name(self, name):
-        """设置显示名称"""
-        self.name_label.setText(name)
-        if not self._edit_mode:
-            self.name_editor.setText(name)
+from fingertips.sidebar_widgets.software_card.website import WebsiteFetcher, website_host
 
 
 class SoftwareListWidget(QtWidgets.QListWidget):
-    """自定义软件列表小部件"""
+    """自定义软件列表小部件，由 SoftwareTileDelegate 绘制，按 F2 重命名"""
     item_added = QtCore.Signal()
     item_removed = QtCore.Signal()
     item_renamed = QtCore.Signal()
     item_updated = QtCore.Signal()  # 新增信号，当项目信息更新时发出
 
+    ICON_SIZE = 40
+    PATH_ROLE = QtCore.Qt.UserRole
+    TYPE_ROLE = QtCore.Qt.UserRole + 1
+    ICON_ROLE = QtCore.Qt.UserRole + 2
+    FETCHING_ROLE = QtCore.Qt.UserRole + 3  # 网站信息正在后台获取
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -155,6 +34,9 @@ class SoftwareListWidget(QtWidgets.QListWidget):
         self.setResizeMode(QtWidgets.QListView.Adjust)
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.setSpacing(2)
+        self.setUniformItemSizes(True)
+        self.setItemDelegate(SoftwareTileDelegate(QtCore.QSize(80, 80), self.ICON_SIZE, 4, self))
+        self.setEditTriggers(QtWidgets.QAbstractItemView.EditKeyPressed)
         self.setStyleSheet('''
             QListWidget {
                 border: none;
@@ -205,50 +87,79 @@ class SoftwareListWidget(QtWidgets.QListWidget):
         ''')
 
         self.setAcceptDrops(True)
+        IconCache.instance().icon_ready.connect(self._icon_ready)
+        WebsiteFetcher.instance().info_ready.connect(self._website_info_ready)
+        WebsiteFetcher.instance().icon_ready.connect(self._website_icon_ready)
+
+    def _set_pixmap(self, item, pixmap):
+        item.setData(QtCore.Qt.DecorationRole, pixmap)
+
+    def _icon_ready(self, path, size, pixmap):
+        """后台提取的文件图标就绪"""
+        if size != self.ICON_SIZE:
+            return
+        for i in range(self.count()):
+            item = self.item(i)
+            if (item.data(self.TYPE_ROLE) == 'file' and
+                    (item.data(self.ICON_ROLE) or item.data(self.PATH_ROLE)) == path):
+                self._set_pixmap(item, pixmap)
+
+    def _website_info_ready(self, url, info):
+        """拖入的网站信息获取完成，用户还没改过名称时使用网站标题"""
+        updated = False
+        for i in range(self.count()):
+            item = self.item(i)
+            if (item.data(self.TYPE_ROLE) != 'website' or item.data(self.PATH_ROLE) != url or
+                    not item.data(self.FETCHING_ROLE)):
+                continue
+
+            item.setData(self.FETCHING_ROLE, False)
+            if item.text() == website_host(url):
+                item.setText(info['name'])
+            if not item.data(self.ICON_ROLE):
+                item.setData(self.ICON_ROLE, info['favicon_url'])
+                self._set_pixmap(item, WebsiteFetcher.instance().pixmap(
+                    info['favicon_url'], self.ICON_SIZE))
+            updated = True
+
+        if updated:
+            self.item_updated.emit()
+
+    def _website_icon_ready(self, url, pixmap):
+        """网站图标下载完成"""
+        for i in range(self.count()):
+            item = self.item(i)
+            if item.data(self.TYPE_ROLE) == 'website' and item.data(self.ICON_ROLE) == url:
+                self._set_pixmap(item, pixmap)
+
+    def commitData(self, editor):
+        """重命名完成"""
+        item = self.currentItem()
+        old_name = item.text() if item else None
+        super().commitData(editor)
+        if item and item.text() != old_name:
+            self.item_renamed.emit()
 
     def mousePressEvent(self, event):
         """处理鼠标点击事件"""
         if event.button() == QtCore.Qt.RightButton:
-            # 检查是否点击在项目上
+            # 右键点击项目时打开编辑对话框
             item = self.itemAt(event.pos())
             if item:
-                # 获取项目的widget并触发其右键处理
-                item_widget = self.itemWidget(item)
-                if item_widget:
-                    # 创建一个相对于item_widget的事件
-                    widget_pos = item_widget.mapFromGlobal(event.globalPos())
-                    widget_event = QtGui.QMouseEvent(
-                        event.type(), 
-                        widget_pos, 
-                        event.globalPos(), 
-                        event.button(), 
-                        event.buttons(), 
-                        event.modifiers()
-                    )
-                    item_widget.mousePressEvent(widget_event)
+                self.handle_edit_request(item)
             event.accept()  # 无论如何都要接受事件，防止默认菜单
             return
         # 对于其他鼠标按钮，正常处理
         super().mousePressEvent(event)
 
-    def handle_edit_request(self, item_widget):
+    def handle_edit_request(self, item):
         """处理编辑请求"""
-        # 找到对应的 QListWidgetItem
-        item = None
-        for i in range(self.count()):
-            if self.itemWidget(self.item(i)) == item_widget:
-                item = self.item(i)
-                break
-                
-        if not item:
-            return
-            
         # 获取当前项目信息
-        current_name = item_widget.get_display_name()
-        current_path = getattr(item, 'path', '')
-        current_icon = getattr(item, 'icon', '')
-        current_type = getattr(item, 'type', 'file')
-        
+        current_name = item.text()
+        current_path = item.data(self.PATH_ROLE) or ''
+        current_icon = item.data(self.ICON_ROLE) or ''
+        current_type = item.data(self.TYPE_ROLE) or 'file'
+
         # 创建并显示编辑对话框
         dialog = SoftwareEditDialog(
             name=current_name,
@@ -257,111 +168,60 @@ class SoftwareListWidget(QtWidgets.QListWidget):
             item_type=current_type,
             parent=None
         )
-        print(dialog)
-        
+
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             # 获取编辑后的数据
             data = dialog.get_data()
-            
+
             # 验证数据
             if not data['name'].strip():
                 QtWidgets.QMessageBox.warning(self, "错误", "名称不能为空")
                 return
-                
+
             if not data['path'].strip():
                 QtWidgets.QMessageBox.warning(self, "错误", "路径不能为空")
                 return
-            
+
             # 更新项目信息
-            self.update_item(item, item_widget, data)
-            
-    def update_item(self, item, item_widget, data):
+            self.update_item(item, data)
+
+    def update_item(self, item, data):
         """更新项目信息"""
         try:
             # 更新显示名称
-            item_widget.set_display_name(data['name'])
-            
+            item.setText(data['name'])
+
             # 更新路径和类型
-            item.path = data['path']
-            item.type = data['type']
-            item.icon = data['icon']
-            
+            item.setData(self.PATH_ROLE, data['path'])
+            item.setData(self.TYPE_ROLE, data['type'])
+            item.setData(self.ICON_ROLE, data['icon'])
+
             # 更新图标
             if data['type'] == 'website':
-                if data['icon']:
-                    icon = self._load_icon_from_http(data['icon'])
-                else:
-                    icon = qtawesome.icon('fa5s.browser')
+                icon = WebsiteFetcher.instance().pixmap(data['icon'], self.ICON_SIZE)
             else:
                 if data['icon'] and os.path.exists(data['icon']):
                     if data['icon'].lower().endswith(('.ico', '.png', '.jpg', '.jpeg', '.bmp', '.gif')):
                         # 自定义图标文件
-                        pixmap = QtGui.QPixmap(data['icon']).scaled(40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                        icon = QtGui.QIcon(pixmap)
+                        icon = QtGui.QPixmap(data['icon']).scaled(
+                            self.ICON_SIZE, self.ICON_SIZE, QtCore.Qt.KeepAspectRatio,
+                            QtCore.Qt.SmoothTransformation)
                     else:
                         # 程序文件，使用系统图标
-                        icon = QtWidgets.QFileIconProvider().icon(QtCore.QFileInfo(data['icon']))
+                        icon = IconCache.instance().pixmap(data['icon'], self.ICON_SIZE)
                 else:
                     # 使用路径获取图标
                     if os.path.exists(data['path']):
-                        icon = QtWidgets.QFileIconProvider().icon(QtCore.QFileInfo(data['path']))
+                        icon = IconCache.instance().pixmap(data['path'], self.ICON_SIZE)
                     else:
-                        icon = qtawesome.icon('fa5s.question')
-            
-            # 更新item_widget的图标
-            pixmap = icon.pixmap(40, 40).scaled(40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            item_widget.icon_label.setPixmap(pixmap)
-            
+                        icon = qtawesome.icon('fa5s.question').pixmap(self.ICON_SIZE, self.ICON_SIZE)
+            self._set_pixmap(item, icon)
+
             # 发出更新信号
             self.item_updated.emit()
-            
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(self, "错误", f"更新项目时发生错误: {str(e)}")
-
-    @staticmethod
-    def _get_website_info(url):
-        try:
-            response = requests.get(url, headers=request_headers, timeout=3)
-            response.raise_for_status()
-
-            # 解析HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # 获取网站标题
-            title = soup.find('title')
-            website_name = title.get_text().strip() if title else "未找到标题"
-
-            # 查找favicon
-            favicon_url = ''
-
-            # 方法1: 查找link标签中的icon
-            icon_links = soup.find_all('link', rel=lambda x: x and (
-                        'icon' in x.lower() or 'shortcut' in x.lower()))
-            if icon_links:
-                favicon_url = urljoin(url, icon_links[0].get('href'))
-            else:
-                # 方法2: 尝试默认的favicon.ico路径
-                parsed_url = urlparse(url)
-                default_favicon = f"{parsed_url.scheme}://{parsed_url.netloc}/favicon.ico"
-                try:
-                    favicon_response = requests.head(default_favicon, timeout=3)
-                    if favicon_response.status_code == 200:
-                        favicon_url = default_favicon
-                except:
-                    pass
-
-            return {
-                'name': website_name,
-                'favicon_url': favicon_url,
-                'url': url
-            }
 
         except Exception as e:
-            return {
-                'name': '未知网站',
-                'favicon_url': '',
-                'url': url
-            }
+            QtWidgets.QMessageBox.warning(self, "错误", f"更新项目时发生错误: {str(e)}")
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
@@ -372,14 +232,11 @@ class SoftwareListWidget(QtWidgets.QListWidget):
             for url in event.mimeData().urls():
                 source_file = url.toLocalFile()
                 if not source_file:
+                    # 先用域名和占位图标添加，网站信息在后台获取后再更新
                     http_url = url.toString()
-                    web_info = self._get_website_info(http_url)
-                    self.add_item(
-                        web_info['name'],
-                        web_info['favicon_url'],
-                        web_info['url'],
-                        _type='website'
-                    )
+                    item = self.add_item(website_host(http_url), '', http_url, _type='website')
+                    item.setData(self.FETCHING_ROLE, True)
+                    WebsiteFetcher.instance().fetch_info(http_url)
                     items_added = True
                 else:
                     file_path = get_exe_path(source_file)
@@ -398,48 +255,18 @@ class SoftwareListWidget(QtWidgets.QListWidget):
             event.setDropAction(QtCore.Qt.MoveAction)
             super().dropEvent(event)
 
-    @staticmethod
-    def _load_icon_from_http(url):
-        if not url:
-            return qtawesome.icon('msc.browser')
-
-        try:
-            response = requests.get(url, headers=request_headers, timeout=3)
-            response.raise_for_status()
-
-            # 将下载的数据转换为QByteArray
-            data = QtCore.QByteArray(response.content)
-
-            # 从数据创建QPixmap
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(data)
-
-            # 创建QIcon
-            return QtGui.QIcon(pixmap)
-
-        except requests.RequestException as e:
-            print(f"下载图标失败: {e}")
-            return qtawesome.icon('fa5s.browser')
-
     def add_item(self, name, file_path, link_path=None, _type='file'):
         if _type == 'website':
-            icon = self._load_icon_from_http(file_path)
+            pixmap = WebsiteFetcher.instance().pixmap(file_path, self.ICON_SIZE)
         else:
-            icon = QtWidgets.QFileIconProvider().icon(
-                QtCore.QFileInfo(file_path))
-        item_widget = SoftwareItemWidget(icon, name)
-
-        item = QtWidgets.QListWidgetItem(self)
-        item.setSizeHint(QtCore.QSize(80, 80))
-        item.path = link_path or file_path
-        item.type = _type
-        item.icon = file_path
-        # 连接信号
-        item_widget.item_renamed.connect(self.item_renamed.emit)
-        item_widget.item_edit_requested.connect(self.handle_edit_request)
-
-        self.setItemWidget(item, item_widget)
-        self.addItem(item)
+            pixmap = IconCache.instance().pixmap(file_path, self.ICON_SIZE)
+
+        item = QtWidgets.QListWidgetItem(name, self)
+        item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
+        item.setData(self.PATH_ROLE, link_path or file_path)
+        item.setData(self.TYPE_ROLE, _type)
+        item.setData(self.ICON_ROLE, file_path)
+        self._set_pixmap(item, pixmap)
         return item
 
     def dragEnterEvent(self, event):
@@ -474,12 +301,11 @@ class SoftwareListWidget(QtWidgets.QListWidget):
     def mouseDoubleClickEvent(self, event):
         item = self.itemAt(event.pos())
         if item:
-            if item.type == 'website':
+            if item.data(self.TYPE_ROLE) == 'website':
                 import webbrowser
-                webbrowser.open(item.path)
+                webbrowser.open(item.data(self.PATH_ROLE))
             else:
-                import os
-                os.startfile(item.path)
+                os.startfile(item.data(self.PATH_ROLE))
 
     def get_all_items_info(self):
         """获取所有项目的信息，返回便于序列化的数据结构
@@ -495,18 +321,14 @@ class SoftwareListWidget(QtWidgets.QListWidget):
         
         for i in range(self.count()):
             item = self.item(i)
-            item_widget = self.itemWidget(item)
-            
-            if item and item_widget:
-                # 获取显示名称
-                display_name = item_widget.get_display_name()
-                
+
+            if item:
                 # 构建项目信息字典
                 item_info = {
-                    'name': display_name,
-                    'path': getattr(item, 'path', ''),
-                    'type': getattr(item, 'type', 'file'),
-                    'icon': getattr(item, 'icon', ''),
+                    'name': item.text(),
+                    'path': item.data(self.PATH_ROLE) or '',
+                    'type': item.data(self.TYPE_ROLE) or 'file',
+                    'icon': item.data(self.ICON_ROLE) or '',
                 }
 
                 items_info.append(item_info)
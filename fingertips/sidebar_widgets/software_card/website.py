@@ -0,0 +1,241 @@
+import os
+import json
+import hashlib
+import contextlib
+from urllib.parse import urljoin, urlparse
+
+from PySide2 import QtCore, QtGui
+import requests
+import qtawesome
+from bs4 import BeautifulSoup
+
+from fingertips.config import CONFIG_ROOT
+from fingertips.utils import get_logger
+
+log = get_logger('网站图标')
+
+request_headers = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+FAVICON_ROOT = os.path.join(CONFIG_ROOT, 'cache', 'favicons')
+INDEX_PATH = os.path.join(FAVICON_ROOT, 'index.json')
+
+INFO = 'info'
+ICON = 'icon'
+TIMEOUT = 5
+
+
+def website_host(url):
+    """网站信息获取前用域名作为名称"""
+    return urlparse(url).netloc or url
+
+
+def favicon_path(url):
+    return os.path.join(FAVICON_ROOT, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+
+class FetchTask(QtCore.QRunnable):
+    def __init__(self, fetcher, kind, url, validators=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fetcher = fetcher
+        self.kind = kind
+        self.url = url
+        self.validators = validators or {}
+
+    def run(self):
+        try:
+            if self.kind == INFO:
+                result = self.fetcher.get_info(self.url)
+            else:
+                result = self.fetcher.get_icon(self.url, self.validators)
+        except Exception as e:
+            log.warning(u'获取 {} 失败: {}'.format(self.url, e))
+            result = None
+        self.fetcher.task_done.emit(self, result)
+
+
+class WebsiteFetcher(QtCore.QObject):
+    """
+    在后台获取网站标题和图标，同一地址同时只请求一次。
+
+    requests.Session 不是线程安全的，每个任务独占一个空闲会话，用完放回以复用连接。
+
+    图标保存在磁盘上，启动时直接使用；每次运行按 ETag/Last-Modified 校验一次，
+    服务器返回 304 时不再下载，图标有变化时发出 icon_ready。
+    """
+    info_ready = QtCore.Signal(str, object)
+    icon_ready = QtCore.Signal(str, object)
+    task_done = QtCore.Signal(object, object)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """全局共用，在 QApplication 创建后第一次使用时才创建"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sessions = []
+
+        self._pixmaps = {}
+        self._placeholders = {}
+        self._index = None
+        self._pending = {}
+        self._checked = set()
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(4)
+        self.task_done.connect(self._task_done)
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(INDEX_PATH):
+                try:
+                    with open(INDEX_PATH, encoding='utf-8') as f:
+                        self._index = json.load(f)
+                except (OSError, ValueError) as e:
+                    log.warning(u'读取网站图标索引失败: {}'.format(e))
+        return self._index
+
+    def _save_index(self):
+        try:
+            os.makedirs(FAVICON_ROOT, exist_ok=True)
+            with open(INDEX_PATH, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False)
+        except OSError as e:
+            log.warning(u'写入网站图标索引失败: {}'.format(e))
+
+    @contextlib.contextmanager
+    def _session(self):
+        # list 的 append 和 pop 是原子操作，会话数不会超过线程池的线程数
+        try:
+            session = self._sessions.pop()
+        except IndexError:
+            session = requests.Session()
+            session.headers.update(request_headers)
+        try:
+            yield session
+        finally:
+            self._sessions.append(session)
+
+    def _start(self, kind, url, validators=None):
+        if (kind, url) in self._pending:
+            return
+        task = self._pending[(kind, url)] = FetchTask(self, kind, url, validators)
+        self._pool.start(task)
+
+    def placeholder(self, size):
+        pixmap = self._placeholders.get(size)
+        if pixmap is None:
+            pixmap = self._placeholders[size] = qtawesome.icon('msc.browser').pixmap(size, size)
+        return pixmap
+
+    def fetch_info(self, url):
+        """获取网站标题和图标地址，完成后发出 info_ready"""
+        self._start(INFO, url)
+
+    def pixmap(self, url, size):
+        """返回已保存的图标，没有时返回占位图标，下载完成后发出 icon_ready"""
+        if not url:
+            return self.placeholder(size)
+
+        pixmap = self._pixmaps.get(url)
+        validators = self._load_index().get(url)
+        if pixmap is None and validators is not None:
+            pixmap = QtGui.QPixmap(favicon_path(url))
+            if pixmap.isNull():
+                pixmap, validators = None, None
+            else:
+                self._pixmaps[url] = pixmap
+
+        if url not in self._checked:
+            self._start(ICON, url, validators)
+        if pixmap is None:
+            return self.placeholder(size)
+        return pixmap.scaled(size, size, QtCore.Qt.KeepAspectRatio,
+                             QtCore.Qt.SmoothTransformation)
+
+    def get_info(self, url):
+        """在后台线程中执行"""
+        with self._session() as session:
+            return self._get_info(session, url)
+
+    def _get_info(self, session, url):
+        response = session.get(url, timeout=TIMEOUT)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.content, 'html.parser')
+
+        title = soup.find('title')
+        website_name = title.get_text().strip() if title else ''
+
+        favicon_url = ''
+        icon_links = soup.find_all('link', rel=lambda x: x and (
+                'icon' in x.lower() or 'shortcut' in x.lower()))
+        if icon_links:
+            favicon_url = urljoin(response.url, icon_links[0].get('href'))
+        else:
+            parsed_url = urlparse(response.url)
+            default_favicon = f"{parsed_url.scheme}://{parsed_url.netloc}/favicon.ico"
+            try:
+                if session.head(default_favicon, timeout=TIMEOUT).status_code == 200:
+                    favicon_url = default_favicon
+            except requests.RequestException:
+                pass
+
+        return {
+            'name': website_name or website_host(url),
+            'favicon_url': favicon_url,
+            'url': url
+        }
+
+    def get_icon(self, url, validators):
+        """在后台线程中执行，未修改时返回 {}"""
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        with self._session() as session:
+            response = session.get(url, headers=headers, timeout=TIMEOUT)
+        if response.status_code == 304:
+            return {}
+        response.raise_for_status()
+
+        image = QtGui.QImage.fromData(response.content)
+        if image.isNull():
+            return None
+
+        os.makedirs(FAVICON_ROOT, exist_ok=True)
+        with open(favicon_path(url), 'wb') as f:
+            f.write(response.content)
+        return {
+            'image': image,
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+        }
+
+    def _task_done(self, task, result):
+        self._pending.pop((task.kind, task.url), None)
+        if task.kind == INFO:
+            self.info_ready.emit(task.url, result or {
+                'name': website_host(task.url), 'favicon_url': '', 'url': task.url})
+            return
+
+        self._checked.add(task.url)
+        if not result:
+            return
+
+        image = result.pop('image')
+        self._index[task.url] = result
+        self._save_index()
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._pixmaps[task.url] = pixmap
+        self.icon_ready.emit(task.url, pixmap)
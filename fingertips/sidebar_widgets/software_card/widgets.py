@@ -1,10 +1,7 @@
 from PySide2 import QtWidgets, QtCore, QtGui
-import requests
 import qtawesome
 
-request_headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-}
+from fingertips.sidebar_widgets.software_card.website import WebsiteFetcher
 
 
 class RenameDialog(QtWidgets.QDialog):
@@ -248,6 +245,7 @@ class SoftwareEditDialog(QtWidgets.QDialog):
         self.item_type = item_type
         self.selected_icon = None
         self.setup_ui()
+        WebsiteFetcher.instance().icon_ready.connect(self._website_icon_ready)
 
     def setup_ui(self):
         """设置UI界面"""
@@ -390,8 +388,9 @@ class SoftwareEditDialog(QtWidgets.QDialog):
         """加载图标预览"""
         try:
             if self.item_type == "website" and self.icon_path:
-                # 网站图标
-                icon = self._load_icon_from_http(self.icon_path)
+                # 网站图标，未下载时先显示占位图标
+                self.icon_preview.setPixmap(WebsiteFetcher.instance().pixmap(self.icon_path, 40))
+                return
             elif self.item_type == "file" and self.icon_path:
                 # 文件图标
                 icon = QtWidgets.QFileIconProvider().icon(QtCore.QFileInfo(self.icon_path))
@@ -407,19 +406,11 @@ class SoftwareEditDialog(QtWidgets.QDialog):
             pixmap = icon.pixmap(40, 40)
             self.icon_preview.setPixmap(pixmap)
 
-    def _load_icon_from_http(self, url):
-        """从网络加载图标"""
-        if not url:
-            return qtawesome.icon('msc.browser')
-        try:
-            response = requests.get(url, headers=request_headers, timeout=3)
-            response.raise_for_status()
-            data = QtCore.QByteArray(response.content)
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(data)
-            return QtGui.QIcon(pixmap)
-        except:
-            return qtawesome.icon('fa5s.browser')
+    def _website_icon_ready(self, url, pixmap):
+        """网站图标下载完成后更新预览"""
+        if self.item_type == "website" and url == (self.selected_icon or self.icon_path):
+            self.icon_preview.setPixmap(pixmap.scaled(
+                40, 40, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
 
     def choose_icon(self):
         """选择图标"""
@@ -441,12 +432,7 @@ class SoftwareEditDialog(QtWidgets.QDialog):
             url, ok = QtWidgets.QInputDialog.getText(self, "输入图标URL", "请输入图标的网址:")
             if ok and url.strip():
                 self.selected_icon = url.strip()
-                try:
-                    icon = self._load_icon_from_http(url.strip())
-                    pixmap = icon.pixmap(40, 40)
-                    self.icon_preview.setPixmap(pixmap)
-                except:
-                    QtWidgets.QMessageBox.warning(self, "错误", "无法加载图标URL")
+                self.icon_preview.setPixmap(WebsiteFetcher.instance().pixmap(self.selected_icon, 40))
 
     def browse_file(self):
         """浏览文件"""
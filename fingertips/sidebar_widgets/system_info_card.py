@@ -415,6 +415,17 @@ class SystemInfoCard(SidebarWidget):
         # 存储上次网络数据
         self.last_net_io = psutil.net_io_counters()
         
+    def on_shown(self):
+        # 重新记录网络数据，避免把隐藏期间的流量算作一秒内的速度
+        self.last_net_io = psutil.net_io_counters()
+        self.update_system_info()
+        self.update_timer.start()
+        self.network_timer.start()
+
+    def on_hidden(self):
+        self.update_timer.stop()
+        self.network_timer.stop()
+
     def update_system_info(self):
         """更新系统信息"""
         try:
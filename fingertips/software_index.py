@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import shlex
+import subprocess
+import configparser
+
+from fingertips.config import CONFIG_ROOT
+from fingertips.logger import get_logger
+from fingertips.db_utils import SoftwareDB
+
+log = get_logger('软件索引')
+
+CACHE_PATH = os.path.join(CONFIG_ROOT, 'cache', 'software_index.json')
+SKIP_NAMES = ('uninstall', 'uninst', '卸载')
+# .desktop 中 Exec 的占位参数
+EXEC_FIELD_CODES = ('%f', '%F', '%u', '%U', '%d', '%D', '%n', '%N', '%i', '%c', '%k', '%v', '%m')
+
+
+def default_folders():
+    """开始菜单，或 XDG 规范中的 applications 目录"""
+    if sys.platform == 'win32':
+        folders = [
+            os.path.join(os.environ.get(env, ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs')
+            for env in ('PROGRAMDATA', 'APPDATA')
+        ]
+    else:
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+        folders = [os.path.join(d, 'applications') for d in [data_home] + data_dirs.split(':') if d]
+    return [f for f in folders if os.path.isdir(f)]
+
+
+def parse_desktop_entry(path):
+    """返回 (名称, 命令)，不是应用或不显示时返回 None"""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    try:
+        parser.read(path, encoding='utf-8')
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+
+    if not parser.has_section('Desktop Entry'):
+        return None
+    entry = parser['Desktop Entry']
+    if (entry.get('Type') != 'Application' or
+            entry.get('NoDisplay', '').lower() == 'true' or
+            entry.get('Hidden', '').lower() == 'true' or not entry.get('Exec')):
+        return None
+
+    command = ' '.join(arg for arg in entry['Exec'].split() if arg not in EXEC_FIELD_CODES)
+    return entry.get('Name') or os.path.basename(path)[:-len('.desktop')], command
+
+
+def resolve_app(path):
+    """返回 (名称, 程序路径)，不是应用程序时返回 None，可能较慢"""
+    base, ext = os.path.splitext(os.path.basename(path))
+    ext = ext.lower()
+    if any(s in base.lower() for s in SKIP_NAMES):
+        return None
+
+    if ext == '.desktop':
+        return parse_desktop_entry(path)
+    if ext == '.exe':
+        return base, path
+    if ext == '.lnk':
+        from fingertips.utils import get_exe_path
+        target = get_exe_path(path)
+        if target and target.lower().endswith('.exe'):
+            return base, target
+    return None
+
+
+def iter_app_files(folders):
+    """递归返回 (路径, 修改时间)"""
+    exts = ('.desktop',) if sys.platform != 'win32' else ('.lnk', '.exe')
+    stack = list(folders)
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(exts):
+                    yield entry.path, entry.stat().st_mtime
+            except OSError:
+                continue
+
+
+def load_cache():
+    if not os.path.exists(CACHE_PATH):
+        return {}
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning(u'读取软件索引缓存失败: {}'.format(e))
+        return {}
+
+
+def save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        log.warning(u'写入软件索引缓存失败: {}'.format(e))
+
+
+def run_index(folders, is_stopped=lambda: False):
+    """
+    扫描 folders 并同步到 SoftwareDB。
+
+    缓存每个文件的修改时间和解析结果，只有新增或修改过的文件才重新解析快捷方式。
+    """
+    old_cache = load_cache()
+    cache = {}
+    resolved = 0
+    for path, mtime in iter_app_files(folders):
+        if is_stopped():
+            return None
+
+        cached = old_cache.get(path)
+        if cached and cached['mtime'] == mtime:
+            cache[path] = cached
+            continue
+
+        try:
+            app = resolve_app(path)
+        except Exception as e:
+            log.warning(u'解析 {} 失败: {}'.format(path, e))
+            app = None
+        cache[path] = {'mtime': mtime, 'app': app}
+        resolved += 1
+
+    apps = {path: tuple(item['app']) for path, item in cache.items() if item['app']}
+    db = SoftwareDB()
+    indexed = db.get_indexed()
+    removed = [path for path in indexed if apps.get(path) != indexed[path]]
+    added = [(name, exe_path, path) for path, (name, exe_path) in apps.items()
+             if indexed.get(path) != (name, exe_path)]
+
+    inserted = db.sync_indexed(added, removed) if added or removed else 0
+    save_cache(cache)
+    return {'files': len(cache), 'resolved': resolved,
+            'added': inserted, 'removed': len(removed)}
+
+
+def purge_index():
+    """关闭索引后删除所有索引发现的软件，返回删除的数量"""
+    db = SoftwareDB()
+    indexed = list(db.get_indexed())
+    if indexed:
+        db.sync_indexed([], indexed)
+    return len(indexed)
+
+
+def launch(path):
+    """打开软件，Linux 中使用 .desktop 文件启动"""
+    if hasattr(os, 'startfile'):
+        os.startfile(path)
+    elif path.endswith('.desktop'):
+        subprocess.Popen(['gio', 'launch', path])
+    else:
+        subprocess.Popen(['xdg-open', path] if os.path.exists(path) else shlex.split(path))
@@ -0,0 +1,109 @@
+import os
+
+from PySide2 import QtCore
+
+from fingertips.utils import get_logger
+from fingertips.software_index import default_folders, run_index, purge_index
+from fingertips.widget_utils import signal_bus
+from fingertips.settings.config_model import config_model
+
+log = get_logger('软件索引')
+
+
+def index_folders():
+    folders = default_folders() + list(config_model.software_index_folders.value)
+    return list(dict.fromkeys(os.path.normpath(f) for f in folders))
+
+
+class SoftwareIndexThread(QtCore.QThread):
+    reported = QtCore.Signal(dict)
+
+    def __init__(self, folders, parent=None):
+        super().__init__(parent)
+        self.folders = folders
+
+    def run(self):
+        try:
+            # 解析快捷方式需要在线程中初始化 COM
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+
+        try:
+            report = run_index(self.folders, self.isInterruptionRequested)
+        except Exception as e:
+            log.error(f'软件索引失败: {e}')
+            report = {'error': str(e)}
+
+        self.reported.emit(report or {})
+
+
+class SoftwareIndexer(QtCore.QObject):
+    """启动后和之后每隔一段时间在后台索引开始菜单等目录中的软件"""
+
+    START_DELAY = 10 * 1000
+    INTERVAL = 30 * 60 * 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.INTERVAL)
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+        QtCore.QTimer.singleShot(self.START_DELAY, self.check)
+
+        signal_bus.software_index_requested.connect(self.run_now)
+        config_model.enable_software_index.valueChanged.connect(self._enabled_changed)
+
+    def check(self):
+        if config_model.enable_software_index.value:
+            self.run_now()
+        else:
+            self.purge()
+
+    def _enabled_changed(self, enabled):
+        if enabled:
+            self.run_now()
+        else:
+            self.purge()
+
+    def purge(self):
+        """关闭索引后，索引发现的软件不再出现在搜索结果中"""
+        if self.is_running():
+            self._thread.requestInterruption()
+            self._thread.wait(3000)
+
+        try:
+            removed = purge_index()
+        except Exception as e:
+            log.error(f'清除软件索引失败: {e}')
+            return
+        if removed:
+            log.info('已清除 {} 个索引软件'.format(removed))
+            signal_bus.software_index_finished.emit({'files': 0, 'added': 0, 'removed': removed})
+
+    def is_running(self):
+        return self._thread is not None and self._thread.isRunning()
+
+    def run_now(self):
+        if self.is_running():
+            return
+
+        folders = index_folders()
+        log.info('开始索引软件: {}'.format(folders))
+        self._thread = SoftwareIndexThread(folders, self)
+        self._thread.reported.connect(self._index_reported)
+        self._thread.start()
+
+    def _index_reported(self, report):
+        log.info('软件索引完成: {}'.format(report))
+        signal_bus.software_index_finished.emit(report)
+
+    def stop(self):
+        self.timer.stop()
+        if self.is_running():
+            self._thread.requestInterruption()
+            self._thread.wait(3000)
@@ -8,6 +8,7 @@ from PySide2 import QtGui
 from fingertips.widget_utils import signal_bus
 from fingertips.settings.config_model import config_model
 from fingertips.db_utils import ConfigDB
+from fingertips.super_sidebar.sidebar_widget_utils import SidebarWidget
 
 
 class ResizableWidget(QtWidgets.QGraphicsItem):
@@ -288,6 +289,25 @@ class Context:
         return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
 
 
+class PendingWidget(QtWidgets.QWidget):
+    """
+    组件创建前的占位，按保存的尺寸占据位置并保留配置，
+    第一次显示面板时由 ContentView 换成真实组件
+    """
+
+    def __init__(self, widget_class, config, parent=None):
+        super().__init__(parent)
+        self.widget_class = widget_class
+        self.name = getattr(widget_class, 'name', None) or widget_class.__name__
+        self.config = config
+
+    def get_config(self):
+        return self.config
+
+    def edit_mode_changed(self, edit_mode):
+        pass
+
+
 class ResizableWidgetBase(ResizableWidget):
     """可调整大小的按钮组件"""
     def __init__(self, x, y, widget, widget_class=None, editable=True, wid=None, custom_width=None, custom_height=None):
@@ -307,27 +327,40 @@ class ResizableWidgetBase(ResizableWidget):
         # 将 editable 参数传递给父类构造函数
         super().__init__(x, y, width, height, editable=editable)
         self.wid = wid or str(uuid.uuid4())
-        widget.context = Context()
-        widget.context.wid = self.wid
-        widget.context.db_config = ConfigDB(widget_class.__name__)
-        widget.on_loaded()
+        # 保存widget类信息，用于序列化
+        self.widget_class = widget_class
 
         self.proxy = QtWidgets.QGraphicsProxyWidget(self)
-        self.proxy.setWidget(widget)
-        
-        # 保存原始widget的引用，用于调整大小
-        self.widget = widget
-        
+        self.widget = None
+
         # 头部相关属性
         self.header_dragging = False
         self.header_drag_start_pos = QtCore.QPointF()
         self.header_drag_start_item_pos = QtCore.QPointF()
         self.close_button_hovered = False  # 跟踪关闭按钮悬停状态
-        
+
+        self.set_widget(widget)
+
+    def is_pending(self):
+        return isinstance(self.widget, PendingWidget)
+
+    def set_widget(self, widget):
+        """设置显示的组件，占位组件换成真实组件时也使用这个方法"""
+        if not isinstance(widget, PendingWidget):
+            widget.context = Context()
+            widget.context.wid = self.wid
+            widget.context.db_config = ConfigDB(self.widget_class.__name__)
+            widget.on_loaded()
+
+        old_widget = self.widget
+        self.proxy.setWidget(widget)
+        # 保存原始widget的引用，用于调整大小
+        self.widget = widget
+        if old_widget is not None:
+            old_widget.hide()
+            old_widget.deleteLater()
+
         self._update_proxy_geometry()
-        
-        # 保存widget类信息，用于序列化
-        self.widget_class = widget_class
 
     def _update_proxy_geometry(self):
         """更新代理部件的几何形状"""
@@ -608,6 +641,9 @@ class ResizableWidgetBase(ResizableWidget):
                 )
                 
                 if reply == QMessageBox.Yes:
+                    # 删除后停止组件的定时器
+                    if isinstance(self.widget, SidebarWidget):
+                        self.widget.set_shown(False)
                     # 从场景和列表中移除
                     if self.scene():
                         self.scene().removeItem(self)
@@ -724,6 +760,16 @@ class ContentView(QtWidgets.QGraphicsView):
         # 设置焦点策略以接收键盘事件
         self.setFocusPolicy(QtCore.Qt.StrongFocus)
 
+        # 从配置加载的组件先用占位组件，第一次显示时每轮事件循环创建一个
+        self._pending = []
+        self._pending_timer = QtCore.QTimer(self)
+        self._pending_timer.setInterval(0)
+        self._pending_timer.timeout.connect(self._create_next_pending)
+
+        # 面板是否显示，和滚动位置一起决定组件是否可见
+        self._panel_visible = False
+        self.verticalScrollBar().valueChanged.connect(self.update_widget_visibility)
+
     def _is_in_parent_resize_area(self, pos):
         """检查鼠标位置是否在父窗口的调整大小区域内"""
         # 获取父窗口
@@ -1022,6 +1068,7 @@ class ContentView(QtWidgets.QGraphicsView):
         self.scene.addItem(resizable_widget)
         self._items.append(resizable_widget)
         self.update_scene_rect()
+        self._update_item_visibility(resizable_widget, self._visible_scene_rect())
         return resizable_widget
 
     # --- 新增设置编辑模式的方法 ---
@@ -1076,7 +1123,7 @@ class ContentView(QtWidgets.QGraphicsView):
         qfluentwidgets.qconfig.set(config_model.super_sidebar_node, config_data)
 
     def load_nodes_from_config(self):
-        """从配置文件加载节点信息"""
+        """从配置文件加载节点信息，只创建占位组件，真实组件在 create_pending_widgets 中创建"""
         import importlib
         
         config_data = config_model.super_sidebar_node.value
@@ -1091,6 +1138,7 @@ class ContentView(QtWidgets.QGraphicsView):
             if item.scene():
                 self.scene.removeItem(item)
         self._items.clear()
+        self._pending.clear()
         
         # 加载节点
         for i, node_data in enumerate(config_data['nodes']):
@@ -1114,10 +1162,8 @@ class ContentView(QtWidgets.QGraphicsView):
                 
                 print(f"Loading {class_name} at position ({saved_x}, {saved_y}) with size ({saved_width}, {saved_height})")
                 
-                # 创建widget实例
-                widget_instance = widget_class()
-                widget_instance.set_config(node_data.get('config', {}))
-                widget_instance.save_config_signal.connect(self.save_nodes_to_config)
+                # 先用占位组件保留位置和配置
+                widget_instance = PendingWidget(widget_class, node_data.get('config', {}))
 
                 # 计算正确的总高度
                 if self.edit_mode:
@@ -1144,6 +1190,7 @@ class ContentView(QtWidgets.QGraphicsView):
                 # 添加到场景
                 self.scene.addItem(resizable_widget)
                 self._items.append(resizable_widget)
+                self._pending.append(resizable_widget)
                 
             except Exception as e:
                 print(f"Failed to load widget {class_name}: {e}")
@@ -1153,6 +1200,69 @@ class ContentView(QtWidgets.QGraphicsView):
         print(f"Successfully loaded {len(self._items)} widgets")
         self.update_scene_rect()
 
+    def create_pending_widgets(self):
+        """开始创建占位组件对应的真实组件，可见区域内的优先，再按从上到下的顺序"""
+        if not self._pending or self._pending_timer.isActive():
+            return
+
+        visible_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        self._pending.sort(key=lambda item: (
+            not item.sceneBoundingRect().intersects(visible_rect), item.pos().y(), item.pos().x()))
+        self._pending_timer.start()
+
+    def _create_next_pending(self):
+        while self._pending:
+            item = self._pending.pop(0)
+            # 创建前已被删除
+            if item.scene() is None or not item.is_pending():
+                continue
+
+            self._create_widget(item)
+            break
+
+        if not self._pending:
+            self._pending_timer.stop()
+
+    def _create_widget(self, item):
+        class_name = item.widget_class.__name__
+        try:
+            widget_instance = item.widget_class()
+            widget_instance.set_config(item.widget.get_config())
+        except Exception as e:
+            # 保留占位组件，配置不会丢失
+            print(f"Failed to load widget {class_name}: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+
+        widget_instance.save_config_signal.connect(self.save_nodes_to_config)
+        widget_instance.edit_mode_changed(self.edit_mode)
+        item.set_widget(widget_instance)
+        self._update_item_visibility(item, self._visible_scene_rect())
+
+    def set_panel_visible(self, visible):
+        """面板显示或隐藏后通知组件"""
+        self._panel_visible = visible
+        self.update_widget_visibility()
+
+    def _visible_scene_rect(self):
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def _update_item_visibility(self, item, visible_rect):
+        if isinstance(item.widget, SidebarWidget):
+            item.widget.set_shown(self._panel_visible and item.scene() is not None and
+                                  item.sceneBoundingRect().intersects(visible_rect))
+
+    def update_widget_visibility(self):
+        """按面板状态和滚动位置通知每个组件是否可见"""
+        visible_rect = self._visible_scene_rect()
+        for item in self._items:
+            self._update_item_visibility(item, visible_rect)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_widget_visibility()
+
     def keyPressEvent(self, event):
         """处理键盘事件"""
         if event.key() == QtCore.Qt.Key_Delete or event.key() == QtCore.Qt.Key_Backspace:
@@ -1195,6 +1305,10 @@ class ContentView(QtWidgets.QGraphicsView):
             
         # 从场景和列表中删除项目
         for item in items_to_delete:
+            # 删除后停止组件的定时器
+            if isinstance(item.widget, SidebarWidget):
+                item.widget.set_shown(False)
+
             # 从场景中移除
             if item.scene():
                 self.scene.removeItem(item)
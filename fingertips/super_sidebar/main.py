@@ -3,8 +3,8 @@ import uuid
 from functools import partial
 
 from PySide2.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout,  QPushButton, QHBoxLayout, QGraphicsOpacityEffect
-from PySide2.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QObject, QEasingCurve, \
-    QPoint, QSize
+from PySide2.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve, \
+    QPoint, QSize, Signal, QObject
 from PySide2.QtGui import QCursor, QColor, QPainter, QBrush, QLinearGradient, QIcon
 import qtawesome
 import qfluentwidgets
@@ -62,6 +62,80 @@ class MenuButton(QPushButton):
         self._show_menu()
 
 
+class EdgeWatcher(QObject):
+    """
+    轮询鼠标位置，检测鼠标是否停在屏幕边缘。
+
+    不创建窗口，边缘上的点击和滚轮仍由下面的窗口处理；
+    鼠标远离边缘时慢速轮询，静止时再放慢，靠近边缘后加快，减少空闲时的唤醒次数。
+    """
+    entered = Signal()
+    moved = Signal(QPoint)
+    left = Signal()
+
+    ZONE = 2  # 距离屏幕边缘的激活区域像素数
+    NEAR_DISTANCE = 150  # 鼠标进入这个距离后加快轮询
+    FAST_INTERVAL = 30
+    SLOW_INTERVAL = 250
+    IDLE_INTERVAL = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rect = QRect()
+        self._near_rect = QRect()
+        self._inside = False
+        self._last_pos = None
+        self._running = False
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+    def geometry(self):
+        return QRect(self._rect)
+
+    def set_edge(self, rect):
+        self._rect = QRect(rect)
+        self._near_rect = rect.adjusted(-self.NEAR_DISTANCE, 0, self.NEAR_DISTANCE, 0)
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._last_pos = None
+            self.check()
+
+    def stop(self):
+        self._running = False
+        self.timer.stop()
+        if self._inside:
+            self._inside = False
+            self.left.emit()
+
+    def check(self):
+        if not self._running:
+            return
+
+        pos = QCursor.pos()
+        inside = self._rect.contains(pos)
+        if inside and not self._inside:
+            self.entered.emit()
+        elif inside and pos != self._last_pos:
+            self.moved.emit(pos)
+        elif not inside and self._inside:
+            self.left.emit()
+        self._inside = inside
+
+        if inside or self._near_rect.contains(pos):
+            interval = self.FAST_INTERVAL
+        elif pos == self._last_pos:
+            interval = self.IDLE_INTERVAL
+        else:
+            interval = self.SLOW_INTERVAL
+        self._last_pos = pos
+        if self._running:
+            self.timer.start(interval)
+
+
 class SuperSidebar(QMainWindow):
     # 位置常量
     LEFT = "left"
@@ -71,6 +145,8 @@ class SuperSidebar(QMainWindow):
     MIN_WIDTH = 300
     MAX_WIDTH = 1000
     RESIZE_BORDER_WIDTH = 10  # 可拖拽边缘的宽度
+    LEAVE_CHECK_INTERVAL = 200  # 鼠标离开面板后检查是否隐藏的间隔（毫秒）
+    AERO_REPAINT_DELAY = 50  # 亚克力背景在移动停止后补绘的延迟（毫秒）
 
     def __init__(self, position=RIGHT, panel_width=600, opacity=0.7, enable_aero=True):
         """
@@ -155,25 +231,29 @@ class SuperSidebar(QMainWindow):
         self.is_visible = False
         self.is_animating = False
 
-        # 创建全局事件过滤器
-        self.mouse_detector = MouseDetector(self)
-        QApplication.instance().installEventFilter(self.mouse_detector)
-
-        # 创建检测鼠标位置的定时器
-        self.detection_timer = QTimer(self)
-        self.detection_timer.timeout.connect(self.check_mouse_position)
-        self.detection_timer.start(300)
-
-        # 创建屏幕配置变化检测定时器
-        self.screen_update_timer = QTimer(self)
-        self.screen_update_timer.timeout.connect(self.check_screen_changes)
-        self.screen_update_timer.start(2000)  # 每2秒检查一次屏幕配置变化
+        # 鼠标离开面板后才检查是否需要隐藏，回到面板或隐藏后停止
+        self.leave_timer = QTimer(self)
+        self.leave_timer.setInterval(self.LEAVE_CHECK_INTERVAL)
+        self.leave_timer.timeout.connect(self.check_mouse_leave)
+
+        # 屏幕增减或几何变化时重新计算屏幕信息，同一轮事件中的多次变化只处理一次
+        self.screen_change_timer = QTimer(self)
+        self.screen_change_timer.setSingleShot(True)
+        self.screen_change_timer.setInterval(0)
+        self.screen_change_timer.timeout.connect(self.check_screen_changes)
+
+        app = QApplication.instance()
+        app.screenAdded.connect(self.screen_added)
+        app.screenRemoved.connect(self.screens_changed)
+        for screen in QApplication.screens():
+            self.watch_screen(screen)
         
-        # 创建重绘定时器，解决亚克力效果的重绘问题
+        # 亚克力效果只在面板显示、移动和改变大小后补一次重绘，连续的移动合并为一次
         if self.enable_aero:
             self.repaint_timer = QTimer(self)
+            self.repaint_timer.setSingleShot(True)
+            self.repaint_timer.setInterval(self.AERO_REPAINT_DELAY)
             self.repaint_timer.timeout.connect(self.force_repaint)
-            self.repaint_timer.start(1000)  # 每秒强制重绘一次
 
         # 启用鼠标跟踪，用于在编辑模式下实时检测鼠标位置
         self.setMouseTracking(True)
@@ -185,6 +265,13 @@ class SuperSidebar(QMainWindow):
         self.hover_delay = 500  # 悬停延迟时间（毫秒）
         self.last_edge_position = None  # 记录上次在边缘的鼠标位置
 
+        # 按鼠标离屏幕边缘的距离调整轮询间隔，面板显示时停止
+        self.edge_watcher = EdgeWatcher(self)
+        self.edge_watcher.entered.connect(self.edge_entered)
+        self.edge_watcher.moved.connect(self.edge_moved)
+        self.edge_watcher.left.connect(self.edge_hover_timer.stop)
+        self.update_edge_watcher()
+
         self.windowEffect = WindowEffect()
         # 启用Aero效果
         if self.enable_aero:
@@ -277,8 +364,24 @@ class SuperSidebar(QMainWindow):
             if bottom_edge > self.virtual_screen_height:
                 self.virtual_screen_height = bottom_edge
 
+    def watch_screen(self, screen):
+        screen.geometryChanged.connect(self.screens_changed)
+        screen.availableGeometryChanged.connect(self.screens_changed)
+
+    def screen_added(self, screen):
+        self.watch_screen(screen)
+        self.screens_changed()
+
+    def screens_changed(self, *args):
+        # 移除屏幕的信号发出时屏幕列表可能还没有更新，延迟到下一轮事件循环
+        self.screen_change_timer.start()
+
     def check_screen_changes(self):
         """检查屏幕配置是否发生变化"""
+        if not QApplication.screens():
+            # 切换显示器时可能短暂没有屏幕
+            return
+
         if self.position == self.LEFT:
             old_edge = self.leftmost_screen_left
             old_height = self.leftmost_screen_height
@@ -300,6 +403,7 @@ class SuperSidebar(QMainWindow):
 
         # 如果屏幕位置或尺寸变化，更新侧边栏位置
         if old_edge != new_edge or old_height != new_height:
+            self.update_edge_watcher()
             self.setFixedSize(self.panel_width, new_height)
 
             if self.is_visible:
@@ -514,6 +618,7 @@ class SuperSidebar(QMainWindow):
                 self._restore_button_opacity()
 
             qfluentwidgets.qconfig.set(config_model.super_sidebar_width, self.panel_width)
+            self.watch_mouse_leave()
 
     def toggle_pin(self):
         """切换固定状态"""
@@ -535,6 +640,7 @@ class SuperSidebar(QMainWindow):
                 self.resize_start_geometry = None
                 # 确保按钮在取消固定时恢复透明度
                 self._restore_button_opacity()
+            self.watch_mouse_leave()
 
     def _set_hide_button(self, button, hide):
         if hide:
@@ -557,109 +663,85 @@ class SuperSidebar(QMainWindow):
         self.pin_button.setGraphicsEffect(None)
         self.menu_button.setGraphicsEffect(None)
 
-    def check_mouse_position(self):
-        if self.is_animating or self.is_pinned:  # 如果已固定，不检查鼠标位置
+    def update_edge_watcher(self):
+        """把激活区域设为目标屏幕的边缘，面板隐藏时才检测"""
+        if self.position == self.LEFT:
+            left, top, height = (self.leftmost_screen_left, self.leftmost_screen_top,
+                                 self.leftmost_screen_height)
+        else:  # RIGHT
+            left, top, height = (self.rightmost_screen_right - EdgeWatcher.ZONE,
+                                 self.rightmost_screen_top, self.rightmost_screen_height)
+
+        self.edge_watcher.set_edge(QRect(left, top, EdgeWatcher.ZONE, height))
+        if self.is_visible or self.is_animating:
+            self.edge_watcher.stop()
+        else:
+            self.edge_watcher.start()
+
+    def edge_entered(self):
+        if self.is_animating or self.is_pinned or self.is_visible:
             return
 
-        mouse_pos = QCursor.pos()
-        activation_zone = 2  # 距离屏幕边缘的激活区域像素数
+        # 鼠标在边缘停留 hover_delay 后显示
+        self.last_edge_position = QCursor.pos()
+        self.edge_hover_timer.start(self.hover_delay)
 
-        if self.position == self.LEFT:
-            # 检查鼠标是否在最左侧屏幕上
-            is_on_target_screen = (
-                mouse_pos.x() >= self.leftmost_screen_left and
-                mouse_pos.x() <= self.leftmost_screen_right and
-                mouse_pos.y() >= self.leftmost_screen_top and
-                mouse_pos.y() <= self.leftmost_screen_top + self.leftmost_screen_height
-            )
-
-            # 判断鼠标是否在最左侧屏幕的左侧边缘
-            is_at_edge = mouse_pos.x() - self.leftmost_screen_left <= activation_zone
-
-            if is_on_target_screen and is_at_edge and not self.is_visible:
-                # 检查鼠标是否已经在边缘停留
-                if self.edge_hover_timer.isActive():
-                    # 如果鼠标移动了太多，重置计时器
-                    if self.last_edge_position and (
-                            abs(mouse_pos.y() - self.last_edge_position.y()) > 3):
-                        self.last_edge_position = QPoint(mouse_pos)
-                        self.edge_hover_timer.start(self.hover_delay)
-                else:
-                    # 开始计时
-                    self.last_edge_position = QPoint(mouse_pos)
-                    self.edge_hover_timer.start(self.hover_delay)
-            elif not is_at_edge and self.edge_hover_timer.isActive():
-                # 如果鼠标离开了边缘，停止计时器
-                self.edge_hover_timer.stop()
-
-            if (not self.geometry().contains(mouse_pos) and
-                    self.is_visible and
-                    mouse_pos.x() > self.leftmost_screen_left + self.panel_width):
-                self.hide_panel()
-        else:  # RIGHT
-            # 检查鼠标是否在最右侧屏幕上
-            is_on_target_screen = (
-                mouse_pos.x() >= self.rightmost_screen_left and
-                mouse_pos.x() <= self.rightmost_screen_right and
-                mouse_pos.y() >= self.rightmost_screen_top and
-                mouse_pos.y() <= self.rightmost_screen_top + self.rightmost_screen_height
-            )
-
-            # 判断鼠标是否在最右侧屏幕的右侧边缘
-            is_at_edge = self.rightmost_screen_right - mouse_pos.x() <= activation_zone
-
-            if is_on_target_screen and is_at_edge and not self.is_visible:
-                # 检查鼠标是否已经在边缘停留
-                if self.edge_hover_timer.isActive():
-                    # 如果鼠标移动了太多，重置计时器
-                    if self.last_edge_position and (
-                            abs(mouse_pos.y() - self.last_edge_position.y()) > 3):
-                        self.last_edge_position = QPoint(mouse_pos)
-                        self.edge_hover_timer.start(self.hover_delay)
-                else:
-                    # 开始计时
-                    self.last_edge_position = QPoint(mouse_pos)
-                    self.edge_hover_timer.start(self.hover_delay)
-            elif not is_at_edge and self.edge_hover_timer.isActive():
-                # 如果鼠标离开了边缘，停止计时器
-                self.edge_hover_timer.stop()
-
-            if (not self.geometry().contains(mouse_pos) and
-                    self.is_visible and
-                    mouse_pos.x() < self.rightmost_screen_right - self.panel_width):
-                self.hide_panel()
+    def edge_moved(self, mouse_pos):
+        # 如果鼠标移动了太多，重置计时器
+        if (self.edge_hover_timer.isActive() and self.last_edge_position and
+                abs(mouse_pos.y() - self.last_edge_position.y()) > 3):
+            self.last_edge_position = QPoint(mouse_pos)
+            self.edge_hover_timer.start(self.hover_delay)
 
     def delayed_show_panel(self):
         """在延迟后显示面板"""
         # 再次检查鼠标位置，确保鼠标仍在边缘
+        if self.edge_watcher.geometry().contains(QCursor.pos()):
+            self.show_panel()
+
+    def watch_mouse_leave(self):
+        """面板显示且鼠标不在面板上时，开始检查是否需要隐藏"""
+        if (self.is_visible and not self.is_pinned and
+                not self.geometry().contains(QCursor.pos())):
+            self.leave_timer.start()
+
+    def check_mouse_leave(self):
+        if not self.is_visible or self.is_pinned:
+            self.leave_timer.stop()
+            return
+        if self.is_animating:
+            return
+
         mouse_pos = QCursor.pos()
-        activation_zone = 2
+        if self.geometry().contains(mouse_pos):
+            # 可能在面板上方的菜单或对话框中，继续检查，回到面板时由 enterEvent 停止
+            return
 
         if self.position == self.LEFT:
-            is_on_target_screen = (
-                mouse_pos.x() >= self.leftmost_screen_left and
-                mouse_pos.x() <= self.leftmost_screen_right and
-                mouse_pos.y() >= self.leftmost_screen_top and
-                mouse_pos.y() <= self.leftmost_screen_top + self.leftmost_screen_height
-            )
-            is_at_edge = mouse_pos.x() - self.leftmost_screen_left <= activation_zone
+            is_outside = mouse_pos.x() > self.leftmost_screen_left + self.panel_width
         else:  # RIGHT
-            is_on_target_screen = (
-                mouse_pos.x() >= self.rightmost_screen_left and
-                mouse_pos.x() <= self.rightmost_screen_right and
-                mouse_pos.y() >= self.rightmost_screen_top and
-                mouse_pos.y() <= self.rightmost_screen_top + self.rightmost_screen_height
-            )
-            is_at_edge = self.rightmost_screen_right - mouse_pos.x() <= activation_zone
-
-        if is_on_target_screen and is_at_edge:
-            self.show_panel()
+            is_outside = mouse_pos.x() < self.rightmost_screen_right - self.panel_width
+
+        if is_outside:
+            self.leave_timer.stop()
+            self.hide_panel()
+
+    def enterEvent(self, event):
+        self.leave_timer.stop()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        if self.is_visible and not self.is_pinned:
+            self.leave_timer.start()
+        super().leaveEvent(event)
 
     def show_panel(self):
         if self.is_visible or self.is_animating:
             return
 
         self.is_animating = True
+        self.edge_hover_timer.stop()
+        self.edge_watcher.stop()
 
         # 先确保窗口在正确的初始位置，但还不显示
         if self.position == self.LEFT:
@@ -749,19 +831,42 @@ class SuperSidebar(QMainWindow):
     def on_show_finished(self):
         self.is_animating = False
         self.is_visible = True
+        # 第一次显示后再创建侧边栏组件，避免影响滑入动画
+        self.content_view.create_pending_widgets()
+        self.content_view.set_panel_visible(True)
+        self.schedule_repaint()
+        # 动画期间鼠标可能已经离开
+        self.watch_mouse_leave()
 
     def on_hide_finished(self):
         self.is_animating = False
         self.is_visible = False
         self.hide()  # 动画完成后隐藏窗口
+        self.edge_watcher.start()
+        self.content_view.set_panel_visible(False)
+
+    def schedule_repaint(self):
+        """面板可见时安排一次亚克力背景的补绘"""
+        if self.enable_aero and self.isVisible():
+            self.repaint_timer.start()
 
     def force_repaint(self):
-        """强制重绘窗口，解决亚克力效果的重绘问题"""
+        """重绘窗口，解决亚克力效果在显示和移动后的残影问题"""
         if self.is_visible and self.enable_aero:
+            # 子控件在父窗口的脏区域内一起重绘
             self.update()
-            # 强制重绘所有子组件
-            for child in self.findChildren(QWidget):
-                child.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_repaint()
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.schedule_repaint()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_repaint()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton and self.is_edit_mode and self.is_pinned:
@@ -876,10 +981,10 @@ class SuperSidebar(QMainWindow):
     def closeEvent(self, event):
         """窗口关闭事件，清理资源"""
         # 停止所有定时器
-        if hasattr(self, 'detection_timer'):
-            self.detection_timer.stop()
-        if hasattr(self, 'screen_update_timer'):
-            self.screen_update_timer.stop()
+        if hasattr(self, 'leave_timer'):
+            self.leave_timer.stop()
+        if hasattr(self, 'screen_change_timer'):
+            self.screen_change_timer.stop()
         if hasattr(self, 'repaint_timer'):
             self.repaint_timer.stop()
         if hasattr(self, 'edge_hover_timer'):
@@ -888,10 +993,9 @@ class SuperSidebar(QMainWindow):
         # 停止动画
         if hasattr(self, 'animation'):
             self.animation.stop()
-        
-        # 移除全局事件过滤器
-        if hasattr(self, 'mouse_detector'):
-            QApplication.instance().removeEventFilter(self.mouse_detector)
+
+        if hasattr(self, 'edge_watcher'):
+            self.edge_watcher.stop()
         
         # 清理dialog父窗口
         if hasattr(self, 'dialog_parent') and self.dialog_parent is not None:
@@ -902,16 +1006,6 @@ class SuperSidebar(QMainWindow):
         super().closeEvent(event)
 
 
-class MouseDetector(QObject):
-    def __init__(self, panel):
-        super().__init__()
-        self.panel = panel
-
-    def eventFilter(self, obj, event):
-        # 仅作为备份检测机制
-        return super().eventFilter(obj, event)
-
-
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
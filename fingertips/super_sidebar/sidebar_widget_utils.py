@@ -18,6 +18,8 @@ class SidebarWidget(QtWidgets.QWidget):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.edit_mode = False
+        # 是否在侧边栏的可见区域内，第一次通知前为 None
+        self.is_shown = None
         self._check_base_info()
         signal_bus.super_sidebar_edit_mode_changed.connect(self.edit_mode_changed)
 
@@ -42,6 +44,25 @@ class SidebarWidget(QtWidgets.QWidget):
 
     def on_loaded(self):
         pass
+
+    def set_shown(self, shown):
+        """由 ContentView 在面板显示、隐藏和滚动后调用，状态变化时触发 on_shown/on_hidden"""
+        if shown == self.is_shown:
+            return
+
+        self.is_shown = shown
+        if shown:
+            self.on_shown()
+        else:
+            self.on_hidden()
+
+    def on_shown(self):
+        """组件进入可见区域，恢复定时器并补上隐藏期间错过的更新"""
+        pass
+
+    def on_hidden(self):
+        """面板隐藏或组件滚出可见区域，暂停定时器和后台请求"""
+        pass
         
     def get_dialog_parent(self):
         """
@@ -1,90 +1,35 @@
 import os
-import sys
-import logging
+import ctypes
 from ctypes import windll
-from logging.handlers import TimedRotatingFileHandler
 
 from PySide2 import QtWidgets
 import pyautogui
 import win32com.client
 
-from fingertips.config import RECORD_LOG, DEBUG
+from fingertips.logger import get_logger
 
 ROOT_PATH = os.path.dirname(os.path.abspath(__file__))
 
 
-class SingleLogger(object):
-    log_path = './log/Fingertips.log'
-    if not os.path.exists(os.path.dirname(log_path)):
-        os.makedirs(os.path.dirname(log_path))
-
-    log = logging.getLogger('Fingertips')
-    log.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        '%(asctime)s - %(plugin_name)s - %(levelname)s - %(message)s')
-    log_file_handler = TimedRotatingFileHandler(
-        filename=log_path, when='D', encoding='utf-8')
-    log_file_handler.setFormatter(formatter)
-    log_file_handler.setLevel(logging.INFO)
-    log.addHandler(log_file_handler)
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    log.addHandler(stream_handler)
-
-    def __init__(self, name='Fingertips'):
-        self.name = name
-
-    def add_name_info(self, kwargs):
-        if not kwargs:
-            kwargs = {}
-        if 'extra' not in kwargs:
-            kwargs['extra'] = {}
-        kwargs['extra']['plugin_name'] = self.name
-        return kwargs
-
-    def info(self, msg, *args, **kwargs):
-        kwargs = self.add_name_info(kwargs)
-        self.log.info(msg, *args, **kwargs)
-
-    def warning(self, msg, *args, **kwargs):
-        kwargs = self.add_name_info(kwargs)
-        self.log.warning(msg, *args, **kwargs)
-
-    def error(self, msg, *args, **kwargs):
-        kwargs = self.add_name_info(kwargs)
-        self.log.error(msg, *args, **kwargs)
-
-
-class EmptyLogger(object):
-    def __init__(self, name):
-        self.title = u'- {} - '.format(name)
-
-    def info(self, msg, *args, **kwargs):
-        if DEBUG:
-            print(self.title + msg)
-        return
-
-    def warning(self, msg, *args, **kwargs):
-        if DEBUG:
-            print(self.title + msg)
-        return
+def clear_clipboard():
+    if windll.user32.OpenClipboard(None):
+        windll.user32.EmptyClipboard()
+        windll.user32.CloseClipboard()
 
-    def error(self, msg, *args, **kwargs):
-        if DEBUG:
-            print(self.title + msg)
-        return
 
+class LastInputInfo(ctypes.Structure):
+    _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
 
-def get_logger(name):
-    if RECORD_LOG:
-        return SingleLogger(name)
-    return EmptyLogger(name)
 
+def get_idle_seconds():
+    """距离用户最后一次键盘鼠标输入的秒数"""
+    info = LastInputInfo()
+    info.cbSize = ctypes.sizeof(info)
+    if not windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return 0
 
-def clear_clipboard():
-    if windll.user32.OpenClipboard(None):
-        windll.user32.EmptyClipboard()
-        windll.user32.CloseClipboard()
+    elapsed = (windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+    return elapsed / 1000.0
 
 
 def get_exe_path(file_path):
@@ -9,6 +9,15 @@ class SignalBus(QtCore.QObject):
     chat_item_deleted = QtCore.Signal()
     super_sidebar_config_changed = QtCore.Signal(dict)
     super_sidebar_edit_mode_changed = QtCore.Signal(bool)
+    ai_actions_changed = QtCore.Signal()
+    db_maintenance_requested = QtCore.Signal()
+    db_maintenance_finished = QtCore.Signal(dict)
+    db_backup_requested = QtCore.Signal()
+    db_restore_requested = QtCore.Signal(str)
+    db_backup_progressed = QtCore.Signal(int, int)
+    db_backup_finished = QtCore.Signal(dict)
+    software_index_requested = QtCore.Signal()
+    software_index_finished = QtCore.Signal(dict)
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, '_instance'):
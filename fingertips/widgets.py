@@ -1,4 +1,5 @@
 import os
+import math
 
 from PySide2 import QtWidgets
 from PySide2 import QtCore
@@ -10,71 +11,63 @@ import win32con
 import win32gui
 import qtawesome as qta
 
-from fingertips.db_utils import SoftwareDB
+from fingertips.db_utils import SoftwareDB, FrecencyDB
+from fingertips.icon_cache import IconCache
+from fingertips.delegates import SoftwareTileDelegate
+from fingertips.core.search import KeywordIndex
+from fingertips.core.result import ResultItem
 from fingertips.utils import get_exe_path
 
 
-class SoftwareItem(QtWidgets.QWidget):
-    def __init__(self, icon, name, parent=None):
-        super().__init__(parent=parent)
-        self._init_ui(icon, name)
-
-    def _init_ui(self, icon, name):
-        self.setMaximumSize(88, 86)
-        self.setObjectName('software_item')
-
-        self.name_label = QtWidgets.QLabel(name)
-        self.img_label = QtWidgets.QLabel()
-        self.img_label.setFixedSize(34, 34)
-
-        pixmap = icon.pixmap(34, 34).scaled(
-            34, 34, QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
-        )
-        self.img_label.setPixmap(pixmap)
-
-        img_layout = QtWidgets.QHBoxLayout()
-        img_layout.addItem(QtWidgets.QSpacerItem(
-            34, 100, QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Minimum
-        ))
-        img_layout.addWidget(self.img_label)
-
-        img_layout.addItem(QtWidgets.QSpacerItem(
-            34, 100, QtWidgets.QSizePolicy.Expanding,
-            QtWidgets.QSizePolicy.Minimum
-        ))
-
-        self.img_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.name_label.setAlignment(QtCore.Qt.AlignCenter)
-        self.name_label.setWordWrap(True)
-
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.setContentsMargins(4, 6, 4, 6)
-        layout.setAlignment(QtCore.Qt.AlignCenter)
-        layout.addLayout(img_layout)
-        layout.addWidget(self.name_label)
-
-
 class SoftwareListWidget(QtWidgets.QListWidget):
+    """软件列表，由 SoftwareTileDelegate 绘制，不为每个软件创建控件"""
     item_double_clicked = QtCore.Signal(str)
 
+    ICON_SIZE = 34
+    PATH_ROLE = QtCore.Qt.UserRole
+    FILE_ROLE = QtCore.Qt.UserRole + 1
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self._software_db = SoftwareDB()
+        self._frecency = FrecencyDB('software')
+        self._order_changed = False
+        self._index = None
 
         self.setObjectName('software_list_widget')
         self.setFlow(QtWidgets.QListWidget.LeftToRight)
         self.setWrapping(True)
         self.setResizeMode(QtWidgets.QListWidget.Adjust)
         self.setSpacing(0)
+        self.setUniformItemSizes(True)
+        self.setItemDelegate(SoftwareTileDelegate(QtCore.QSize(88, 86), self.ICON_SIZE, parent=self))
 
         self.setAcceptDrops(True)
         self.itemDoubleClicked.connect(self._item_double_clicked)
-
-        for info in self._software_db.get_software():
-            self.add_item(info['name'], info['exe_path'], info['lnk_path'])
+        IconCache.instance().icon_ready.connect(self._icon_ready)
+
+        self._populate()
+
+    def _populate(self):
+        """按常用程度排列，从未启动过的软件保持添加顺序"""
+        self.clear()
+        self._index = None
+        software = self._frecency.sort(
+            self._software_db.get_software(), key=lambda x: x[2] or x[1])
+        for name, exe_path, lnk_path in software:
+            self.add_item(name, exe_path, lnk_path)
+
+    def record_launch(self, path):
+        self._frecency.record(path)
+        self._order_changed = True
+
+    def hideEvent(self, event):
+        # 不在用户眼前调整顺序，隐藏后再重新排列
+        if self._order_changed:
+            self._order_changed = False
+            self._populate()
+        super().hideEvent(event)
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
@@ -97,20 +90,73 @@ class SoftwareListWidget(QtWidgets.QListWidget):
             event.setDropAction(QtCore.Qt.MoveAction)
             super().dropEvent(event)
 
-    def add_item(self, name, file_path, lnk_path):
-        icon = QtWidgets.QFileIconProvider().icon(
-            QtCore.QFileInfo(file_path))
-
-        custom_widget = SoftwareItem(icon, name)
+    def _build_index(self):
+        """按软件名称和程序文件名建立索引，软件列表变化后在下次过滤时重建"""
+        self._index = KeywordIndex()
+        for i in range(self.count()):
+            item = self.item(i)
+            self._index.add(item.data(self.PATH_ROLE), '', item.text(),
+                            os.path.basename(item.data(self.FILE_ROLE) or ''))
+
+    def filter(self, text):
+        """
+        只显示名称前缀或模糊匹配 text 的软件，得分最高的设为当前项。
+
+        返回匹配的数量，text 为空时显示全部软件。
+        """
+        text = text.strip()
+        if not text:
+            for i in range(self.count()):
+                self.setRowHidden(i, False)
+            self.clearSelection()
+            return self.count()
+
+        if self._index is None:
+            self._build_index()
+        scores = dict(self._index.search_scores(text, self.count()))
+
+        top_item, top_score = None, 0
+        for i in range(self.count()):
+            item = self.item(i)
+            path = item.data(self.PATH_ROLE)
+            self.setRowHidden(i, path not in scores)
+            if path not in scores:
+                continue
+
+            score = scores[path] * (1 + math.log1p(self._frecency.score(path)))
+            if score > top_score:
+                top_item, top_score = item, score
+
+        if top_item is not None:
+            self.setCurrentItem(top_item)
+            self.scrollToItem(top_item)
+        return len(scores)
+
+    def top_path(self):
+        """过滤后得分最高的软件"""
+        item = self.currentItem()
+        if item is None or self.isRowHidden(self.row(item)):
+            return None
+        return item.data(self.PATH_ROLE)
 
-        item = QtWidgets.QListWidgetItem(self)
-        item.setSizeHint(QtCore.QSize(88, 86))
-        item.path = lnk_path or file_path
-        self.setItemWidget(item, custom_widget)
-        self.addItem(item)
+    def add_item(self, name, file_path, lnk_path):
+        self._index = None
+        item = QtWidgets.QListWidgetItem(name, self)
+        item.setData(self.PATH_ROLE, lnk_path or file_path)
+        item.setData(self.FILE_ROLE, file_path)
+        item.setData(QtCore.Qt.DecorationRole,
+                     IconCache.instance().pixmap(file_path, self.ICON_SIZE))
+
+    def _icon_ready(self, path, size, pixmap):
+        if size != self.ICON_SIZE:
+            return
+        for i in range(self.count()):
+            item = self.item(i)
+            if item.data(self.FILE_ROLE) == path:
+                item.setData(QtCore.Qt.DecorationRole, pixmap)
 
     def _item_double_clicked(self, item):
-        self.item_double_clicked.emit(item.path)
+        self.item_double_clicked.emit(item.data(self.PATH_ROLE))
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -217,81 +263,248 @@ class AskAIWidget(QtWidgets.QWidget):
         self.ask_view.setHtml(html)
 
 
-class ResultItem(QtWidgets.QWidget):
-    def __init__(self, title, description, keyword='', icon='', date_time='',
-                 checkbox=None, parent=None):
-        super(ResultItem, self).__init__(parent)
+class ResultListModel(QtCore.QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        item = self._items[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return item.title
+        if role == QtCore.Qt.ToolTipRole:
+            return item.description
+        if role == QtCore.Qt.CheckStateRole and item.checkbox is not None:
+            return QtCore.Qt.Checked if item.checkbox else QtCore.Qt.Unchecked
+        return None
+
+    def result_item(self, row):
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def result_items(self):
+        return list(self._items)
+
+    def set_items(self, result_items):
+        self.beginResetModel()
+        self._items = list(result_items)
+        self.endResetModel()
+
+    def append_items(self, result_items):
+        result_items = list(result_items)
+        if not result_items:
+            return
 
-        self.title = title
-        self.description = description
-        self.keyword = keyword
-        self.icon = icon
-        self.date_time = date_time  # int list,eg:[2021, 1, 21, 15, 21, 11]
-        self.checkbox = checkbox
+        first = len(self._items)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(result_items) - 1)
+        self._items.extend(result_items)
+        self.endInsertRows()
 
-        self.init_ui()
+    def clear(self):
+        self.set_items([])
+
+    def toggle_checkbox(self, row):
+        item = self.result_item(row)
+        if item is None or item.checkbox is None:
+            return
+
+        item.checkbox = not item.checkbox
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [QtCore.Qt.CheckStateRole])
 
-    def init_ui(self):
-        self.setObjectName('result_item')
-        self.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
 
-        self.main_layout = QtWidgets.QHBoxLayout(self)
-        self.main_layout.setContentsMargins(10, 5, 5, 5)
-        self.main_layout.setSpacing(12)
+class ResultItemDelegate(QtWidgets.QStyledItemDelegate):
+    """直接绘制结果项，所有行共用字体、颜色和图标缓存"""
+    ROW_HEIGHT = 62
+    IMG_SIZE = 60
+    ICON_SIZE = 50
+    CHECKBOX_SIZE = 16
 
-        self.img_label = QtWidgets.QLabel()
-        self.img_label.setObjectName('img_label')
-        self.img_label.setFixedSize(60, 60)
-        if self.icon:
-            pix_map = QtGui.QPixmap(self.icon).scaled(
-                50, 50, QtCore.Qt.IgnoreAspectRatio,
+    TEXT_COLOR = QtGui.QColor('#cccccc')
+    HOVER_TEXT_COLOR = QtGui.QColor('#ffffff')
+    KEYWORD_COLOR = QtGui.QColor('#ffffff')
+
+    _system_icons = set()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QtGui.QFont('Microsoft YaHei')
+        self.title_font.setPixelSize(16)
+        self.title_font.setBold(True)
+
+        self.keyword_font = QtGui.QFont('Microsoft YaHei')
+        self.keyword_font.setPixelSize(14)
+
+        self.description_font = QtGui.QFont('Microsoft YaHei')
+
+    @classmethod
+    def icon_pixmap(cls, path):
+        if path in cls._system_icons:
+            return IconCache.instance().pixmap(path, cls.ICON_SIZE)
+
+        key = 'result_icon:{}'.format(path)
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QtGui.QPixmap(path)
+            if pixmap.isNull() and os.path.exists(path):
+                # 可执行文件、快捷方式等使用系统图标，由 IconCache 在后台提取
+                cls._system_icons.add(path)
+                return IconCache.instance().pixmap(path, cls.ICON_SIZE)
+            if pixmap.isNull():
+                return pixmap
+            pixmap = pixmap.scaled(
+                cls.ICON_SIZE, cls.ICON_SIZE, QtCore.Qt.IgnoreAspectRatio,
                 QtCore.Qt.SmoothTransformation
             )
-            self.img_label.setPixmap(pix_map)
-        else:
-            self.img_label.setText(self.keyword)
+            QtGui.QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    @classmethod
+    def checkbox_rect(cls, rect):
+        return QtCore.QRect(
+            rect.right() - cls.CHECKBOX_SIZE - 12,
+            rect.center().y() - cls.CHECKBOX_SIZE // 2,
+            cls.CHECKBOX_SIZE, cls.CHECKBOX_SIZE
+        )
 
-        self.body_layout = QtWidgets.QVBoxLayout()
-        self.body_layout.setSpacing(0)
+    def sizeHint(self, option, index):
+        return QtCore.QSize(200, self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        item = index.model().result_item(index.row())
+        if item is None:
+            return
 
-        self.title_layout = QtWidgets.QHBoxLayout()
-        self.title_label = QtWidgets.QLabel()
-        self.title_label.setObjectName('title_label')
-        if self.keyword:
-            self.title_label.setText(
-                u'{} ({})'.format(self.title, self.keyword))
+        widget = option.widget
+        style = widget.style() if widget else QtWidgets.QApplication.style()
+
+        option = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        option.text = ''
+        option.features &= ~QtWidgets.QStyleOptionViewItem.HasCheckIndicator
+        style.drawPrimitive(QtWidgets.QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        rect = option.rect
+
+        img_rect = QtCore.QRect(
+            rect.left() + 10, rect.top() + (rect.height() - self.IMG_SIZE) // 2,
+            self.IMG_SIZE, self.IMG_SIZE)
+        pixmap = self.icon_pixmap(item.icon) if item.icon else None
+        if pixmap is not None and not pixmap.isNull():
+            icon_rect = QtCore.QRect(0, 0, self.ICON_SIZE, self.ICON_SIZE)
+            icon_rect.moveCenter(img_rect.center())
+            painter.drawPixmap(icon_rect, pixmap)
         else:
-            self.title_label.setText(self.title)
-        self.title_layout.addWidget(self.title_label)
-        if self.date_time:
-            self.date_time_edit = QtWidgets.QDateTimeEdit()
-            self.date_time_edit.setDateTime(QtCore.QDateTime(*self.date_time))
-            self.title_layout.addWidget(self.date_time_edit)
-        self.title_layout.addItem(
-            QtWidgets.QSpacerItem(120, 30,
-                                  QtWidgets.QSizePolicy.Expanding,
-                                  QtWidgets.QSizePolicy.Minimum)
-        )
+            painter.setFont(self.keyword_font)
+            painter.setPen(self.KEYWORD_COLOR)
+            painter.drawText(img_rect, QtCore.Qt.AlignCenter, item.keyword)
+
+        right = rect.right() - 10
+        if item.checkbox is not None:
+            check_option = QtWidgets.QStyleOptionButton()
+            check_option.rect = self.checkbox_rect(rect)
+            check_option.state = QtWidgets.QStyle.State_Enabled | (
+                QtWidgets.QStyle.State_On if item.checkbox else QtWidgets.QStyle.State_Off)
+            style.drawPrimitive(
+                QtWidgets.QStyle.PE_IndicatorCheckBox, check_option, painter, widget)
+            right = check_option.rect.left() - 12
+
+        text_left = img_rect.right() + 14
+        title_rect = QtCore.QRect(text_left, rect.top() + 6, right - text_left, 28)
+        description_rect = QtCore.QRect(
+            text_left, title_rect.bottom() + 2, right - text_left, rect.bottom() - title_rect.bottom() - 6)
+
+        title = u'{} ({})'.format(item.title, item.keyword) if item.keyword else item.title
+        hovered = option.state & QtWidgets.QStyle.State_MouseOver
+        painter.setFont(self.title_font)
+        painter.setPen(self.HOVER_TEXT_COLOR if hovered else self.TEXT_COLOR)
+
+        if item.date_time:
+            date_text = QtCore.QDateTime(*item.date_time).toString('yyyy/MM/dd hh:mm:ss')
+            date_width = QtGui.QFontMetrics(self.description_font).horizontalAdvance(date_text)
+            painter.setFont(self.description_font)
+            painter.drawText(title_rect, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, date_text)
+            title_rect.setRight(title_rect.right() - date_width - 12)
+            painter.setFont(self.title_font)
+
+        painter.drawText(
+            title_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+            painter.fontMetrics().elidedText(title, QtCore.Qt.ElideRight, title_rect.width()))
+
+        painter.setFont(self.description_font)
+        painter.setPen(self.TEXT_COLOR)
+        painter.drawText(
+            description_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop,
+            painter.fontMetrics().elidedText(
+                item.description, QtCore.Qt.ElideRight, description_rect.width()))
+
+        painter.restore()
+
+
+class ResultListView(QtWidgets.QListView):
+    """插件结果列表，没有逐行控件，只保存 ResultItem 数据"""
+    result_clicked = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result_model = ResultListModel(self)
+        self.setModel(self.result_model)
+        self.setItemDelegate(ResultItemDelegate(self))
+        IconCache.instance().icon_ready.connect(self._icon_ready)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+
+    def _icon_ready(self, path, size, pixmap):
+        if size == ResultItemDelegate.ICON_SIZE:
+            self.viewport().update()
+
+    def count(self):
+        return self.result_model.rowCount()
+
+    def result_item(self, row):
+        return self.result_model.result_item(row)
+
+    def current_result_item(self):
+        index = self.currentIndex()
+        return self.result_model.result_item(index.row()) if index.isValid() else None
+
+    def set_items(self, result_items):
+        self.result_model.set_items(result_items)
+
+    def append_items(self, result_items):
+        self.result_model.append_items(result_items)
 
-        self.description_label = QtWidgets.QLabel()
-        self.description_label.setObjectName('description_label')
-        self.description_label.setText(self.description)
+    def clear(self):
+        self.result_model.clear()
 
-        self.body_layout.addLayout(self.title_layout)
-        self.body_layout.addWidget(self.description_label)
+    def clear_current(self):
+        self.selectionModel().clear()
+        self.setCurrentIndex(QtCore.QModelIndex())
 
-        self.main_layout.addWidget(self.img_label)
-        self.main_layout.addLayout(self.body_layout)
-        if self.checkbox is not None:
-            self.todo_checkbox = QtWidgets.QCheckBox()
-            self.todo_checkbox.setChecked(self.checkbox)
-            self.main_layout.addWidget(self.todo_checkbox)
+    def mouseReleaseEvent(self, event):
+        index = self.indexAt(event.pos())
+        if index.isValid() and event.button() == QtCore.Qt.LeftButton:
+            item = self.result_model.result_item(index.row())
+            if (item.checkbox is not None and
+                    ResultItemDelegate.checkbox_rect(self.visualRect(index)).contains(event.pos())):
+                self.result_model.toggle_checkbox(index.row())
+                return event.accept()
 
-        self.load_style()
+            super().mouseReleaseEvent(event)
+            return self.result_clicked.emit(item)
 
-    def load_style(self):
-        with open(os.path.join(os.path.dirname(__file__), 'res/result_item.css')) as f:
-            self.setStyleSheet(f.read())
+        super().mouseReleaseEvent(event)
 
 
 if __name__ == '__main__':
@@ -299,8 +512,9 @@ if __name__ == '__main__':
 
     app = QtWidgets.QApplication(sys.argv)
 
-    ri = ResultItem(u'百度搜索', u'快速进行百度搜索', 'ctrl+1',
-                    'plugins/a.jpg')
-    ri.show()
+    rv = ResultListView()
+    rv.set_items([ResultItem(u'百度搜索', u'快速进行百度搜索', 'ctrl+1',
+                             'plugins/a.jpg')])
+    rv.show()
 
     sys.exit(app.exec_())
@@ -3,11 +3,13 @@ import os
 from PySide2 import QtWidgets
 from PySide2 import QtCore
 
-from fingertips.widgets import SoftwareListWidget, InputLineEdit, AskAIWidget
+from fingertips.widgets import SoftwareListWidget, InputLineEdit, AskAIWidget, ResultListView, ResultItem
 from fingertips.hotkey import HotkeyThread
 from fingertips.core.thread import AskAIThread
-from fingertips.core.plugin import PluginRegister
+from fingertips.core.plugin_register import PluginRegister, PluginQueryRunner
 from fingertips.core.action import ActionRegister
+from fingertips.core.federated import (
+    FederatedSearch, SoftwareSource, PluginSource, ChatSource, ClipboardSource)
 from fingertips.utils import get_logger, get_select_entity
 from fingertips.action_menu import ActionMenu, AIResultWindow
 from fingertips.settings.config_model import config_model
@@ -16,11 +18,14 @@ log = get_logger('Fingertips')
 
 
 class Fingertips(QtWidgets.QWidget):
+    # 输入时软件列表只显示一行匹配的软件
+    FILTERED_SOFTWARE_HEIGHT = 90
+
     def __init__(self, chat_window, parent=None):
         super().__init__(parent=parent)
         self.placeholder = 'Hello, Fingertips!'
-        self.RESULT_ITEM_HEIGHT = 62
         self.ai_view = None
+        self.action_menu = None
         self.chat_window = chat_window
 
         self.init_ui()
@@ -28,6 +33,16 @@ class Fingertips(QtWidgets.QWidget):
         self.plugin_register = PluginRegister(self)
         self.action_register = ActionRegister(self)
 
+        self.query_runner = PluginQueryRunner(self.plugin_register, parent=self)
+        self.query_runner.resulted.connect(self.query_resulted)
+        self.query_runner.appended.connect(self.result_list_widget.append_items)
+        self.query_runner.executed.connect(self.plugin_executed)
+
+        self.federated_search = FederatedSearch([
+            SoftwareSource(self), PluginSource(self), ChatSource(self), ClipboardSource(self)
+        ], parent=self)
+        self.federated_search.resulted.connect(self.federated_resulted)
+
         self.init_hotkey()
 
     def set_position(self):
@@ -64,11 +79,11 @@ class Fingertips(QtWidgets.QWidget):
         self.input_line_edit.textChanged.connect(
             self.input_line_edit_text_changed)
 
-        self.result_list_widget = QtWidgets.QListWidget()
+        self.result_list_widget = ResultListView()
         self.result_list_widget.setObjectName('result_list_widget')
         self.result_list_widget.setFocusPolicy(QtCore.Qt.ClickFocus)
         self.result_list_widget.keyPressEvent = self.result_list_key_press_event
-        self.result_list_widget.itemClicked.connect(self.execute_result_item)
+        self.result_list_widget.result_clicked.connect(self.execute_result_item)
 
         self.software_list_widget = SoftwareListWidget()
         self.software_list_widget.setObjectName('software_list_widget')
@@ -93,28 +108,31 @@ class Fingertips(QtWidgets.QWidget):
     def result_list_key_press_event(self, event):
         if event.key() == QtCore.Qt.Key_Return:
             return self.execute_result_item(
-                self.result_list_widget.currentItem())
+                self.result_list_widget.current_result_item())
         if event.key() == QtCore.Qt.Key_Backspace:
             self.input_line_edit.setFocus(QtCore.Qt.MouseFocusReason)
-            self.result_list_widget.setCurrentRow(-1)
+            self.result_list_widget.clear_current()
             self.input_line_edit.setText(self.input_line_edit.text()[:-1])
             return
 
-        super(QtWidgets.QListWidget, self.result_list_widget).keyPressEvent(
-            event)
+        QtWidgets.QListView.keyPressEvent(self.result_list_widget, event)
 
-    def execute_result_item(self, item):
-        result_item = self.result_list_widget.itemWidget(item)
+    def execute_result_item(self, result_item):
         if not result_item:
             return
 
+        if result_item.data:
+            if result_item.data['source'] == 'ai':
+                return self.ask_ai(result_item.data['text'])
+            return self.federated_search.activate(result_item)
+
         input_text = self.input_line_edit.text().strip()
         if result_item.keyword and (
                 input_text == result_item.keyword or
                 not input_text.startswith(result_item.keyword)):
             self.input_line_edit.setText(result_item.keyword + ' ')
             self.input_line_edit.setFocus(QtCore.Qt.MouseFocusReason)
-            self.result_list_widget.setCurrentRow(-1)
+            self.result_list_widget.clear_current()
         else:
             self.input_line_edit_return_pressed()
 
@@ -158,6 +176,7 @@ class Fingertips(QtWidgets.QWidget):
 
     def software_list_widget_item_double_clicked(self, exe_path):
         os.startfile(exe_path)
+        self.software_list_widget.record_launch(exe_path)
         self.set_visible()
 
     def keyPressEvent(self, event):
@@ -187,9 +206,10 @@ class Fingertips(QtWidgets.QWidget):
         data = get_select_entity()
         log.info(u'已调用quicker menus，{}'.format(data))
 
-        rm = ActionMenu(parent=self)
-        rm.triggered.connect(self.action_menu_triggered)
-        rm.show_menu(data)
+        if self.action_menu is None:
+            self.action_menu = ActionMenu(parent=self)
+            self.action_menu.triggered.connect(self.action_menu_triggered)
+        self.action_menu.show_menu(data)
 
     def ai_resend(self):
         if self.ai_view is None:
@@ -227,11 +247,9 @@ class Fingertips(QtWidgets.QWidget):
                 plugin_keyword = plugin_keyword[1:]
             else:
                 plugin_keyword = next(iter(
-                    self.result_list_widget.itemWidget(
-                        self.result_list_widget.item(i)).keyword
+                    self.result_list_widget.result_item(i).keyword
                     for i in range(self.result_list_widget.count()) if
-                    self.result_list_widget.itemWidget(
-                        self.result_list_widget.item(i)).keyword == text[1:]
+                    self.result_list_widget.result_item(i).keyword == text[1:]
                 ), '')
                 execute_str = ''
 
@@ -239,12 +257,18 @@ class Fingertips(QtWidgets.QWidget):
                 return
 
             result_item = None
-            if self.result_list_widget.selectedItems():
-                result_item = self.result_list_widget.itemWidget(
-                    self.result_list_widget.currentItem())
+            if self.result_list_widget.selectionModel().hasSelection():
+                result_item = self.result_list_widget.current_result_item()
             elif self.result_list_widget.count() == 1:
-                result_item = self.result_list_widget.itemWidget(
-                    self.result_list_widget.item(0))
+                result_item = self.result_list_widget.result_item(0)
+            self.plugin_register.record_use(plugin_keyword)
+            if self.plugin_register.is_isolated(plugin_keyword):
+                # 在插件进程中执行，结果返回后再显示
+                self.query_runner.execute(plugin_keyword, execute_str, result_item)
+                self.input_line_edit.clear()
+                self.close()
+                return
+
             result_items = self.plugin_register.execute(
                 plugin_keyword, execute_str, result_item,
                 self.plugin_register.plugins()
@@ -258,6 +282,24 @@ class Fingertips(QtWidgets.QWidget):
 
             return
 
+        # Ctrl+Enter 向 AI 提问，Enter 依次执行选中的结果、最匹配的软件和第一个搜索结果
+        if QtWidgets.QApplication.keyboardModifiers() & QtCore.Qt.ControlModifier:
+            return self.ask_ai(text)
+
+        selected = self.result_list_widget.current_result_item()
+        if selected is not None and selected.data:
+            return self.execute_result_item(selected)
+
+        top_path = self.software_list_widget.top_path()
+        if top_path:
+            return self.software_list_widget_item_double_clicked(top_path)
+
+        first_item = self.result_list_widget.result_item(0)
+        if first_item is not None and first_item.data and first_item.data.get('source') != 'ai':
+            return self.execute_result_item(first_item)
+
+    def ask_ai(self, text):
+        self.federated_search.cancel()
         self._set_software_list_widget_status(False)
         self._set_result_list_widget_status(False)
         self._set_ask_viewer_status(True)
@@ -288,14 +330,14 @@ class Fingertips(QtWidgets.QWidget):
                 QtWidgets.QSizePolicy.Ignored
             )
 
-    def _set_software_list_widget_status(self, is_show=False):
+    def _set_software_list_widget_status(self, is_show=False, height=300):
         if is_show:
             self.software_list_widget.show()
             self.software_list_widget.setSizePolicy(
                 QtWidgets.QSizePolicy.Preferred,
                 QtWidgets.QSizePolicy.Preferred
             )
-            self.software_list_widget.setFixedSize(820, 300)
+            self.software_list_widget.setFixedSize(820, height)
             self.software_list_widget.adjustSize()
         else:
             self.software_list_widget.hide()
@@ -322,41 +364,76 @@ class Fingertips(QtWidgets.QWidget):
 
     def input_line_edit_text_changed(self, text):
         if text:
+            self._set_ask_viewer_status(False)
+            self._set_result_list_widget_status(True)
+
             if not text.startswith('/'):
+                # 软件列表只显示匹配的软件
+                matched = self.software_list_widget.filter(text) if text.strip() else 0
+                self._set_software_list_widget_status(matched > 0, self.FILTERED_SOFTWARE_HEIGHT)
+
+                # 在软件、插件、聊天和剪贴板中搜索，结果陆续通过 federated_resulted 返回
+                self.query_runner.cancel()
+                self.add_items([self._ai_item(text.strip())])
+                if text.strip():
+                    self.federated_search.submit(text.strip())
+                else:
+                    self.federated_search.cancel()
                 return
 
-            self._set_ask_viewer_status(False)
             self._set_software_list_widget_status(False)
-            self._set_result_list_widget_status(True)
+            self.federated_search.cancel()
+            first_item = self.result_list_widget.result_item(0)
+            if first_item is not None and first_item.data:
+                self.result_list_widget.clear()
 
             if ' ' not in text.strip():
+                self.query_runner.cancel()
                 plugin_keyword = text.strip()[1:]
                 result_items = self.plugin_register.search_plugin(
                     plugin_keyword)
+                if result_items:
+                    self.add_items(result_items)
             else:
+                # 插件查询在后台执行，结果通过 query_resulted 返回
                 plugin_keyword, query_str = text.strip().split(' ', 1)
-                result_items = self.plugin_register.get_query_result(
-                    plugin_keyword[1:], query_str)
-
-            if result_items:
-                self.add_items(result_items)
+                self.query_runner.submit(plugin_keyword[1:], query_str)
             return
 
+        self.query_runner.cancel()
+        self.federated_search.cancel()
+        self.software_list_widget.filter('')
         self._set_result_list_widget_status(False)
         self._set_ask_viewer_status(False)
         self._set_software_list_widget_status(True)
 
-    def add_items(self, result_items):
-        self.result_list_widget.clear()
+    def query_resulted(self, result_items):
+        if result_items:
+            self.add_items(result_items)
+
+    @staticmethod
+    def _ai_item(text):
+        return ResultItem(u'向 AI 提问 (Ctrl+Enter)', text, 'AI', data={'source': 'ai', 'text': text})
 
-        for item in result_items:
-            self.add_item(item)
+    def federated_resulted(self, result_items):
+        """保持当前选中的结果，AI 提问始终在最后"""
+        current = self.result_list_widget.current_result_item()
+        text = self.input_line_edit.text().strip()
+        self.add_items(result_items + [self._ai_item(text)])
+
+        if current is not None and current in result_items:
+            self.result_list_widget.setCurrentIndex(
+                self.result_list_widget.result_model.index(result_items.index(current)))
 
-    def add_item(self, result_item):
-        item = QtWidgets.QListWidgetItem()
-        item.setSizeHint(QtCore.QSize(200, self.RESULT_ITEM_HEIGHT))
-        self.result_list_widget.addItem(item)
-        self.result_list_widget.setItemWidget(item, result_item)
+    def plugin_executed(self, result_items):
+        if result_items:
+            self.set_show()
+            self._set_software_list_widget_status(False)
+            self._set_result_list_widget_status(True)
+            self.add_items(result_items)
+
+    def add_items(self, result_items):
+        self.result_list_widget.set_items(result_items)
 
     def set_show(self):
         self.set_position()
@@ -365,6 +442,7 @@ class Fingertips(QtWidgets.QWidget):
         self.input_line_edit.setFocus(QtCore.Qt.MouseFocusReason)
 
     def reload_plugin(self):
+        self.query_runner.cancel()
         self.plugin_register.reload_plugins()
 
     def set_visible(self):
@@ -0,0 +1,18 @@
+import pytest
+
+from fingertips import db_utils
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    """每个测试使用独立的临时数据库"""
+    db_path = str(tmp_path / 'fingertips.db')
+    monkeypatch.setattr(db_utils, 'DB_PATH', db_path)
+    monkeypatch.setattr(db_utils._local, 'conn', None, raising=False)
+    db_utils.FrecencyDB._ranks.clear()
+    yield db_path
+
+    conn = getattr(db_utils._local, 'conn', None)
+    if conn is not None:
+        conn.close()
+    db_utils.FrecencyDB._ranks.clear()
@@ -0,0 +1,43 @@
+import json
+import time
+
+import pytest
+
+from fingertips.db_utils import ChatDB
+
+
+def save_chat(cid, label, histories):
+    # 与 ChatConfigModel.save 一致，聊天记录以 JSON 文本保存
+    ChatDB().add_chat({'cid': cid, 'label': label,
+                       'histories': json.dumps(histories, ensure_ascii=False)})
+
+
+def test_histories_decoded():
+    save_chat('1', '旅行计划', [
+        {'role': 'user', 'content': '帮我规划去京都的行程'},
+        {'role': 'assistant', 'content': '第一天参观清水寺'}])
+
+    chat = next(ChatDB().iter_chats())
+    contents = [h['content'] for h in ChatDB.histories(chat)]
+    assert any('清水寺' in c for c in contents)
+
+
+def test_histories_invalid():
+    assert ChatDB.histories({}) == []
+    assert ChatDB.histories({'histories': None}) == []
+    assert ChatDB.histories({'histories': 'not json'}) == []
+    assert ChatDB.histories({'histories': '{"a": 1}'}) == []
+    assert ChatDB.histories({'histories': [{'content': 'x'}]}) == [{'content': 'x'}]
+
+
+def test_chat_source_finds_history():
+    pytest.importorskip('PySide2')
+    from fingertips.core.federated import ChatSource
+
+    save_chat('1', '旅行计划', [{'role': 'user', 'content': '帮我规划去京都的行程'}])
+    save_chat('2', '代码', [{'role': 'user', 'content': 'Python 列表推导式'}])
+    ChatDB().add_chat({'cid': '3', 'label': '损坏', 'histories': '[{'})
+
+    results = ChatSource(None).search('京都', 10, time.monotonic() + 1)
+    assert [item.data['cid'] for _, item in results] == ['1']
+    assert '京都' in results[0][1].description
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+
+import pytest
+
+from fingertips.db_backup import (
+    BACKUP_PREFIX, backup_database, list_snapshots, restore_database, rotate_snapshots)
+
+
+def write_value(db_path, value):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute('CREATE TABLE IF NOT EXISTS t (value TEXT)')
+        conn.execute('DELETE FROM t')
+        conn.execute('INSERT INTO t VALUES (?)', (value,))
+    conn.close()
+
+
+def read_value(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT value FROM t').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def make_snapshots(backup_root, *stamps):
+    os.makedirs(backup_root, exist_ok=True)
+    paths = []
+    for stamp in stamps:
+        path = os.path.join(backup_root, '{}{}.db'.format(BACKUP_PREFIX, stamp))
+        write_value(path, stamp)
+        paths.append(path)
+    return paths
+
+
+def test_list_snapshots_newest_first(tmp_path):
+    root = str(tmp_path / 'backups')
+    assert list_snapshots(root) == []
+
+    make_snapshots(root, '20250101-120000', '20250101-120000-500',
+                   '20250101-120000-500-1', '20250102-080000-000')
+    open(os.path.join(root, 'other.db'), 'w').close()
+
+    assert [os.path.basename(p) for p in list_snapshots(root)] == [
+        'data-20250102-080000-000.db', 'data-20250101-120000-500-1.db',
+        'data-20250101-120000-500.db', 'data-20250101-120000.db']
+
+
+def test_rotate_snapshots(tmp_path):
+    root = str(tmp_path / 'backups')
+    oldest, middle, newest = make_snapshots(
+        root, '20250101-000000-000', '20250102-000000-000', '20250103-000000-000')
+
+    assert rotate_snapshots(1, root, exclude=[oldest]) == [middle]
+    assert list_snapshots(root) == [newest, oldest]
+
+    # keep 至少为 1
+    assert rotate_snapshots(0, root) == [oldest]
+    assert list_snapshots(root) == [newest]
+
+
+def test_backup_names_are_unique(tmp_path):
+    db_path = str(tmp_path / 'data.db')
+    root = str(tmp_path / 'backups')
+    write_value(db_path, 'a')
+
+    paths = [backup_database(db_path, root, keep=None) for _ in range(5)]
+    assert len(set(paths)) == 5
+    assert list_snapshots(root) == paths[::-1]
+    assert all(read_value(p) == 'a' for p in paths)
+
+    backup_database(db_path, root, keep=2)
+    assert len(list_snapshots(root)) == 2
+
+
+def test_restore_keeps_restored_snapshot(tmp_path):
+    db_path = str(tmp_path / 'data.db')
+    root = str(tmp_path / 'backups')
+
+    write_value(db_path, 'old')
+    snapshot = backup_database(db_path, root, keep=None)
+    write_value(db_path, 'new')
+    for _ in range(3):
+        backup_database(db_path, root, keep=None)
+
+    safety_path = restore_database(snapshot, db_path, root, keep=2)
+
+    assert read_value(db_path) == 'old'
+    assert read_value(safety_path) == 'new'
+    snapshots = list_snapshots(root)
+    assert snapshot in snapshots
+    assert safety_path == snapshots[0]
+    assert len(snapshots) == 3
+
+
+def test_restore_rejects_corrupt_snapshot(tmp_path):
+    db_path = str(tmp_path / 'data.db')
+    root = str(tmp_path / 'backups')
+    write_value(db_path, 'current')
+
+    snapshot = os.path.join(root, BACKUP_PREFIX + 'broken.db')
+    os.makedirs(root)
+    with open(snapshot, 'wb') as f:
+        f.write(b'not a database' * 100)
+
+    with pytest.raises(sqlite3.DatabaseError):
+        restore_database(snapshot, db_path, root)
+    assert read_value(db_path) == 'current'
@@ -0,0 +1,111 @@
+import sqlite3
+
+from fingertips.db_utils import Database, get_connection
+
+
+def make_table(name='items'):
+    return Database(get_connection())[name]
+
+
+def test_insert_and_find():
+    table = make_table()
+    assert not table.exists
+    assert table.find(name='a') == []
+    assert table.find_one(name='a') is None
+
+    row_id = table.insert({'name': 'a', 'size': 1})
+    table.insert({'name': 'b', 'size': 2})
+
+    assert table.exists
+    assert table.count() == 2
+    assert table.find_one(name='a') == {'id': row_id, 'name': 'a', 'size': 1}
+    assert [row['name'] for row in table.all()] == ['a', 'b']
+    assert table.find(missing=1) == []
+
+
+def test_insert_many():
+    table = make_table()
+    assert table.insert_many([{'name': 'a'}, {'name': 'b', 'size': 2}, {'name': 'c'}]) == 3
+    assert [(row['name'], row['size']) for row in table.all()] == [
+        ('a', None), ('b', 2), ('c', None)]
+
+
+def test_update_and_upsert():
+    table = make_table()
+    table.insert({'name': 'a', 'size': 1})
+
+    assert table.update({'name': 'a', 'size': 2}, ['name']) == 1
+    assert table.find_one(name='a')['size'] == 2
+
+    table.upsert({'name': 'a', 'size': 3}, ['name'])
+    table.upsert({'name': 'b', 'size': 4}, ['name'])
+    assert [(row['name'], row['size']) for row in table.all()] == [('a', 3), ('b', 4)]
+
+
+def test_upsert_creates_table():
+    table = make_table()
+    table.upsert({'name': 'a'}, ['name'])
+    assert table.count(name='a') == 1
+
+
+def test_delete():
+    table = make_table()
+    assert not table.delete(name='a')
+
+    table.insert_many([{'name': 'a'}, {'name': 'b'}])
+    assert table.delete(name='a')
+    assert not table.delete(name='a')
+    assert not table.delete(missing=1)
+    assert [row['name'] for row in table.all()] == ['b']
+
+
+def test_columns_created_on_demand():
+    table = make_table()
+    table.insert({'name': 'a'})
+    assert table.columns == ['id', 'name']
+
+    table.insert({'name': 'b', 'size': 1, 'ratio': 0.5, 'enabled': True})
+    assert table.columns == ['id', 'name', 'size', 'ratio', 'enabled']
+
+    types = {row[1]: row[2] for row in get_connection().execute('PRAGMA table_info(items)')}
+    assert types == {'id': 'INTEGER', 'name': 'TEXT', 'size': 'INTEGER',
+                     'ratio': 'FLOAT', 'enabled': 'BOOLEAN'}
+
+    # 另一个实例补的列也能被看到
+    make_table().insert({'name': 'c', 'note': 'x'})
+    table.update({'name': 'c', 'size': 3}, ['name'])
+    assert table.find_one(name='c')['note'] == 'x'
+
+
+def test_json_round_trip():
+    table = make_table()
+    table.insert({'name': 'a', 'tags': ['x', '中文'], 'meta': {'n': 1, 'items': [1, 2]}})
+
+    row = table.find_one(name='a')
+    assert row['tags'] == ['x', '中文']
+    assert row['meta'] == {'n': 1, 'items': [1, 2]}
+
+    table.update({'name': 'a', 'tags': []}, ['name'])
+    assert table.find_one(name='a')['tags'] == []
+
+
+def test_query_refreshes_columns():
+    db = Database(get_connection())
+    db['items'].insert({'name': 'a'})
+    db.query('ALTER TABLE items ADD COLUMN size INTEGER')
+    assert 'size' in db['items'].columns
+
+    rows = db.query('SELECT name FROM items WHERE name = ?', 'a').fetchall()
+    assert rows == [('a',)]
+
+
+def test_connection_per_thread(temp_db):
+    import threading
+
+    conns = []
+    thread = threading.Thread(target=lambda: conns.append(get_connection()))
+    thread.start()
+    thread.join()
+
+    assert conns[0] is not get_connection()
+    assert isinstance(conns[0], sqlite3.Connection)
@@ -0,0 +1,59 @@
+import pytest
+
+from fingertips.db_utils import FrecencyDB
+
+DAY = 86400
+NOW = 1700000000.0
+
+
+def test_unused_key_scores_zero():
+    assert FrecencyDB('plugin').score('calc', NOW) == 0.0
+
+
+def test_record_accumulates():
+    db = FrecencyDB('plugin')
+    db.record('calc', now=NOW)
+    assert db.score('calc', NOW) == pytest.approx(1.0)
+
+    db.record('calc', now=NOW)
+    assert db.score('calc', NOW) == pytest.approx(2.0)
+
+
+def test_score_halves_every_half_life():
+    db = FrecencyDB('plugin')
+    db.record('calc', weight=4.0, now=NOW)
+
+    half_life = FrecencyDB.HALF_LIFE_DAYS * DAY
+    assert db.score('calc', NOW + half_life) == pytest.approx(2.0)
+    assert db.score('calc', NOW + 2 * half_life) == pytest.approx(1.0)
+
+    # 衰减后再使用，在衰减后的得分上累加
+    db.record('calc', now=NOW + half_life)
+    assert db.score('calc', NOW + half_life) == pytest.approx(3.0)
+
+
+def test_sort_prefers_recent_and_frequent():
+    db = FrecencyDB('software')
+    half_life = FrecencyDB.HALF_LIFE_DAYS * DAY
+    for _ in range(3):
+        db.record('old', now=NOW - 4 * half_life)
+    db.record('recent', now=NOW)
+    db.record('frequent', now=NOW - DAY)
+    db.record('frequent', now=NOW - DAY)
+
+    items = ['unused_b', 'old', 'unused_a', 'recent', 'frequent']
+    assert db.sort(items) == ['frequent', 'recent', 'old', 'unused_b', 'unused_a']
+
+    rows = [{'path': p} for p in items]
+    assert [r['path'] for r in db.sort(rows, key=lambda r: r['path'])][:3] == [
+        'frequent', 'recent', 'old']
+
+
+def test_kinds_are_separate_and_persisted():
+    FrecencyDB('plugin').record('calc', now=NOW)
+    assert FrecencyDB('software').score('calc', NOW) == 0.0
+
+    # 清空内存中的排名后从数据库重新读取
+    FrecencyDB._ranks.clear()
+    assert FrecencyDB('plugin').score('calc', NOW) == pytest.approx(1.0)
+    assert FrecencyDB('plugin').table.count(kind='plugin') == 1
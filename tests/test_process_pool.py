@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import subprocess
+
+import pytest
+
+from fingertips.core.plugin import AbstractPlugin
+from fingertips.core.result import ResultItem
+from fingertips.core.process_pool import PluginProcessPool, QUERY, RUN, pack_item
+
+
+class EchoPlugin(AbstractPlugin):
+    title = 'Echo'
+    keyword = 'echo'
+    description = 'echo'
+
+    def query(self, text):
+        for i in range(3):
+            yield ResultItem('{} {}'.format(text, i), '', self.keyword)
+
+    def run(self, text, result_item, plugin_by_keyword):
+        return [ResultItem(result_item.title, text, checkbox=result_item.checkbox)]
+
+
+class SlowPlugin(AbstractPlugin):
+    title = 'Slow'
+    keyword = 'slow'
+    description = 'slow'
+
+    def query(self, text):
+        time.sleep(float(text))
+        return [ResultItem('done', '')]
+
+
+class BrokenPlugin(AbstractPlugin):
+    title = 'Broken'
+    keyword = 'broken'
+    description = 'broken'
+
+    def query(self, text):
+        raise ValueError(text)
+
+
+def manifest(cls):
+    return {'module_name': __name__, 'class_name': cls.__name__}
+
+
+@pytest.fixture
+def pool():
+    pool = PluginProcessPool(1)
+    yield pool
+    pool.close()
+
+
+def collect(pool, method, cls, args, timeout=10):
+    return [item for batch in pool.call(method, manifest(cls), args, timeout) for item in batch]
+
+
+def test_query_and_run(pool):
+    items = collect(pool, QUERY, EchoPlugin, ('hi',))
+    assert [item.title for item in items] == ['hi 0', 'hi 1', 'hi 2']
+
+    item = ResultItem('title', '', checkbox=True)
+    result = collect(pool, RUN, EchoPlugin, ('text', pack_item(item)))
+    assert [(r.title, r.description, r.checkbox) for r in result] == [('title', 'text', True)]
+
+
+def test_error_keeps_worker(pool):
+    collect(pool, QUERY, EchoPlugin, ('a',))
+    worker = next(iter(pool._workers))
+
+    with pytest.raises(RuntimeError, match='ValueError: oops'):
+        collect(pool, QUERY, BrokenPlugin, ('oops',))
+    assert pool._workers == {worker}
+
+
+def test_timeout_restarts_worker(pool):
+    collect(pool, QUERY, EchoPlugin, ('a',))
+    worker = next(iter(pool._workers))
+
+    with pytest.raises(TimeoutError):
+        collect(pool, QUERY, SlowPlugin, ('5',), timeout=0.2)
+    assert not worker.is_alive()
+
+    assert [item.title for item in collect(pool, QUERY, SlowPlugin, ('0',))] == ['done']
+
+
+def test_startup_not_counted_in_timeout(pool, monkeypatch):
+    # 模拟进程启动很慢，超时时间只从进程就绪后开始计算
+    wait_ready = PluginProcessPool._wait_ready
+
+    def slow_ready(worker):
+        time.sleep(0.5)
+        wait_ready(worker)
+
+    monkeypatch.setattr(PluginProcessPool, '_wait_ready', staticmethod(slow_ready))
+    assert [item.title for item in collect(pool, QUERY, SlowPlugin, ('0',), timeout=0.4)] == ['done']
+
+
+def test_worker_imports_no_gui():
+    code = (
+        'import sys\n'
+        'import fingertips.core.process_pool\n'
+        'import fingertips.plugins.cmd_plugin\n'
+        'gui = [m for m in sys.modules if m.split(".")[0] in '
+        '("PySide2", "qfluentwidgets", "qtawesome", "win32gui")]\n'
+        'gui += [m for m in sys.modules if m in ("fingertips.widgets", "fingertips.utils")]\n'
+        'assert not gui, gui\n')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
@@ -0,0 +1,96 @@
+import threading
+
+from fingertips.core.search import KeywordIndex, edit_distance, split_words
+
+
+def make_index():
+    index = KeywordIndex()
+    index.add('calc', 'calc', '计算器', 'Evaluate math expressions')
+    index.add('cmd', 'cmd', 'Command Line', 'Run shell commands')
+    index.add('translate', 'tr', 'Translate', '翻译文本')
+    index.add('color', 'color', 'ColorPicker', 'Pick a color from screen')
+    return index
+
+
+def test_split_words():
+    assert split_words('ColorPicker') == ['color', 'picker']
+    assert split_words('HTTPServer_v2') == ['http', 'server', 'v', '2']
+    assert split_words('打开chrome浏览器') == ['打开', 'chrome', '浏览器']
+
+
+def test_edit_distance():
+    assert edit_distance('color', 'color', 1) == 0
+    assert edit_distance('colro', 'color', 1) == 1
+    assert edit_distance('calc', 'cmd', 1) == 2
+
+
+def test_exact_keyword_first():
+    index = make_index()
+    assert index.search('cmd')[0] == 'cmd'
+    assert index.search('tr')[0] == 'translate'
+
+
+def test_prefix_and_acronym():
+    index = make_index()
+    assert index.search('col')[0] == 'color'
+    assert index.search('comm')[0] == 'cmd'
+    assert 'cmd' in index.search('cl')
+
+
+def test_description_and_chinese():
+    index = make_index()
+    assert index.search('翻译')[0] == 'translate'
+    assert index.search('expressions') == ['calc']
+
+
+def test_typo():
+    index = make_index()
+    assert index.search('colro')[0] == 'color'
+    assert index.search('tranlsate')[0] == 'translate'
+
+
+def test_scores_sorted_and_limited():
+    index = make_index()
+    scores = index.search_scores('c', limit=2)
+    assert len(scores) == 2
+    assert scores[0][1] >= scores[1][1]
+
+    assert index.search('') == []
+    assert index.search('zzzz') == []
+
+
+def test_cache_cleared_on_add():
+    index = make_index()
+    assert index.search('json') == []
+    index.add('json', 'json', 'JSON Formatter')
+    assert index.search('json') == ['json']
+
+
+def test_cached_results_are_copies():
+    index = make_index()
+    index.search('c').clear()
+    assert index.search('c')
+
+
+def test_concurrent_search():
+    index = make_index()
+    expected = {text: index.search(text) for text in ('c', 'col', 'cmd', 'tr', '翻译')}
+    errors = []
+
+    def worker():
+        try:
+            for i in range(600):
+                for text, result in expected.items():
+                    # 不同的 limit 会不断填满缓存，让其他线程查询时缓存被清空
+                    index.search_scores(text, limit=i + 21)
+                    if index.search(text) != result:
+                        errors.append(text)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
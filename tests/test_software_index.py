@@ -0,0 +1,113 @@
+import os
+import sys
+
+import pytest
+
+from fingertips import software_index
+from fingertips.db_utils import SoftwareDB
+from fingertips.software_index import purge_index, run_index
+
+DESKTOP_ENTRY = '''[Desktop Entry]
+Type=Application
+Name={name}
+Exec={exec_} %U
+{extra}
+'''
+
+
+@pytest.fixture
+def apps_dir(tmp_path, monkeypatch):
+    # 用 .desktop 文件测试，与运行平台无关
+    monkeypatch.setattr(sys, 'platform', 'linux')
+    monkeypatch.setattr(software_index, 'CACHE_PATH', str(tmp_path / 'cache' / 'index.json'))
+    folder = tmp_path / 'applications'
+    folder.mkdir()
+    return folder
+
+
+def write_entry(folder, file_name, name, exec_, extra='', mtime=None):
+    path = folder / file_name
+    path.write_text(DESKTOP_ENTRY.format(name=name, exec_=exec_, extra=extra), encoding='utf-8')
+    if mtime is not None:
+        os.utime(str(path), (mtime, mtime))
+    return str(path)
+
+
+def test_run_index(apps_dir):
+    editor = write_entry(apps_dir, 'editor.desktop', 'Editor', '/usr/bin/editor')
+    (apps_dir / 'tools').mkdir()
+    write_entry(apps_dir / 'tools', 'term.desktop', 'Terminal', '/usr/bin/term')
+    write_entry(apps_dir, 'hidden.desktop', 'Hidden', '/usr/bin/hidden', 'NoDisplay=true')
+    write_entry(apps_dir, 'uninstall-editor.desktop', 'Remove', '/usr/bin/remove')
+    (apps_dir / 'readme.txt').write_text('x')
+
+    report = run_index([str(apps_dir)])
+    assert report == {'files': 4, 'resolved': 4, 'added': 2, 'removed': 0}
+
+    db = SoftwareDB()
+    assert db.get_indexed()[editor] == ('Editor', '/usr/bin/editor')
+    assert sorted(name for name, _, _ in db.get_software(include_indexed=True)) == [
+        'Editor', 'Terminal']
+    # 索引发现的软件只用于搜索，不显示在主窗口中
+    assert db.get_software() == []
+
+
+def test_run_index_uses_cache(apps_dir):
+    path = write_entry(apps_dir, 'editor.desktop', 'Editor', '/usr/bin/editor', mtime=1000)
+    run_index([str(apps_dir)])
+
+    report = run_index([str(apps_dir)])
+    assert report == {'files': 1, 'resolved': 0, 'added': 0, 'removed': 0}
+
+    write_entry(apps_dir, 'editor.desktop', 'Editor 2', '/usr/bin/editor2', mtime=2000)
+    report = run_index([str(apps_dir)])
+    assert report == {'files': 1, 'resolved': 1, 'added': 1, 'removed': 1}
+    assert SoftwareDB().get_indexed() == {path: ('Editor 2', '/usr/bin/editor2')}
+
+    os.remove(path)
+    report = run_index([str(apps_dir)])
+    assert report == {'files': 0, 'resolved': 0, 'added': 0, 'removed': 1}
+    assert SoftwareDB().get_indexed() == {}
+
+
+def test_run_index_stopped(apps_dir):
+    write_entry(apps_dir, 'editor.desktop', 'Editor', '/usr/bin/editor')
+    assert run_index([str(apps_dir)], lambda: True) is None
+    assert SoftwareDB().get_indexed() == {}
+
+
+def test_sync_indexed_skips_existing_software():
+    db = SoftwareDB()
+    db.add_software('My Editor', '/usr/bin/editor')
+
+    added = db.sync_indexed([('Editor', '/usr/bin/editor', '/apps/editor.desktop'),
+                             ('Term', '/usr/bin/term', '/apps/term.desktop'),
+                             ('Term', '/usr/bin/term', '/apps/term2.desktop')], [])
+    assert added == 1
+    assert db.get_indexed() == {'/apps/term.desktop': ('Term', '/usr/bin/term')}
+    assert db.get_software() == [('My Editor', '/usr/bin/editor', '')]
+
+    db.sync_indexed([], ['/apps/term.desktop'])
+    assert db.get_indexed() == {}
+    assert db.get_software(include_indexed=True) == [('My Editor', '/usr/bin/editor', '')]
+
+
+def test_added_software_leaves_index():
+    db = SoftwareDB()
+    db.sync_indexed([('Term', '/usr/bin/term', '/apps/term.desktop')], [])
+
+    assert db.add_software('Terminal', '/usr/bin/term', '/apps/term.lnk')
+    assert not db.add_software('Terminal', '/usr/bin/term')
+    assert db.get_indexed() == {}
+    assert db.get_software() == [('Terminal', '/usr/bin/term', '/apps/term.lnk')]
+
+
+def test_purge_index():
+    db = SoftwareDB()
+    assert purge_index() == 0
+
+    db.add_software('My Editor', '/usr/bin/editor')
+    db.sync_indexed([('Term', '/usr/bin/term', '/apps/term.desktop'),
+                     ('Web', '/usr/bin/web', '/apps/web.desktop')], [])
+    assert purge_index() == 2
+    assert db.get_software(include_indexed=True) == [('My Editor', '/usr/bin/editor', '')]